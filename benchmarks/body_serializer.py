@@ -0,0 +1,47 @@
+"""
+Compares CPU time of creating request bodies of results, cases and sections
+with serde to_dict and with compiled body serializers.
+Usage: python -m benchmarks.body_serializer [objects_amount]
+"""
+import sys
+import time
+
+from serde.json import to_dict
+
+from trcli.data_classes.body_serializer import to_body
+from trcli.data_classes.dataclass_testrail import TestRailCase, TestRailResult, TestRailSection
+
+
+def make_objects(objects_amount: int) -> dict:
+    return {
+        "results": [
+            TestRailResult(case_id=i, status_id=5, comment="Failed", elapsed="1s", attachments=[f"/logs/{i}.log"])
+            for i in range(objects_amount)
+        ],
+        "cases": [
+            TestRailCase(section_id=1, title=f"test_{i}", custom_automation_id=f"tests.test_{i}")
+            for i in range(objects_amount)
+        ],
+        "sections": [TestRailSection(name=f"section_{i}", suite_id=1) for i in range(objects_amount)],
+    }
+
+
+def run(serializer, objects: list) -> float:
+    start = time.perf_counter()
+    for obj in objects:
+        serializer(obj)
+    return time.perf_counter() - start
+
+
+def main(objects_amount: int):
+    for name, objects in make_objects(objects_amount).items():
+        serde_time = run(to_dict, objects)
+        compiled_time = run(to_body, objects)
+        print(
+            f"{objects_amount} {name}: to_dict {serde_time:.2f} s, compiled {compiled_time:.2f} s "
+            f"({serde_time / compiled_time:.0f}x faster)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,101 @@
+"""
+Compares memory used by parsed report kept as TestRailCase and TestRailResult objects
+and kept in ColumnarCases column store (measured with tracemalloc): after parsing, after ApiDataProvider
+is created and after IDs of all cases matched in TestRail are set (update_data), as during upload.
+Usage: python -m benchmarks.columnar_store [cases_amount] [cases_per_section]
+"""
+import sys
+import tracemalloc
+
+from trcli.data_classes.columnar_store import ColumnarCases
+from trcli.data_classes.dataclass_testrail import TestRailCase, TestRailResult, TestRailSection, TestRailSuite
+from trcli.data_providers.api_data_provider import ApiDataProvider
+
+
+def case_values(i: int, section_number: int) -> dict:
+    failed = i % 10 == 0
+    return {
+        "title": f"test_{i}",
+        "custom_automation_id": f"tests.section_{section_number}.test_{i}",
+        "status_id": 5 if failed else 1,
+        "comment": f"Type: AssertionError\nMessage: expected {i}\nText: assert {i} == {i + 1}" if failed else "",
+        "elapsed": f"{i % 7}.5",
+    }
+
+
+def make_suite(cases_amount: int, cases_per_section: int) -> TestRailSuite:
+    sections = []
+    for section_number, first_case in enumerate(range(0, cases_amount, cases_per_section)):
+        cases = []
+        for i in range(first_case, min(first_case + cases_per_section, cases_amount)):
+            values = case_values(i, section_number)
+            cases.append(
+                TestRailCase(
+                    section_id=None,
+                    title=values["title"],
+                    custom_automation_id=values["custom_automation_id"],
+                    result=TestRailResult(
+                        case_id=None, status_id=values["status_id"], comment=values["comment"], elapsed=values["elapsed"]
+                    ),
+                )
+            )
+        sections.append(TestRailSection(name=f"section_{section_number}", suite_id=1, testcases=cases))
+    return TestRailSuite(name="Suite", suite_id=1, testsections=sections)
+
+
+def make_columnar_suite(cases_amount: int, cases_per_section: int) -> TestRailSuite:
+    store = ColumnarCases()
+    sections = []
+    for section_number, first_case in enumerate(range(0, cases_amount, cases_per_section)):
+        for i in range(first_case, min(first_case + cases_per_section, cases_amount)):
+            store.append(None, **case_values(i, section_number))
+        sections.append(
+            TestRailSection(name=f"section_{section_number}", suite_id=1, testcases=store.view(first_case))
+        )
+    return TestRailSuite(name="Suite", suite_id=1, testsections=sections)
+
+
+def case_data(cases_amount: int, cases_per_section: int) -> list:
+    return [
+        {
+            "case_id": i + 1,
+            "section_id": section_number + 1,
+            "custom_automation_id": case_values(i, section_number)["custom_automation_id"],
+        }
+        for section_number, first_case in enumerate(range(0, cases_amount, cases_per_section))
+        for i in range(first_case, min(first_case + cases_per_section, cases_amount))
+    ]
+
+
+def measure(make, cases_amount: int, cases_per_section: int) -> list:
+    """Returns memory used after parsing, after creating data provider and after updating IDs of cases."""
+    matched_cases = case_data(cases_amount, cases_per_section)
+    tracemalloc.start()
+    suite = make(cases_amount, cases_per_section)
+    sizes = [tracemalloc.get_traced_memory()[0]]
+    data_provider = ApiDataProvider(suite)
+    sizes.append(tracemalloc.get_traced_memory()[0])
+    data_provider.update_data(case_data=matched_cases)
+    sizes.append(tracemalloc.get_traced_memory()[0])
+    tracemalloc.stop()
+    del data_provider, suite
+    return sizes
+
+
+def main(cases_amount: int, cases_per_section: int):
+    for name, make in (("dataclasses", make_suite), ("column store", make_columnar_suite)):
+        sizes = measure(make, cases_amount, cases_per_section)
+        print(
+            f"{name:>12}: "
+            + ", ".join(
+                f"{stage} {size / 2 ** 20:.1f} MB ({size / cases_amount:.0f} B/case)"
+                for stage, size in zip(("parsed", "data provider", "IDs updated"), sizes)
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+    )
@@ -0,0 +1,66 @@
+"""
+Measures time of updating report sections and test cases with IDs matched in TestRail
+(ApiDataProvider.update_data) for growing number of test cases, time per case should stay flat.
+Usage: python -m benchmarks.data_provider_update [max_cases_amount] [cases_per_section]
+"""
+import sys
+import time
+
+from trcli.data_classes.dataclass_testrail import TestRailCase, TestRailResult, TestRailSection, TestRailSuite
+from trcli.data_providers.api_data_provider import ApiDataProvider
+
+
+def make_suite(cases_amount: int, cases_per_section: int) -> TestRailSuite:
+    sections = []
+    for section_number in range(-(-cases_amount // cases_per_section)):
+        first_case = section_number * cases_per_section
+        sections.append(
+            TestRailSection(
+                name=f"section_{section_number}",
+                suite_id=1,
+                testcases=[
+                    TestRailCase(
+                        section_id=None,
+                        title=f"test_{i}",
+                        custom_automation_id=f"tests.section_{section_number}.test_{i}",
+                        result=TestRailResult(case_id=None, status_id=1),
+                    )
+                    for i in range(first_case, min(first_case + cases_per_section, cases_amount))
+                ],
+            )
+        )
+    return TestRailSuite(name="Suite", suite_id=1, testsections=sections)
+
+
+def run(cases_amount: int, cases_per_section: int) -> float:
+    suite = make_suite(cases_amount, cases_per_section)
+    section_data = [
+        {"section_id": section_id, "suite_id": 1, "name": section.name}
+        for section_id, section in enumerate(suite.testsections, start=1)
+    ]
+    case_data = [
+        {"case_id": case_id, "section_id": 1, "title": case.title, "custom_automation_id": case.custom_automation_id}
+        for case_id, case in enumerate((case for section in suite.testsections for case in section.testcases), 1)
+    ]
+    start = time.perf_counter()
+    data_provider = ApiDataProvider(suite)
+    data_provider.update_data(section_data=section_data)
+    data_provider.update_data(case_data=case_data)
+    elapsed = time.perf_counter() - start
+    assert all(case.case_id is not None for section in suite.testsections for case in section.testcases)
+    return elapsed
+
+
+def main(max_cases_amount: int, cases_per_section: int):
+    cases_amount = max_cases_amount // 8
+    while cases_amount <= max_cases_amount:
+        elapsed = run(cases_amount, cases_per_section)
+        print(f"{cases_amount:>7} cases: {elapsed:.3f} s ({elapsed / cases_amount * 1e6:.2f} us per case)")
+        cases_amount *= 2
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+    )
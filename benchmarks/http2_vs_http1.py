@@ -0,0 +1,53 @@
+"""
+Compares HTTP/1.1 connection pool with HTTP/2 multiplexed connection (negotiated over TLS)
+against local stand-in servers responding with fixed latency.
+Usage: python -m benchmarks.http2_vs_http1 [requests_amount] [server_delay_seconds]
+"""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.helpers.local_server_helpers import (
+    LocalTestRailHandler,
+    local_testrail_server,
+    local_h2_server,
+)
+from trcli.api.api_client import APIClient
+from trcli.settings import MAX_WORKERS_ADD_RESULTS
+
+BODY = {"results": [{"case_id": i, "status_id": 5, "comment": "Traceback " * 100} for i in range(50)]}
+
+
+def run(api_client: APIClient, requests_amount: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS_ADD_RESULTS) as executor:
+        list(executor.map(lambda _: api_client.send_post("add_results_for_cases/1", BODY), range(requests_amount)))
+    return time.perf_counter() - start
+
+
+def report(name: str, api_client: APIClient, requests_amount: int, elapsed: float):
+    stats = api_client.connection_stats()
+    print(
+        f"{name}: {requests_amount / elapsed:.0f} requests/s, "
+        f"connections opened: {stats.connections}, reused: {stats.reused}"
+    )
+
+
+def main(requests_amount: int, delay: float):
+    class DelayedHandler(LocalTestRailHandler):
+        pass
+
+    DelayedHandler.delay = delay
+    with local_testrail_server(DelayedHandler) as (_, url):
+        api_client = APIClient(url, verbose_logging_function=lambda _: None)
+        report("HTTP/1.1 pool", api_client, requests_amount, run(api_client, requests_amount))
+    with local_h2_server(delay) as (_, url):
+        api_client = APIClient(url, verbose_logging_function=lambda _: None, http2=True, verify=False)
+        report("HTTP/2", api_client, requests_amount, run(api_client, requests_amount))
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.02,
+    )
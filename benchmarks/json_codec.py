@@ -0,0 +1,41 @@
+"""
+Compares CPU time of encoding add_results_for_cases batches and decoding responses with available JSON codecs.
+Usage: python -m benchmarks.json_codec [batches_amount] [comment_length]
+"""
+import sys
+import time
+
+from trcli.api.json_codec import JsonCodec, OrjsonCodec
+from trcli.settings import DEFAULT_BATCH_SIZE
+
+
+def make_batch(comment_length: int) -> dict:
+    return {
+        "results": [
+            {"case_id": i, "status_id": 5, "elapsed": "1s", "comment": ("Traceback line\n" * comment_length)[:comment_length]}
+            for i in range(DEFAULT_BATCH_SIZE)
+        ]
+    }
+
+
+def run(codec: JsonCodec, batch: dict, batches_amount: int) -> float:
+    start = time.perf_counter()
+    for _ in range(batches_amount):
+        codec.loads(codec.dumps(batch))
+    return time.perf_counter() - start
+
+
+def main(batches_amount: int, comment_length: int):
+    batch = make_batch(comment_length)
+    print(f"Body size: {len(JsonCodec.dumps(batch)) / 1024:.0f} KiB")
+    codecs = [JsonCodec()] + ([OrjsonCodec()] if OrjsonCodec.is_available() else [])
+    for codec in codecs:
+        elapsed = run(codec, batch, batches_amount)
+        print(f"{codec.name}: {batches_amount / elapsed:.0f} batches/s (encode + decode)")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 4000,
+    )
@@ -0,0 +1,73 @@
+"""
+Compares time of reading all cases of a suite page by page (following next page links)
+and with remaining pages fetched in parallel, against local TestRail stand-in server with per-page latency.
+Usage: python -m benchmarks.pagination [cases_amount] [page_latency_ms]
+"""
+import sys
+import time
+from urllib.parse import parse_qs
+
+from tests.helpers.local_server_helpers import LocalTestRailHandler, local_testrail_server
+from trcli.api.api_client import APIClient
+from trcli.api.api_request_handler import ApiRequestHandler
+from trcli.cli import Environment
+from trcli.data_classes.dataclass_testrail import TestRailSuite
+from trcli.settings import MAX_WORKERS_GET_PAGES
+
+PAGE_SIZE = 250
+
+
+def make_handler(cases_amount: int, page_latency: float, report_limit: bool):
+    class PaginatedCasesHandler(LocalTestRailHandler):
+        delay = page_latency
+
+        def do_GET(self):
+            uri = self.path.split("?", 1)[1]
+            offset = int(parse_qs(uri).get("offset", ["0"])[0])
+            next_offset = offset + PAGE_SIZE
+            base = uri.split("&limit=")[0]
+            page = {
+                "offset": offset,
+                "_links": {
+                    "next": f"{base}&limit={PAGE_SIZE}&offset={next_offset}" if next_offset < cases_amount else None,
+                    "prev": None,
+                },
+                "cases": [
+                    {"id": i, "section_id": 1, "title": f"test_{i}", "custom_automation_id": f"test_{i}"}
+                    for i in range(offset, min(next_offset, cases_amount))
+                ],
+            }
+            if report_limit:
+                page["limit"] = PAGE_SIZE
+            self.respond(page)
+
+    return PaginatedCasesHandler
+
+
+def run(cases_amount: int, page_latency: float, parallel: bool) -> float:
+    with local_testrail_server(make_handler(cases_amount, page_latency, report_limit=parallel)) as (_, url):
+        environment = Environment()
+        environment.verbose = False
+        api_client = APIClient(url, verbose_logging_function=lambda _: None)
+        handler = ApiRequestHandler(environment, api_client, TestRailSuite(name="Suite", suite_id=1))
+        start = time.perf_counter()
+        _, error = handler.check_missing_test_cases_ids(1)
+        elapsed = time.perf_counter() - start
+    assert not error, error
+    return elapsed
+
+
+def main(cases_amount: int, page_latency_ms: int):
+    pages = -(-cases_amount // PAGE_SIZE)
+    sequential = run(cases_amount, page_latency_ms / 1000, parallel=False)
+    parallel = run(cases_amount, page_latency_ms / 1000, parallel=True)
+    print(f"{cases_amount} cases, {pages} pages, {page_latency_ms} ms per page")
+    print(f"sequential: {sequential:.2f} s")
+    print(f"parallel ({MAX_WORKERS_GET_PAGES} pages in flight): {parallel:.2f} s")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 120_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+    )
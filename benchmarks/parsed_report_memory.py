@@ -0,0 +1,96 @@
+"""
+Measures memory kept by JUnit report parsed into TestRailSuite (per test case, measured with tracemalloc).
+Generated report has failures and skips with repeated messages, like reports of real test suites.
+Report is parsed into slotted dataclasses and, as baseline, into the same dataclasses without slots
+(except with --columnar, where test cases are kept in columns instead of dataclasses).
+Usage: python -m benchmarks.parsed_report_memory [cases_amount] [cases_per_section] [--columnar]
+"""
+import inspect
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from types import ModuleType
+from unittest import mock
+
+from trcli.data_classes import dataclass_testrail
+from trcli.readers import junit_xml
+from trcli.readers.junit_xml import JunitParser
+
+DATACLASSES = ("TestRailResult", "TestRailCase", "TestRailProperty", "TestRailSection", "TestRailSuite")
+
+
+def write_report(path: Path, cases_amount: int, cases_per_section: int):
+    with open(path, "w") as report:
+        report.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuites name="Suite">\n')
+        for section_number, first_case in enumerate(range(0, cases_amount, cases_per_section)):
+            report.write(f'<testsuite name="tests.section_{section_number}">\n')
+            report.write('<properties><property name="os" value="linux"/></properties>\n')
+            for i in range(first_case, min(first_case + cases_per_section, cases_amount)):
+                report.write(
+                    f'<testcase classname="tests.section_{section_number}.TestClass" name="test_{i}" time="{i % 7}.5">'
+                )
+                if i % 10 == 0:
+                    report.write('<failure type="AssertionError" message="Response status is not 200">'
+                                 "assert 500 == 200</failure>")
+                elif i % 20 == 1:
+                    report.write('<skipped type="pytest.skip" message="Not supported on linux"/>')
+                report.write("</testcase>\n")
+            report.write("</testsuite>\n")
+        report.write("</testsuites>\n")
+
+
+def unslotted_dataclasses() -> ModuleType:
+    """Returns copy of dataclass_testrail module with the same dataclasses declared without slots."""
+    source = inspect.getsource(dataclass_testrail)
+    if "@dataclass(**SLOTS)" not in source:
+        raise RuntimeError("Slotted dataclasses not found in dataclass_testrail.")
+    module = ModuleType("unslotted_dataclass_testrail")
+    exec(compile(source.replace("@dataclass(**SLOTS)", "@dataclass"), dataclass_testrail.__file__, "exec"),
+         module.__dict__)
+    return module
+
+
+def measure(path: Path, columnar: bool) -> int:
+    parser = JunitParser(path, columnar=columnar)
+    tracemalloc.start()
+    suite = parser.parse_file()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del suite
+    return size
+
+
+def measure_unslotted(path: Path) -> int:
+    unslotted = unslotted_dataclasses()
+    with mock.patch.multiple(junit_xml, **{name: getattr(unslotted, name) for name in DATACLASSES}):
+        return measure(path, columnar=False)
+
+
+def describe(label: str, size: int, cases_amount: int) -> str:
+    return f"{label}: {size / 2 ** 20:.1f} MB ({size / cases_amount:.0f} bytes per test case)"
+
+
+def main(cases_amount: int, cases_per_section: int, columnar: bool):
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "report.xml"
+        write_report(path, cases_amount, cases_per_section)
+        if columnar:
+            print(describe(f"{cases_amount} test cases in columns", measure(path, columnar), cases_amount))
+            return
+        unslotted_size = measure_unslotted(path)
+        slotted_size = measure(path, columnar=False)
+    saved = unslotted_size - slotted_size
+    print(f"{cases_amount} test cases")
+    print(describe("  without slots", unslotted_size, cases_amount))
+    print(describe("  with slots", slotted_size, cases_amount))
+    print(describe("  saved", saved, cases_amount) + f", {saved / unslotted_size:.0%}")
+
+
+if __name__ == "__main__":
+    arguments = [argument for argument in sys.argv[1:] if argument != "--columnar"]
+    main(
+        int(arguments[0]) if len(arguments) > 0 else 100_000,
+        int(arguments[1]) if len(arguments) > 1 else 100,
+        "--columnar" in sys.argv[1:],
+    )
@@ -0,0 +1,83 @@
+"""
+Compares time and peak memory of decoding get_cases pages in full and with field projection.
+Paginated responses (250 cases per page) and single response with all cases (TestRail without pagination)
+are compared.
+Usage: python -m benchmarks.projected_decoding [cases_amount] [custom_field_length]
+"""
+import sys
+import time
+import tracemalloc
+
+from trcli.api import json_codec
+from trcli.api.json_codec import JsonCodec, OrjsonCodec, project
+
+PAGE_SIZE = 250
+FIELDS = ("id", "section_id", "title", "custom_automation_id")
+
+
+def make_pages(cases_amount: int, custom_field_length: int) -> list:
+    text = ("Step description " * custom_field_length)[:custom_field_length]
+    return [
+        JsonCodec.dumps(
+            {
+                "offset": offset,
+                "limit": PAGE_SIZE,
+                "size": PAGE_SIZE,
+                "_links": {"next": None, "prev": None},
+                "cases": [
+                    {
+                        "id": case_id,
+                        "title": f"test_case_{case_id}",
+                        "section_id": case_id // 100,
+                        "custom_automation_id": f"tests.module.test_case_{case_id}",
+                        "custom_preconds": text,
+                        "custom_steps_separated": [{"content": text, "expected": text}],
+                    }
+                    for case_id in range(offset, min(offset + PAGE_SIZE, cases_amount))
+                ],
+            }
+        )
+        for offset in range(0, cases_amount, PAGE_SIZE)
+    ]
+
+
+def run(name: str, decode, pages: list):
+    tracemalloc.start()
+    start = time.perf_counter()
+    cases = []
+    for page in pages:
+        response = decode(page)
+        cases.extend(response["cases"] if isinstance(response, dict) else response)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name}: {elapsed:.2f} s, peak memory {peak / 2 ** 20:.0f} MiB")
+
+
+def compare(pages: list):
+    codecs = [JsonCodec()] + ([OrjsonCodec()] if OrjsonCodec.is_available() else [])
+    for codec in codecs:
+        run(f"{codec.name} full", codec.loads, pages)
+        run(f"{codec.name} full + projection", lambda page: project(codec.loads(page), "cases", frozenset(FIELDS)), pages)
+    if json_codec.ijson is not None:
+        codec = JsonCodec()
+        codec.streaming_threshold = 0
+        run("ijson streaming projection", lambda page: codec.loads_projected(page, "cases", FIELDS), pages)
+
+
+def main(cases_amount: int, custom_field_length: int):
+    pages = make_pages(cases_amount, custom_field_length)
+    print(f"{cases_amount} cases, {sum(len(page) for page in pages) / 2 ** 20:.0f} MiB of responses")
+    print("Paginated responses:")
+    compare(pages)
+    print("Single response without pagination:")
+    all_cases = [case for page in pages for case in JsonCodec.loads(page)["cases"]]
+    del pages
+    compare([JsonCodec.dumps(all_cases)])
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2000,
+    )
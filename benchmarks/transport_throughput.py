@@ -0,0 +1,50 @@
+"""
+Compares throughput of thread pool and asyncio transports against local TestRail stand-in server.
+Usage: python -m benchmarks.transport_throughput [requests_amount]
+"""
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.helpers.local_server_helpers import local_testrail_server
+from trcli.api.api_client import APIClient
+from trcli.api.async_api_client import AsyncAPIClient
+from trcli.settings import MAX_WORKERS_ADD_RESULTS, DEFAULT_ASYNC_CONCURRENCY
+
+BODY = {"results": [{"case_id": i, "status_id": 1, "comment": "x" * 200} for i in range(50)]}
+
+
+def run_threads(api_client: APIClient, requests_amount: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS_ADD_RESULTS) as executor:
+        list(executor.map(lambda _: api_client.send_post("add_results_for_cases/1", BODY), range(requests_amount)))
+    return time.perf_counter() - start
+
+
+async def run_async(async_client: AsyncAPIClient, requests_amount: int) -> float:
+    semaphore = asyncio.Semaphore(async_client.concurrency)
+
+    async def send():
+        async with semaphore:
+            return await async_client.send_post("add_results_for_cases/1", BODY)
+
+    start = time.perf_counter()
+    async with async_client:
+        await asyncio.gather(*[send() for _ in range(requests_amount)])
+    return time.perf_counter() - start
+
+
+def main(requests_amount: int):
+    with local_testrail_server() as (_, url):
+        api_client = APIClient(url, verbose_logging_function=lambda _: None)
+        threads_time = run_threads(api_client, requests_amount)
+        async_time = asyncio.run(
+            run_async(AsyncAPIClient(api_client, concurrency=DEFAULT_ASYNC_CONCURRENCY), requests_amount)
+        )
+    print(f"threads ({MAX_WORKERS_ADD_RESULTS} workers): {requests_amount / threads_time:.0f} requests/s")
+    print(f"async (concurrency {DEFAULT_ASYNC_CONCURRENCY}): {requests_amount / async_time:.0f} requests/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
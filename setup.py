@@ -15,6 +15,7 @@ setup(
     ],
     include_package_data=True,
     install_requires=["click", "pyyaml", "junitparser", "pyserde", "requests", "tqdm", "humanfriendly"],
+    extras_require={"async": ["httpx"], "http2": ["httpx[http2]"], "fast-json": ["orjson"], "streaming": ["ijson"]},
     entry_points="""
         [console_scripts]
         trcli=trcli.cli:cli
@@ -0,0 +1,153 @@
+import asyncio
+import gzip
+import json
+import ssl
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import h2.config
+import h2.connection
+import h2.events
+
+# self-signed certificate of 127.0.0.1, clients connect to local servers with verify disabled
+TLS_DIRECTORY = Path(__file__).parent.parent / "test_data/tls"
+
+
+class LocalTestRailHandler(BaseHTTPRequestHandler):
+    """
+    Minimal keep-alive stand-in for TestRail API. Echoes request details back as JSON.
+    Gzip encoded request bodies are decompressed, JSON bodies are validated (400 if invalid).
+    """
+
+    protocol_version = "HTTP/1.1"
+    delay = 0
+
+    def do_GET(self):
+        self.respond({"method": "GET", "path": self.path})
+
+    def do_POST(self):
+        received = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = received
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(received)
+        self.server.received_bodies.append((dict(self.headers), body))
+        if self.headers.get("Content-Type") == "application/json":
+            try:
+                json.loads(body)
+            except ValueError:
+                self.respond({"error": "Invalid JSON body"}, status_code=400)
+                return
+        self.respond(
+            {"method": "POST", "path": self.path, "received_bytes": len(received), "decoded_bytes": len(body)}
+        )
+
+    def respond(self, body: dict, status_code: int = 200):
+        time.sleep(self.delay)
+        content = json.dumps(body).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def local_testrail_server(handler=LocalTestRailHandler):
+    """Starts local HTTP/1.1 server in background thread and yields its base url."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.received_bodies = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server, f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class LocalH2Protocol(asyncio.Protocol):
+    """Minimal HTTP/2 stand-in for TestRail API. Responds to every stream after delay."""
+
+    def __init__(self, server: "LocalH2Server"):
+        self.server = server
+        self.connection = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        self.streams = {}
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.server.connections += 1
+        self.transport = transport
+        self.connection.initiate_connection()
+        self.transport.write(self.connection.data_to_send())
+
+    def data_received(self, data: bytes):
+        for event in self.connection.receive_data(data):
+            if isinstance(event, h2.events.RequestReceived):
+                self.streams[event.stream_id] = (dict(event.headers), bytearray())
+            elif isinstance(event, h2.events.DataReceived):
+                self.streams[event.stream_id][1].extend(event.data)
+                self.connection.acknowledge_received_data(
+                    event.flow_controlled_length, event.stream_id
+                )
+            elif isinstance(event, h2.events.StreamEnded):
+                asyncio.get_running_loop().call_later(
+                    self.server.delay, self.respond, event.stream_id
+                )
+        self.transport.write(self.connection.data_to_send())
+
+    def respond(self, stream_id: int):
+        headers, body = self.streams.pop(stream_id)
+        self.server.requests += 1
+        content = json.dumps(
+            {"method": headers[":method"], "path": headers[":path"], "received_bytes": len(body)}
+        ).encode()
+        self.connection.send_headers(
+            stream_id,
+            [
+                (":status", "200"),
+                ("content-type", "application/json"),
+                ("content-length", str(len(content))),
+            ],
+        )
+        self.connection.send_data(stream_id, content, end_stream=True)
+        self.transport.write(self.connection.data_to_send())
+
+
+class LocalH2Server:
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.connections = 0
+        self.requests = 0
+
+
+@contextmanager
+def local_h2_server(delay: float = 0):
+    """
+    Starts local HTTP/2 server in background thread and yields its base url.
+    HTTP/2 is negotiated with ALPN over TLS (self-signed certificate), as with real TestRail hosts.
+    """
+    server = LocalH2Server(delay)
+    ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    ssl_context.load_cert_chain(TLS_DIRECTORY / "local_server.crt", TLS_DIRECTORY / "local_server.key")
+    ssl_context.set_alpn_protocols(["h2"])
+    loop = asyncio.new_event_loop()
+    asyncio_server = loop.run_until_complete(
+        loop.create_server(lambda: LocalH2Protocol(server), "127.0.0.1", 0, ssl=ssl_context)
+    )
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        yield server, f"https://127.0.0.1:{asyncio_server.sockets[0].getsockname()[1]}/"
+    finally:
+        asyncio_server.close()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
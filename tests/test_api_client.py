@@ -1,8 +1,22 @@
+import json
+import time
 import pytest
 from trcli.constants import FAULT_MAPPING
 from trcli.cli import Environment
 from trcli.api.api_client import APIClient
-from requests.exceptions import RequestException, Timeout, ConnectionError
+from trcli.api.retry_policy import RetryPolicy
+from trcli.api.json_codec import JsonCodec
+from trcli.api.hedging_policy import HedgingPolicy
+from trcli.api.circuit_breaker import CircuitBreaker
+from trcli.api.rate_limiter import RateLimiter
+from trcli.settings import MAX_WORKERS_ADD_RESULTS
+from requests.exceptions import RequestException, Timeout, ConnectionError, ReadTimeout
+from concurrent.futures import ThreadPoolExecutor
+from tests.helpers.local_server_helpers import (
+    LocalTestRailHandler,
+    local_testrail_server,
+    local_h2_server,
+)
 from tests.helpers.api_client_helpers import (
     TEST_RAIL_URL,
     create_url,
@@ -53,6 +67,25 @@ class TestAPIClient:
         check_calls_count(requests_mock)
         check_response(200, FAKE_PROJECT_DATA, "", response)
 
+    @pytest.mark.api_client
+    @pytest.mark.parametrize("verbose", [False, True], ids=["verbose_off", "verbose_on"])
+    def test_request_log_formatted_only_in_verbose_mode(self, verbose, requests_mock, mocker):
+        """The purpose of this test is to check that request and response logs are formatted
+        only when verbose logging function is set."""
+        requests_mock.post(create_url("add_project"), status_code=201, json=FAKE_PROJECT_DATA)
+        logged = []
+        format_request = mocker.spy(APIClient, "format_request_for_vlog")
+        format_response = mocker.spy(APIClient, "format_response_for_vlog")
+        api_client = APIClient(
+            host_name=TEST_RAIL_URL, verbose_logging_function=logged.append if verbose else None
+        )
+
+        response = api_client.send_post("add_project", {"name": "x" * 1000})
+
+        check_response(201, FAKE_PROJECT_DATA, "", response)
+        assert (format_request.call_count, format_response.call_count) == ((1, 1) if verbose else (0, 0))
+        assert len(logged) == (1 if verbose else 0)
+
     @pytest.mark.api_client
     def test_send_post_status_code_success(self, api_resources, requests_mock):
         """The purpose of this test is to check behaviour of send_post one receiving successful status code.
@@ -167,6 +200,198 @@ class TestAPIClient:
         check_response(-1, "", expected_error_msg, response)
         environment.vlog.assert_has_calls(expected_log_calls)
 
+    @pytest.mark.api_client
+    def test_post_read_timeout_is_not_retried(self, api_resources_maker, requests_mock):
+        """The purpose of this test is to check that non-idempotent POST request is not sent again
+        after read timeout, as it could be already processed by the server."""
+        requests_mock.post(create_url("add_results_for_cases/1"), exc=ReadTimeout)
+        api_client = api_resources_maker(retries=3)
+        response = api_client.send_post("add_results_for_cases/1", {"results": []})
+
+        check_calls_count(requests_mock, 1)
+        check_response(-1, "", FAULT_MAPPING["no_response_from_host"], response)
+
+    @pytest.mark.api_client
+    def test_retry_policy_backoff_and_status_codes(self, requests_mock, mocker):
+        """The purpose of this test is to check that retry policy status codes are retried
+        with exponential backoff between attempts."""
+        requests_mock.get(
+            create_url("get_projects"),
+            [
+                {"status_code": 503, "json": {"error": "Service unavailable"}},
+                {"status_code": 503, "json": {"error": "Service unavailable"}},
+                {"status_code": 200, "json": FAKE_PROJECT_DATA},
+            ],
+        )
+        sleep_mock = mocker.patch("trcli.api.api_client.sleep")
+        api_client = APIClient(
+            host_name=TEST_RAIL_URL,
+            verbose_logging_function=print,
+            retry_policy=RetryPolicy(retries=3, backoff_factor=1, jitter=False),
+        )
+        response = api_client.send_get("get_projects")
+
+        check_calls_count(requests_mock, 3)
+        assert sleep_mock.call_args_list == [mocker.call(1), mocker.call(2)]
+        check_response(200, FAKE_PROJECT_DATA, "", response)
+
+    @pytest.mark.api_client
+    def test_body_is_encoded_once_for_retries(self, requests_mock, mocker):
+        """The purpose of this test is to check that request body is encoded only once
+        and the same bytes are sent on every retry."""
+        requests_mock.post(
+            create_url("add_results_for_cases/1"),
+            [
+                {"status_code": 500, "json": {"error": "Internal error"}},
+                {"status_code": 200, "json": FAKE_PROJECT_DATA},
+            ],
+        )
+        json_codec = JsonCodec()
+        dumps_spy = mocker.spy(json_codec, "dumps")
+        api_client = APIClient(
+            host_name=TEST_RAIL_URL, verbose_logging_function=print, json_codec=json_codec
+        )
+        payload = {"results": [{"case_id": 1, "comment": "Failed"}]}
+        response = api_client.send_post("add_results_for_cases/1", payload)
+
+        assert dumps_spy.call_count == 1
+        bodies = [request.body for request in requests_mock.request_history]
+        assert bodies == [json_codec.dumps(payload)] * 2
+        assert requests_mock.last_request.headers["Content-Type"] == "application/json"
+        check_response(200, FAKE_PROJECT_DATA, "", response)
+
+    @pytest.mark.api_client
+    def test_prefetched_response_is_used_once(self, api_resources, requests_mock):
+        """The purpose of this test is to check that prefetched GET response is returned by send_get
+        without sending the request again and that POST request drops prefetched responses."""
+        requests_mock.get(create_url("get_projects"), json=FAKE_PROJECT_DATA)
+        requests_mock.post(create_url("add_project"), json=FAKE_PROJECT_DATA)
+
+        api_resources.prefetch("get_projects").result()
+        check_response(200, FAKE_PROJECT_DATA, "", api_resources.send_get("get_projects"))
+        check_calls_count(requests_mock, 1)
+
+        api_resources.prefetch("get_projects").result()
+        api_resources.send_post("add_project", {"name": "Project"})
+        check_response(200, FAKE_PROJECT_DATA, "", api_resources.send_get("get_projects"))
+        check_calls_count(requests_mock, 4)
+        assert api_resources.memo_stats() == (1, 2)
+
+    @pytest.mark.api_client
+    def test_failed_prefetch_is_not_memoized(self, requests_mock):
+        """The purpose of this test is to check that failed prefetched lookup is not kept,
+        so following identical requests are sent again."""
+        api_client = APIClient(host_name=TEST_RAIL_URL, verbose_logging_function=None, memoize_lookups=True)
+        requests_mock.get(
+            create_url("get_suites/1"),
+            [
+                {"status_code": 400, "json": {"error": "Temporary error"}},
+                {"status_code": 200, "json": [{"id": 1, "name": "Suite"}]},
+            ],
+        )
+
+        assert api_client.prefetch("get_suites/1").result().status_code == 400
+        responses = [api_client.send_get("get_suites/1") for _ in range(2)]
+
+        assert [response.status_code for response in responses] == [200, 200]
+        check_calls_count(requests_mock, 2)
+
+    @pytest.mark.api_client
+    def test_identical_gets_share_one_request(self, requests_mock):
+        """The purpose of this test is to check that concurrent identical GET requests share one in-flight request,
+        failed responses are not memoized and POST to the same resource drops memoized response."""
+        api_client = APIClient(host_name=TEST_RAIL_URL, verbose_logging_function=lambda _: None, memoize_lookups=True)
+
+        def slow_suites(request, context):
+            time.sleep(0.1)
+            return [{"id": 1, "name": "Suite"}]
+
+        requests_mock.get(create_url("get_suites/1"), json=slow_suites)
+        requests_mock.get(create_url("get_run/2"), status_code=403, json={"error": "No access"})
+        requests_mock.post(create_url("add_suite/1"), json={"id": 2, "name": "Suite 2"})
+        requests_mock.post(create_url("add_results_for_cases/2"), json=[])
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            responses = list(executor.map(lambda _: api_client.send_get("get_suites/1"), range(5)))
+        assert all(response.response_text == [{"id": 1, "name": "Suite"}] for response in responses)
+        check_calls_count(requests_mock, 1)
+
+        api_client.send_post("add_results_for_cases/2", {"results": []})
+        api_client.send_get("get_suites/1")
+        check_calls_count(requests_mock, 2)
+
+        api_client.send_post("add_suite/1", {"name": "Suite 2"})
+        api_client.send_get("get_suites/1")
+        check_calls_count(requests_mock, 4)
+
+        api_client.send_get("get_run/2")
+        api_client.send_get("get_run/2")
+        check_calls_count(requests_mock, 6)
+        assert api_client.memo_stats() == (5, 4)
+
+    @pytest.mark.api_client
+    def test_open_circuit_fails_fast(self, requests_mock):
+        """The purpose of this test is to check that after consecutive network errors requests
+        are not sent anymore and fail immediately with proper error message."""
+        requests_mock.post(create_url("add_results_for_cases/1"), exc=ConnectionError)
+        api_client = APIClient(
+            host_name=TEST_RAIL_URL,
+            verbose_logging_function=lambda _: None,
+            retries=3,
+            circuit_breaker=CircuitBreaker(failure_threshold=2, logging_function=lambda _: None),
+        )
+        first_response = api_client.send_post("add_results_for_cases/1", {"results": []})
+        second_response = api_client.send_post("add_results_for_cases/1", {"results": []})
+
+        check_calls_count(requests_mock, 2)
+        expected_error = FAULT_MAPPING["circuit_open"].format(failures=2)
+        check_response(-1, "", expected_error, first_response)
+        check_response(-1, "", expected_error, second_response)
+
+    @pytest.mark.api_client
+    def test_bandwidth_limiter_shapes_uploads(self, tmp_path, requests_mock):
+        """The purpose of this test is to check that uploaded file size is taken from bandwidth budget
+        and that sent bytes are counted in traffic statistics."""
+        requests_mock.post(create_url("add_attachment_to_result/1"), json={"attachment_id": 1})
+        bandwidth_limiter = RateLimiter(1000)
+        api_client = APIClient(
+            host_name=TEST_RAIL_URL,
+            verbose_logging_function=lambda _: None,
+            bandwidth_limiter=bandwidth_limiter,
+        )
+        attachment = tmp_path / "screenshot.png"
+        attachment.write_bytes(b"x" * 1100)
+        with open(attachment, "rb") as file:
+            response = api_client.send_post("add_attachment_to_result/1", files={"attachment": file})
+
+        check_response(200, {"attachment_id": 1}, "", response)
+        assert bandwidth_limiter.throttled_time == pytest.approx(0.1, abs=0.05)
+        assert api_client.traffic_stats()["POST"].requests == 1
+        assert api_client.traffic_stats()["POST"].bytes_sent == 1100
+
+    @pytest.mark.api_client
+    def test_traffic_stats_are_classified_by_endpoint(self, requests_mock):
+        """The purpose of this test is to check that traffic statistics are kept per endpoint, so requests
+        of results are reported separately from other POST requests (e.g. add_case, add_run)."""
+        requests_mock.post(create_url("add_results_for_cases/1"), json=[{"id": 1}])
+        requests_mock.post(create_url("add_case/2"), json={"id": 2})
+        requests_mock.post(create_url("add_run/3"), json={"id": 3})
+        requests_mock.get(create_url("get_cases/3&suite_id=4"), json={"cases": []})
+        api_client = APIClient(host_name=TEST_RAIL_URL, verbose_logging_function=lambda _: None)
+        for uri in ("add_results_for_cases/1", "add_results_for_cases/1", "add_case/2", "add_run/3"):
+            api_client.send_post(uri, {"id": 1})
+        api_client.send_get("get_cases/3&suite_id=4")
+
+        by_method = api_client.traffic_stats()
+        by_class = api_client.traffic_stats(
+            lambda method, endpoint: "results" if endpoint == "add_results_for_cases" else method
+        )
+
+        assert {name: stats.requests for name, stats in by_method.items()} == {"POST": 4, "GET": 1}
+        assert {name: stats.requests for name, stats in by_class.items()} == {"results": 2, "POST": 2, "GET": 1}
+        assert by_class["results"].bytes_sent + by_class["POST"].bytes_sent == by_method["POST"].bytes_sent
+        assert by_class["results"].duration <= by_method["POST"].duration
+
     @pytest.mark.api_client
     def test_request_exception(self, api_resources_maker, requests_mock, mocker):
         """The purpose of this test is to check that request exception during request sending would be caught and handled
@@ -280,3 +505,158 @@ class TestAPIClient:
         else:
             with pytest.raises(AssertionError):
                 environment.log.assert_has_calls([mocker.call(TIMEOUT_PARSE_ERROR)])
+
+    @pytest.mark.api_client
+    def test_connections_are_reused(self):
+        """The purpose of this test is to check that APIClient keeps connections alive in its pool
+        and reuses them across sequential and concurrent requests."""
+        workers = 4
+        with local_testrail_server() as (server, url):
+            api_client = APIClient(
+                host_name=url,
+                verbose_logging_function=lambda _: None,
+                pool_size=workers,
+            )
+            for _ in range(5):
+                response = api_client.send_get("get_projects")
+                assert response.status_code == 200, "Request to local server failed."
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                responses = list(
+                    executor.map(
+                        lambda i: api_client.send_post("add_result", {"id": i}),
+                        range(40),
+                    )
+                )
+            stats = api_client.connection_stats()
+            api_client.close()
+
+        assert all(response.status_code == 200 for response in responses)
+        assert stats.requests == 45, f"Expected 45 pooled requests, got {stats.requests}."
+        assert (
+            stats.connections <= workers
+        ), f"Expected at most {workers} connections, got {stats.connections}."
+        assert stats.reused == stats.requests - stats.connections
+
+    @pytest.mark.api_client
+    def test_large_bodies_are_compressed(self):
+        """The purpose of this test is to check that request bodies above compression threshold are sent
+        gzip encoded, smaller bodies are sent as is and bytes saved are reported."""
+        large_payload = {"results": [{"case_id": i, "comment": "Traceback " * 50} for i in range(50)]}
+        small_payload = {"name": "Run"}
+        with local_testrail_server() as (server, url):
+            api_client = APIClient(
+                host_name=url,
+                verbose_logging_function=lambda _: None,
+                compression_threshold=1024,
+            )
+            large_response = api_client.send_post("add_results_for_cases/1", large_payload)
+            small_response = api_client.send_post("add_run/1", small_payload)
+            api_client.close()
+
+        (large_headers, large_body), (small_headers, small_body) = server.received_bodies
+        assert large_response.status_code == 200, "Server could not decode compressed body."
+        assert large_headers["Content-Encoding"] == "gzip"
+        assert json.loads(large_body) == large_payload
+        assert "Content-Encoding" not in small_headers
+        assert json.loads(small_body) == small_payload
+        assert small_response.response_text["received_bytes"] == len(small_body)
+
+        stats = api_client.compression_stats()
+        assert stats.requests == 1
+        assert stats.original_bytes == large_response.response_text["decoded_bytes"]
+        assert stats.compressed_bytes == large_response.response_text["received_bytes"]
+        assert stats.saved_bytes > stats.original_bytes * 0.9
+
+    @pytest.mark.api_client
+    def test_stalled_get_is_hedged(self):
+        """The purpose of this test is to check that GET request taking longer than latency percentile
+        of earlier requests is duplicated and the faster response is returned."""
+
+        class StallingHandler(LocalTestRailHandler):
+            stalls = [0] * 5 + [1.0]
+
+            def do_GET(self):
+                self.delay = self.stalls.pop(0) if self.stalls else 0
+                super().do_GET()
+
+        hedging_policy = HedgingPolicy(percentile=50, min_samples=5)
+        with local_testrail_server(StallingHandler) as (_, url):
+            api_client = APIClient(host_name=url, verbose_logging_function=lambda _: None, hedging_policy=hedging_policy)
+            for _ in range(5):
+                api_client.send_get("get_cases/1", hedge=True)
+            assert hedging_policy.hedges_sent == 0, "Fast requests should not be hedged."
+            start = time.monotonic()
+            response = api_client.send_get("get_cases/1&offset=250", hedge=True)
+            elapsed = time.monotonic() - start
+            api_client.close()
+
+        assert response.status_code == 200
+        assert response.response_text["path"].endswith("get_cases/1&offset=250")
+        assert elapsed < 0.5, f"Stalled request should be answered by hedge, took {elapsed:.2f} secs."
+        assert (hedging_policy.hedges_sent, hedging_policy.hedges_won) == (1, 1)
+
+    @pytest.mark.api_client
+    def test_http2_requests_are_multiplexed(self):
+        """The purpose of this test is to check that with http2 enabled concurrent requests from all
+        workers are sent as streams over a single connection."""
+        with local_h2_server(delay=0.05) as (server, url):
+            api_client = APIClient(
+                host_name=url,
+                verbose_logging_function=lambda _: None,
+                http2=True,
+                verify=False,
+            )
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                responses = list(
+                    executor.map(
+                        lambda i: api_client.send_post("add_results_for_cases/1", {"id": i}),
+                        range(30),
+                    )
+                )
+            stats = api_client.connection_stats()
+            api_client.close()
+
+        assert all(response.status_code == 200 for response in responses)
+        assert responses[0].response_text["method"] == "POST"
+        assert server.connections == 1, f"Expected single connection, got {server.connections}."
+        assert stats.requests == 30 and stats.connections == 1
+
+    @pytest.mark.api_client
+    def test_http2_falls_back_to_http1_for_plain_http_host(self):
+        """The purpose of this test is to check that with http2 enabled requests to plain http host
+        supporting only HTTP/1.1 are sent over HTTP/1.1 instead of failing."""
+        with local_testrail_server() as (server, url):
+            api_client = APIClient(host_name=url, verbose_logging_function=lambda _: None, http2=True)
+            get_response = api_client.send_get("get_cases/1")
+            post_response = api_client.send_post("add_run/1", {"name": "Run"})
+            api_client.close()
+
+        assert (get_response.status_code, post_response.status_code) == (200, 200)
+        assert get_response.response_text["path"].endswith("get_cases/1")
+        assert json.loads(server.received_bodies[0][1]) == {"name": "Run"}
+
+    @pytest.mark.api_client
+    def test_http2_concurrent_large_bodies(self):
+        """The purpose of this test is to check that results-sized bodies sent concurrently from all
+        results workers over http2 connection are all answered."""
+        body = {"results": [{"case_id": i, "status_id": 5, "comment": "Traceback " * 100} for i in range(50)]}
+        body_size = len(json.dumps(body, separators=(",", ":")).encode())
+        with local_h2_server(delay=0.01) as (server, url):
+            api_client = APIClient(
+                host_name=url,
+                verbose_logging_function=lambda _: None,
+                http2=True,
+                verify=False,
+            )
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS_ADD_RESULTS) as executor:
+                responses = list(
+                    executor.map(
+                        lambda _: api_client.send_post("add_results_for_cases/1", body),
+                        range(4 * MAX_WORKERS_ADD_RESULTS),
+                    )
+                )
+            api_client.close()
+
+        assert [response.status_code for response in responses] == [200] * 4 * MAX_WORKERS_ADD_RESULTS
+        assert all(response.response_text["received_bytes"] >= body_size for response in responses)
+        assert server.connections == 1
@@ -1,6 +1,8 @@
 from tests.test_data.api_data_provider_test_data import *
 from trcli.data_providers.api_data_provider import ApiDataProvider
+from trcli.data_classes.dataclass_testrail import TestRailCase, TestRailResult, TestRailSection, TestRailSuite
 import pytest
+import trcli.data_providers.api_data_provider
 
 
 @pytest.fixture(scope="function")
@@ -98,6 +100,20 @@ class TestApiDataProvider:
             == post_results_for_cases_body
         ), "Adding results data doesn't match expected body"
 
+    @pytest.mark.data_provider
+    def test_results_for_cases_are_created_lazily(self, post_data_provider, mocker):
+        """The purpose of this test is to check that lazily created results bodies match bodies created at once
+        and that results are converted only when their bulk is requested."""
+        to_body = mocker.patch(
+            "trcli.data_providers.api_data_provider.to_body",
+            side_effect=trcli.data_providers.api_data_provider.to_body,
+        )
+        bodies = post_data_provider.iter_results_for_cases(bulk_size=1)
+        assert to_body.call_count == 0, "No bodies should be created before they are requested."
+        bodies = list(bodies)
+        assert bodies == post_data_provider.add_results_for_cases(bulk_size=1)
+        assert post_data_provider.results_for_cases_amount() == sum(len(body["results"]) for body in bodies)
+
     @pytest.mark.data_provider
     def test_return_all_items_flag(self, post_data_provider):
         all_sections = 3
@@ -111,23 +127,6 @@ class TestApiDataProvider:
             == all_cases
         ), f"Adding cases with return_all_items flag should match {all_cases}"
 
-    @pytest.mark.data_provider
-    @pytest.mark.parametrize(
-        "list_to_divide, bulk_size, expected_result",
-        [
-            ([1, 2, 3, 4, 5, 6], 3, [[1, 2, 3], [4, 5, 6]]),
-            ([1, 2, 3, 4, 5, 6], 4, [[1, 2, 3, 4], [5, 6]]),
-            ([1, 2, 3, 4, 5, 6], 6, [[1, 2, 3, 4, 5, 6]]),
-            ([1, 2, 3, 4, 5, 6], 7, [[1, 2, 3, 4, 5, 6]]),
-            ([], 2, []),
-        ],
-    )
-    def test_divide_list_into_bulks(self, list_to_divide, bulk_size, expected_result):
-        result = ApiDataProvider.divide_list_into_bulks(list_to_divide, bulk_size)
-        assert (
-            result == expected_result
-        ), f"Expected: {expected_result} but got {result} instead."
-
     @pytest.mark.parametrize(
         "case_id, expected_result",
         [(1, None), (10, None)],
@@ -176,3 +175,36 @@ class TestApiDataProvider:
         result = post_data_provider.check_for_case_names_duplicates()
 
         assert not result, "Expected False as a result."
+
+    @pytest.mark.data_provider
+    def test_update_data_matches_first_item_with_same_key(self):
+        """The purpose of this test is to check that indexed sections and test cases are updated
+        the same way as by scanning them in order: only first item with matching name or automation ID."""
+        suite = TestRailSuite(
+            name="Suite",
+            testsections=[
+                TestRailSection(
+                    name="Section",
+                    suite_id=1,
+                    testcases=[
+                        TestRailCase(section_id=None, title=f"test_{i}", custom_automation_id="tests.test",
+                                     result=TestRailResult(case_id=None))
+                        for i in range(2)
+                    ],
+                )
+                for _ in range(2)
+            ],
+        )
+        data_provider = ApiDataProvider(suite)
+
+        data_provider.update_data(section_data=[{"name": "Section", "section_id": 5}])
+        data_provider.update_data(
+            case_data=[{"case_id": 7, "section_id": 5, "title": "test_0", "custom_automation_id": "tests.test"}]
+        )
+
+        first_section, second_section = suite.testsections
+        assert [first_section.section_id, second_section.section_id] == [5, None]
+        assert [case.case_id for section in suite.testsections for case in section.testcases] == [7, None, None, None]
+        assert first_section.testcases[0].result.case_id == 7
+        assert data_provider.check_section_names_duplicates()
+        assert data_provider.check_for_case_names_duplicates()
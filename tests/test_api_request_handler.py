@@ -1,6 +1,12 @@
+import asyncio
 import json
+import re
+import sys
+import time
+from threading import Lock
 from unittest.mock import patch, mock_open, call
 
+import httpx
 import requests
 import pytest
 from pathlib import Path
@@ -8,9 +14,11 @@ from serde.json import from_json
 from tests.helpers.api_client_helpers import TEST_RAIL_URL, create_url
 from trcli.cli import Environment
 from trcli.api.api_request_handler import ApiRequestHandler, ProjectData
-from trcli.api.api_client import APIClient
+from trcli.api.api_client import APIClient, APIClientResult
+from trcli.api.async_api_client import AsyncAPIClient
 from trcli.data_classes.dataclass_testrail import TestRailSuite
 from trcli.constants import ProjectErrors, FAULT_MAPPING
+from trcli.settings import MAX_WORKERS_GET_PAGES, RESULTS_BATCHES_IN_FLIGHT
 
 
 @pytest.fixture(scope="function")
@@ -380,6 +388,240 @@ class TestApiRequestHandler:
             mock_file.assert_any_call("./path1", "rb")
             mock_file.assert_any_call("./path2", "rb")
 
+    @pytest.mark.api_handler
+    def test_add_results_attachments_use_attachment_client(
+        self, api_request_handler: ApiRequestHandler, requests_mock
+    ):
+        """The purpose of this test is to check that attachments are uploaded through separate
+        attachment client, while results are added through main API client."""
+        run_id = 2
+        result_id = 9
+        requests_mock.post(
+            create_url(f"add_results_for_cases/{run_id}"),
+            json=[{"id": result_id, "status_id": 5, "test_id": 4}],
+        )
+        requests_mock.get(
+            create_url(f"get_tests/{run_id}"),
+            json={"_links": {"next": None, "prev": None}, "tests": [{"id": 4, "case_id": 1}]},
+        )
+        requests_mock.post(
+            create_url(f"add_attachment_to_result/{result_id}"), json={"attachment_id": 123}
+        )
+        api_request_handler.attachment_client = APIClient(host_name=TEST_RAIL_URL)
+
+        with patch("builtins.open", mock_open()):
+            _, error, _ = api_request_handler.add_results(run_id)
+
+        assert error == "", "Error occurred in add_results"
+        assert api_request_handler.client.traffic_stats()["POST"].requests == 1
+        assert api_request_handler.attachment_client.traffic_stats()["POST"].requests == 2
+
+    @pytest.mark.api_handler
+    @pytest.mark.parametrize("with_attachments", [True, False], ids=["with_attachments", "without_attachments"])
+    def test_add_results_reads_tests_of_run_before_results(
+        self, with_attachments, api_request_handler: ApiRequestHandler, requests_mock, mocker
+    ):
+        """The purpose of this test is to check that tests of the run are read once, before results are sent
+        (not by results workers), and only when some results have attachments."""
+        run_id = 2
+        requests_mock.post(
+            create_url(f"add_results_for_cases/{run_id}"), json=[{"id": 9, "status_id": 5, "test_id": 4}]
+        )
+        requests_mock.get(
+            create_url(f"get_tests/{run_id}"),
+            json={"_links": {"next": None, "prev": None}, "tests": [{"id": 4, "case_id": 1}]},
+        )
+        requests_mock.post(create_url("add_attachment_to_result/9"), json={"attachment_id": 123})
+        if not with_attachments:
+            mocker.patch.object(api_request_handler.data_provider, "attachments_for_cases", return_value={})
+
+        with patch("builtins.open", mock_open()):
+            _, error, _ = api_request_handler.add_results(run_id)
+
+        paths = [request.url for request in requests_mock.request_history]
+        tests_requests = [index for index, path in enumerate(paths) if "get_tests" in path]
+        assert error == ""
+        assert any("add_results_for_cases" in path for path in paths)
+        assert tests_requests == ([0] if with_attachments else [])
+
+    @pytest.mark.api_handler
+    def test_add_results_bodies_are_created_lazily(self, api_request_handler: ApiRequestHandler, mocker):
+        """The purpose of this test is to check that results bodies are created batch by batch
+        and no more than RESULTS_BATCHES_IN_FLIGHT of them exist before their requests are finished."""
+        run_id = 2
+        batches_amount = 5 * RESULTS_BATCHES_IN_FLIGHT
+        counters = {"created": 0, "sent": 0, "max_unsent": 0}
+        lock = Lock()
+
+        def bodies(bulk_size):
+            for _ in range(batches_amount):
+                with lock:
+                    counters["created"] += 1
+                yield {"results": [{"case_id": 1, "status_id": 1}]}
+
+        def send_post(uri, payload=None, files=None):
+            with lock:
+                counters["max_unsent"] = max(counters["max_unsent"], counters["created"] - counters["sent"])
+                counters["sent"] += 1
+            return APIClientResult(200, [{"id": 1, "test_id": 1}], "")
+
+        mocker.patch.object(api_request_handler.data_provider, "iter_results_for_cases", side_effect=bodies)
+        mocker.patch.object(api_request_handler.client, "send_post", side_effect=send_post)
+
+        responses, error, results_added = api_request_handler.add_results(run_id)
+
+        assert error == ""
+        assert len(responses) == results_added == batches_amount
+        assert counters["max_unsent"] <= RESULTS_BATCHES_IN_FLIGHT, "Too many bodies were created ahead."
+
+    @pytest.mark.api_handler
+    def test_add_results_async(self, api_request_handler: ApiRequestHandler, requests_mock):
+        """The purpose of this test is to check that with async transport results are added through async client
+        and attachments are uploaded through asyncio client of attachment client (own pool and bandwidth limit)."""
+        run_id = 2
+        result_id = 9
+        mocked_response = [{"id": result_id, "status_id": 5, "test_id": 4}]
+        posted_uris = []
+
+        def async_handler(request: httpx.Request):
+            posted_uris.append(str(request.url).lower())
+            if "add_results_for_cases" in str(request.url):
+                return httpx.Response(200, json=mocked_response)
+            return httpx.Response(200, json={"attachment_id": 123})
+
+        tests_mocked_response = {
+            "_links": {"next": None, "prev": None},
+            "tests": [{"id": 4, "case_id": 1, "run_id": run_id}],
+        }
+        requests_mock.get(create_url(f"get_tests/{run_id}"), json=tests_mocked_response)
+        api_request_handler.async_client = AsyncAPIClient(
+            api_request_handler.client, transport=httpx.MockTransport(async_handler)
+        )
+        api_request_handler.attachment_client = APIClient(host_name=TEST_RAIL_URL)
+
+        with patch("builtins.open", mock_open()) as mock_file:
+            resources_added, error, results_added = asyncio.run(
+                api_request_handler.add_results_async(run_id)
+            )
+            mock_file.assert_any_call("./path1", "rb")
+            mock_file.assert_any_call("./path2", "rb")
+        assert [mocked_response] == resources_added, "Invalid response from add_results_async"
+        assert error == "", "Error occurred in add_results_async"
+        assert results_added == len(mocked_response)
+        assert posted_uris.count(create_url(f"add_attachment_to_result/{result_id}").lower()) == 2
+        assert api_request_handler.client.traffic_stats()["POST"].requests == 1
+        assert (
+            api_request_handler.attachment_client.traffic_stats()["POST"].requests == 2
+        ), "Both attachments should be uploaded through attachment client."
+
+    @pytest.mark.api_handler
+    def test_add_results_async_opens_attachments_when_sent(self, api_request_handler: ApiRequestHandler, requests_mock):
+        """The purpose of this test is to check that attachment files are opened only when their upload
+        starts, so no more files than attachments concurrency are open at once."""
+        run_id = 2
+        result_id = 9
+        open_files = {"now": 0, "max": 0, "uploaded": 0}
+
+        class CountedFile:
+            def __init__(self, *args):
+                pass
+
+            def __enter__(self):
+                open_files["now"] += 1
+                open_files["max"] = max(open_files["max"], open_files["now"])
+                return b"attachment"
+
+            def __exit__(self, *exc_info):
+                open_files["now"] -= 1
+
+        async def async_handler(request: httpx.Request):
+            if "add_results_for_cases" in str(request.url):
+                return httpx.Response(200, json=[{"id": result_id, "status_id": 5, "test_id": 4}])
+            await asyncio.sleep(0.01)
+            open_files["uploaded"] += 1
+            return httpx.Response(200, json={"attachment_id": 123})
+
+        requests_mock.get(
+            create_url(f"get_tests/{run_id}"),
+            json={"_links": {"next": None, "prev": None}, "tests": [{"id": 4, "case_id": 1, "run_id": run_id}]},
+        )
+        transport = httpx.MockTransport(async_handler)
+        api_request_handler.async_client = AsyncAPIClient(api_request_handler.client, transport=transport)
+        api_request_handler.attachment_async_client = AsyncAPIClient(
+            api_request_handler.attachment_client, concurrency=1, transport=transport
+        )
+
+        with patch("builtins.open", CountedFile):
+            _, error, _ = asyncio.run(api_request_handler.add_results_async(run_id))
+
+        assert error == ""
+        assert open_files["uploaded"] == 2
+        assert open_files["max"] == 1, "Attachment files should be opened only inside of semaphore."
+
+    @pytest.mark.api_handler
+    def test_add_results_async_uploads_attachments_per_batch(
+        self, api_request_handler: ApiRequestHandler, requests_mock, mocker
+    ):
+        """The purpose of this test is to check that with async transport attachments of added results batch
+        are uploaded while other results batches are still being sent."""
+        run_id = 2
+        events = []
+
+        async def async_handler(request: httpx.Request):
+            if "add_attachment_to_result" in str(request.url):
+                events.append("attachment")
+                return httpx.Response(200, json={"attachment_id": 123})
+            case_id = json.loads(request.content)["results"][0]["case_id"]
+            if case_id == 2:
+                # second batch is answered only after attachment of the first one is uploaded
+                for _ in range(100):
+                    if "attachment" in events:
+                        break
+                    await asyncio.sleep(0.01)
+            events.append(f"results {case_id}")
+            return httpx.Response(200, json=[{"id": 10 + case_id, "status_id": 1, "test_id": 20 + case_id}])
+
+        requests_mock.get(
+            create_url(f"get_tests/{run_id}"),
+            json={"_links": {"next": None, "prev": None}, "tests": [{"id": 21, "case_id": 1}, {"id": 22, "case_id": 2}]},
+        )
+        mocker.patch.object(
+            api_request_handler.data_provider,
+            "iter_results_for_cases",
+            return_value=iter([{"results": [{"case_id": 1, "status_id": 1}]}, {"results": [{"case_id": 2, "status_id": 1}]}]),
+        )
+        mocker.patch.object(api_request_handler.data_provider, "attachments_for_cases", return_value={1: ["./path1"]})
+        api_request_handler.async_client = AsyncAPIClient(
+            api_request_handler.client, transport=httpx.MockTransport(async_handler)
+        )
+
+        with patch("builtins.open", mock_open()):
+            responses, error, _ = asyncio.run(api_request_handler.add_results_async(run_id))
+
+        assert error == "" and len(responses) == 2
+        assert events == ["results 1", "attachment", "results 2"]
+
+    @pytest.mark.api_handler
+    def test_add_results_async_error(self, api_request_handler: ApiRequestHandler, requests_mock):
+        run_id = 3
+
+        def async_handler(request: httpx.Request):
+            raise httpx.ConnectTimeout("timeout", request=request)
+
+        requests_mock.get(
+            create_url(f"get_tests/{run_id}"),
+            json={"_links": {"next": None, "prev": None}, "tests": []},
+        )
+        api_request_handler.async_client = AsyncAPIClient(
+            api_request_handler.client, transport=httpx.MockTransport(async_handler)
+        )
+        resources_added, error, results_added = asyncio.run(
+            api_request_handler.add_results_async(run_id)
+        )
+        assert resources_added == [], "Expected empty list of added resources"
+        assert error == FAULT_MAPPING["no_response_from_host"], "Timeout error is expected"
+        assert results_added == 0, "Expected 0 resources to be added."
+
     @pytest.mark.api_handler
     def test_close_run(self, api_request_handler: ApiRequestHandler, requests_mock):
         run_id = 2
@@ -498,6 +740,295 @@ class TestApiRequestHandler:
         assert not missing_ids, "No missing ids"
         assert error == "", "No error should have occurred"
 
+    @pytest.mark.api_handler
+    def test_check_missing_test_cases_ids_many_pages(
+        self, api_request_handler: ApiRequestHandler, requests_mock, mocker
+    ):
+        """The purpose of this test is to check that cases are read page by page without recursion,
+        so suites with more pages than Python recursion limit are handled."""
+        project_id = 3
+        suite_id = api_request_handler.suites_data_from_provider.suite_id
+        pages = sys.getrecursionlimit() + 100
+        mocker.patch('trcli.api.api_request_handler.ApiDataProvider.update_data')
+
+        def cases_page(request, context):
+            offset = int(request.url.rsplit("offset=", 1)[1]) if "offset=" in request.url else 0
+            next_link = f"/api/v2/get_cases/{project_id}&suite_id={suite_id}&limit=1&offset={offset + 1}"
+            return {
+                "_links": {"next": next_link if offset + 1 < pages else None, "prev": None},
+                "cases": [{"title": f"case{offset}", "custom_automation_id": f"case{offset}", "id": offset,
+                           "section_id": 1}],
+            }
+
+        requests_mock.get(create_url(f"get_cases/{project_id}&suite_id={suite_id}"), json=cases_page)
+        missing_ids, error = api_request_handler.check_missing_test_cases_ids(project_id)
+
+        assert requests_mock.call_count == pages
+        assert missing_ids, "Report cases are not in returned cases"
+        assert error == "", "No error should have occurred"
+
+    @pytest.mark.api_handler
+    def test_check_missing_test_cases_ids_parallel_pages(
+        self, api_request_handler: ApiRequestHandler, requests_mock, mocker
+    ):
+        """The purpose of this test is to check that when first page reports its limit, remaining pages
+        are fetched with explicit offset and limit, returned in order and fetching stops after short page."""
+        project_id = 3
+        suite_id = api_request_handler.suites_data_from_provider.suite_id
+        limit = 2
+        cases_amount = 23
+        update_data_mock = mocker.patch('trcli.api.api_request_handler.ApiDataProvider.update_data')
+
+        def cases_page(request, context):
+            offset = int(request.qs["offset"][0]) if "offset" in request.qs else 0
+            next_offset = offset + limit
+            return {
+                "offset": offset,
+                "limit": limit,
+                "_links": {
+                    "next": f"/api/v2/get_cases/{project_id}&suite_id={suite_id}&limit={limit}&offset={next_offset}"
+                    if next_offset < cases_amount else None,
+                    "prev": None,
+                },
+                "cases": [
+                    {"title": "testCase1", "custom_automation_id": f"id{case_id}", "id": case_id, "section_id": 1}
+                    for case_id in range(offset, min(next_offset, cases_amount))
+                ],
+            }
+
+        requests_mock.get(create_url(f"get_cases/{project_id}&suite_id={suite_id}"), json=cases_page)
+        mocker.patch.object(
+            api_request_handler.suites_data_from_provider.testsections[0].testcases[0],
+            "custom_automation_id",
+            "id22",
+        )
+        _, error = api_request_handler.check_missing_test_cases_ids(project_id)
+
+        pages = -(-cases_amount // limit)
+        assert error == "", "No error should have occurred"
+        assert pages <= requests_mock.call_count < pages + MAX_WORKERS_GET_PAGES
+        requested_offsets = {int(request.qs.get("offset", ["0"])[0]) for request in requests_mock.request_history}
+        assert set(range(0, cases_amount, limit)) <= requested_offsets
+        assert {"case_id": 22, "custom_automation_id": "id22", "section_id": 1, "title": "testCase1"} in (
+            update_data_mock.call_args.kwargs["case_data"]
+        )
+
+    @pytest.mark.api_handler
+    @pytest.mark.parametrize(
+        "passed_test_section_id, expected_suite_requests",
+        [(2, 0), (7, 1)],
+        ids=["found_in_report_sections", "moved_to_other_section"],
+    )
+    def test_check_missing_test_cases_ids_section_scoped(
+        self, api_request_handler: ApiRequestHandler, requests_mock, passed_test_section_id, expected_suite_requests
+    ):
+        """The purpose of this test is to check that when report sections are small part of the suite,
+        cases are read only from those sections and whole suite is read only if some case is not found there."""
+        project_id = 3
+        suite_id = api_request_handler.suites_data_from_provider.suite_id
+        sections = [{"id": 1, "suite_id": suite_id, "name": "Skipped test"},
+                    {"id": 2, "suite_id": suite_id, "name": "Passed test"}]
+        sections += [{"id": section_id, "suite_id": suite_id, "name": f"Section {section_id}"}
+                     for section_id in range(3, 21)]
+        requests_mock.get(
+            create_url(f"get_sections/{project_id}&suite_id={suite_id}"),
+            json={"_links": {"next": None, "prev": None}, "sections": sections},
+        )
+        skipped_cases = [
+            {"title": "testCase1", "custom_automation_id": "Skipped test.testCase1", "id": 1, "section_id": 1},
+            {"title": "testCase2", "custom_automation_id": "Skipped test.testCase2", "id": 2, "section_id": 1},
+        ]
+        passed_case = {"title": "testCase3", "custom_automation_id": "Passed test.testCase3", "id": 3,
+                       "section_id": passed_test_section_id}
+        suite_cases = requests_mock.get(
+            create_url(f"get_cases/{project_id}&suite_id={suite_id}"),
+            json={"_links": {"next": None, "prev": None}, "cases": skipped_cases + [passed_case]},
+        )
+        requests_mock.get(
+            create_url(f"get_cases/{project_id}&suite_id={suite_id}&section_id=1"),
+            json={"_links": {"next": None, "prev": None}, "cases": skipped_cases},
+        )
+        requests_mock.get(
+            create_url(f"get_cases/{project_id}&suite_id={suite_id}&section_id=2"),
+            json={"_links": {"next": None, "prev": None},
+                  "cases": [passed_case] if passed_test_section_id == 2 else []},
+        )
+
+        api_request_handler.check_missing_section_ids(project_id)
+        missing_ids, error = api_request_handler.check_missing_test_cases_ids(project_id)
+
+        assert error == "", "No error should have occurred"
+        assert not missing_ids, "All cases should be found"
+        assert suite_cases.call_count == expected_suite_requests
+        assert [
+            case.case_id for section in api_request_handler.suites_data_from_provider.testsections
+            for case in section.testcases
+        ] == [1, 2, 3]
+
+    @pytest.mark.api_handler
+    def test_section_scoped_lookup_stays_within_pool(self, api_request_handler: ApiRequestHandler, mocker):
+        """The purpose of this test is to check that sections read in parallel are paged one page at a time,
+        so no more than MAX_WORKERS_GET_PAGES requests are in flight (connection pool is not exceeded)."""
+        project_id = 3
+        suite_id = api_request_handler.suites_data_from_provider.suite_id
+        pages_amount = 10
+        counters = {"in_flight": 0, "max_in_flight": 0}
+        lock = Lock()
+        sections = [{"id": 1, "suite_id": suite_id, "name": "Skipped test"},
+                    {"id": 2, "suite_id": suite_id, "name": "Passed test"}]
+        sections += [{"id": section_id, "suite_id": suite_id, "name": f"Section {section_id}"}
+                     for section_id in range(3, 21)]
+        report_cases = {
+            1: [{"title": "testCase1", "custom_automation_id": "Skipped test.testCase1", "id": 1, "section_id": 1},
+                {"title": "testCase2", "custom_automation_id": "Skipped test.testCase2", "id": 2, "section_id": 1}],
+            2: [{"title": "testCase3", "custom_automation_id": "Passed test.testCase3", "id": 3, "section_id": 2},
+                {"title": "other", "custom_automation_id": "Passed test.other", "id": 4, "section_id": 2}],
+        }
+
+        def send_get(uri, entity=None, fields=None, hedge=False):
+            with lock:
+                counters["in_flight"] += 1
+                counters["max_in_flight"] = max(counters["max_in_flight"], counters["in_flight"])
+            time.sleep(0.01)
+            with lock:
+                counters["in_flight"] -= 1
+            if uri.startswith("get_sections"):
+                return APIClientResult(200, {"_links": {"next": None}, "sections": sections}, "")
+            section_id = int(re.search(r"section_id=(\d+)", uri).group(1))
+            offset = int(re.search(r"offset=(\d+)", uri).group(1)) if "offset=" in uri else 0
+            page = offset // 2
+            cases = report_cases[section_id] if page == 0 else [
+                {"title": f"other_{offset}", "custom_automation_id": f"Other.{offset}", "id": 100 + offset,
+                 "section_id": section_id}
+            ] * 2
+            next_link = None
+            if page < pages_amount - 1:
+                next_link = f"/api/v2/get_cases/{project_id}&suite_id={suite_id}&section_id={section_id}" \
+                            f"&offset={offset + 2}"
+            return APIClientResult(200, {"offset": offset, "limit": 2, "_links": {"next": next_link}, entity: cases}, "")
+
+        mocker.patch.object(api_request_handler.client, "send_get", side_effect=send_get)
+
+        api_request_handler.check_missing_section_ids(project_id)
+        missing_ids, error = api_request_handler.check_missing_test_cases_ids(project_id)
+
+        assert error == "" and not missing_ids
+        assert counters["max_in_flight"] <= MAX_WORKERS_GET_PAGES
+
+    @pytest.mark.api_handler
+    def test_check_missing_test_cases_ids_error_on_next_page(
+        self, api_request_handler: ApiRequestHandler, requests_mock
+    ):
+        """The purpose of this test is to check that error on any page stops reading and is returned."""
+        project_id = 3
+        suite_id = api_request_handler.suites_data_from_provider.suite_id
+        requests_mock.get(
+            create_url(f"get_cases/{project_id}&suite_id={suite_id}"),
+            json={
+                "_links": {"next": f"/api/v2/get_cases/{project_id}&suite_id={suite_id}&offset=1", "prev": None},
+                "cases": [{"title": "testCase1", "custom_automation_id": "id1", "id": 1, "section_id": 1}],
+            },
+        )
+        requests_mock.get(
+            create_url(f"get_cases/{project_id}&suite_id={suite_id}&offset=1"),
+            status_code=403,
+            json={"error": "No access"},
+        )
+        missing_ids, error = api_request_handler.check_missing_test_cases_ids(project_id)
+
+        assert not missing_ids
+        assert error == "No access"
+
+    @pytest.mark.api_handler
+    @pytest.mark.parametrize(
+        "run_tests, expected_identified",
+        [
+            ([{"id": 11, "case_id": 1, "custom_automation_id": "Other.testCase1"},
+              {"id": 12, "case_id": 6, "custom_automation_id": "Skipped test.testCase2"},
+              {"id": 13, "case_id": 7, "custom_automation_id": "Passed test.testCase3"}], True),
+            ([{"id": 11, "case_id": 1, "custom_automation_id": "Other.testCase1"},
+              {"id": 12, "case_id": 6, "custom_automation_id": "Skipped test.testCase2"}], False),
+        ],
+        ids=["all_cases_in_run", "case_missing_in_run"],
+    )
+    def test_match_cases_without_suite_lookup_run_id(
+        self, api_request_handler: ApiRequestHandler, requests_mock, run_tests, expected_identified
+    ):
+        """The purpose of this test is to check that with run ID test cases are matched with tests of the run
+        only (by case ID from report or by automation ID), and case IDs are set when all of them are found."""
+        run_id = 8
+        requests_mock.get(
+            create_url(f"get_tests/{run_id}"),
+            json={"_links": {"next": None, "prev": None}, "tests": run_tests},
+        )
+
+        identified, error = api_request_handler.match_cases_without_suite_lookup(run_id)
+
+        assert error == ""
+        assert identified == expected_identified
+        assert requests_mock.call_count == 1, "Only tests of the run should be read."
+        if expected_identified:
+            assert [
+                case.result.case_id for section in api_request_handler.suites_data_from_provider.testsections
+                for case in section.testcases
+            ] == [1, 6, 7]
+
+    @pytest.mark.api_handler
+    def test_match_cases_without_suite_lookup_case_ids(self, api_request_handler: ApiRequestHandler, requests_mock):
+        """The purpose of this test is to check that without run ID report is identified only
+        when all test cases have case ID and no request is sent."""
+        test_cases = [
+            case for section in api_request_handler.suites_data_from_provider.testsections
+            for case in section.testcases
+        ]
+        assert api_request_handler.match_cases_without_suite_lookup() == (False, "")
+
+        for case_id, test_case in enumerate(test_cases, start=1):
+            test_case.case_id = case_id
+        assert api_request_handler.match_cases_without_suite_lookup() == (True, "")
+        assert requests_mock.call_count == 0
+
+    @pytest.mark.api_handler
+    @pytest.mark.parametrize("run_id", [None, 8], ids=["without_run_id", "with_run_id"])
+    def test_match_cases_without_suite_lookup_empty_report(
+        self, api_request_handler: ApiRequestHandler, requests_mock, run_id
+    ):
+        """The purpose of this test is to check that report without test cases is never identified."""
+        for section in api_request_handler.suites_data_from_provider.testsections:
+            section.testcases = []
+
+        assert api_request_handler.match_cases_without_suite_lookup(run_id) == (False, "")
+        assert requests_mock.call_count == 0
+
+    @pytest.mark.api_handler
+    def test_match_cases_without_suite_lookup_tests_reused_for_attachments(
+        self, api_request_handler: ApiRequestHandler, requests_mock
+    ):
+        """The purpose of this test is to check that tests of the run read by fast path are reused
+        when attachments of results are uploaded, instead of reading the run again."""
+        run_id = 8
+        get_tests = requests_mock.get(
+            create_url(f"get_tests/{run_id}"),
+            json={
+                "_links": {"next": None, "prev": None},
+                "tests": [{"id": 11, "case_id": 1, "custom_automation_id": "Other.testCase1"},
+                          {"id": 12, "case_id": 6, "custom_automation_id": "Skipped test.testCase2"},
+                          {"id": 13, "case_id": 7, "custom_automation_id": "Passed test.testCase3"}],
+            },
+        )
+        requests_mock.post(
+            create_url(f"add_results_for_cases/{run_id}"), json=[{"id": 9, "status_id": 5, "test_id": 11}]
+        )
+        attachments = requests_mock.post(create_url("add_attachment_to_result/9"), json={"attachment_id": 123})
+
+        assert api_request_handler.match_cases_without_suite_lookup(run_id) == (True, "")
+        with patch("builtins.open", mock_open()):
+            _, error, _ = api_request_handler.add_results(run_id)
+
+        assert error == ""
+        assert get_tests.call_count == 1
+        assert attachments.call_count == 2
+
     @pytest.mark.api_handler
     def test_get_suites_id(self, api_request_handler: ApiRequestHandler, requests_mock):
         project_id = 3
@@ -625,6 +1156,40 @@ class TestApiRequestHandler:
             " Please check your settings and try again."
         ), "Connection error is expected"
 
+    @pytest.mark.api_handler
+    def test_add_cases_async_error_keeps_requests_in_flight(
+        self, api_request_handler: ApiRequestHandler, requests_mock
+    ):
+        """The purpose of this test is to check that on error only requests waiting for semaphore are cancelled,
+        cases added by requests which were already being sent are returned (so they can be rolled back)."""
+        project_id = 3
+        requests_mock.post(
+            create_url(f"add_section/{project_id}"), json={"id": 12345, "suite_id": 4, "name": "Passed test"}
+        )
+        added_case = {
+            "id": 4,
+            "suite_id": 4,
+            "section_id": 1234,
+            "title": "testCase2",
+            "custom_automation_id": "Skipped test.testCase2",
+        }
+
+        async def async_handler(request: httpx.Request):
+            if "add_case/12345" in str(request.url):
+                return httpx.Response(400, json={"error": "Invalid section"})
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json=added_case)
+
+        api_request_handler.add_sections(project_id)
+        api_request_handler.async_client = AsyncAPIClient(
+            api_request_handler.client, transport=httpx.MockTransport(async_handler)
+        )
+        resources_added, error = asyncio.run(api_request_handler.add_cases_async())
+
+        assert error == "Invalid section"
+        assert [case["case_id"] for case in resources_added] == [added_case["id"]], \
+            "Case added by request in flight should be returned."
+
     @pytest.mark.api_handler
     def test_add_results_error(
         self, api_request_handler: ApiRequestHandler, requests_mock
@@ -669,8 +1234,12 @@ class TestApiRequestHandler:
             create_url(f"add_results_for_cases/{run_id}"),
             exc=requests.exceptions.ConnectTimeout,
         )
+        requests_mock.get(
+            create_url(f"get_tests/{run_id}"),
+            json={"_links": {"next": None, "prev": None}, "tests": []},
+        )
         mocker.patch(
-            "trcli.api.api_request_handler.as_completed", side_effect=KeyboardInterrupt
+            "trcli.api.api_request_handler.wait", side_effect=KeyboardInterrupt
         )
         with pytest.raises(KeyboardInterrupt) as exception:
             api_request_handler.add_results(run_id)
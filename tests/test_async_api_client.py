@@ -0,0 +1,172 @@
+import asyncio
+import gzip
+import json
+
+import httpx
+import pytest
+
+from tests.helpers.api_client_helpers import TEST_RAIL_URL, create_url, check_response
+from tests.test_data.api_client_test_data import (
+    FAKE_PROJECT_DATA,
+    INVALID_TEST_CASE_ERROR,
+    API_RATE_LIMIT_REACHED_ERROR,
+)
+from trcli.api.api_client import APIClient, APIClientResult
+from trcli.api.async_api_client import AsyncAPIClient
+from trcli.api.rate_limiter import RateLimiter
+from trcli.constants import FAULT_MAPPING
+
+
+def make_async_client(handler, retries=3):
+    api_client = APIClient(
+        host_name=TEST_RAIL_URL,
+        verbose_logging_function=lambda _: None,
+        retries=retries,
+    )
+    api_client.username = "user_name"
+    api_client.api_key = "api_key_for_user_name"
+    calls = []
+
+    def recording_handler(request: httpx.Request):
+        calls.append(request)
+        return handler(request)
+
+    async_client = AsyncAPIClient(api_client, transport=httpx.MockTransport(recording_handler))
+    return async_client, calls
+
+
+async def send(async_client: AsyncAPIClient, method: str, *args):
+    async with async_client:
+        return await getattr(async_client, method)(*args)
+
+
+class TestAsyncAPIClient:
+    @pytest.mark.api_client
+    def test_send_get_status_code_success(self):
+        """The purpose of this test is to check that send_get returns APIClientResult
+        the same way as synchronous client, without triggering retry mechanism."""
+        async_client, calls = make_async_client(
+            lambda request: httpx.Response(200, json=FAKE_PROJECT_DATA)
+        )
+        response = asyncio.run(send(async_client, "send_get", "get_projects"))
+
+        assert len(calls) == 1, "Retry mechanism should not be triggered."
+        assert str(calls[0].url).lower() == create_url("get_projects").lower()
+        assert calls[0].headers["Authorization"].startswith("Basic ")
+        check_response(200, FAKE_PROJECT_DATA, "", response)
+
+    @pytest.mark.api_client
+    def test_request_log_not_formatted_without_verbose(self, mocker):
+        """The purpose of this test is to check that request log is not formatted
+        when verbose logging is disabled."""
+        async_client, calls = make_async_client(lambda request: httpx.Response(200, json=FAKE_PROJECT_DATA))
+        async_client.api_client.verbose_logging_function = None
+        format_request = mocker.spy(APIClient, "format_request_for_vlog")
+
+        response = asyncio.run(send(async_client, "send_post", "add_project", {"name": "Project"}))
+
+        check_response(200, FAKE_PROJECT_DATA, "", response)
+        assert format_request.call_count == 0
+
+    @pytest.mark.api_client
+    def test_send_post_status_code_not_success(self):
+        """The purpose of this test is to check that send_post sends json payload and packs
+        error returned by host into APIClientResult."""
+        async_client, calls = make_async_client(
+            lambda request: httpx.Response(400, json=INVALID_TEST_CASE_ERROR)
+        )
+        response = asyncio.run(
+            send(async_client, "send_post", "add_case/1", {"title": "case"})
+        )
+
+        assert len(calls) == 1, "Retry mechanism should not be triggered."
+        assert json.loads(calls[0].content) == {"title": "case"}
+        check_response(
+            400, INVALID_TEST_CASE_ERROR, INVALID_TEST_CASE_ERROR["error"], response
+        )
+
+    @pytest.mark.api_client
+    def test_retry_mechanism_too_many_requests(self, mocker):
+        """The purpose of this test is to check that 429 responses are retried after Retry-After."""
+        retries = 4
+        sleep_mock = mocker.patch(
+            "trcli.api.async_api_client.asyncio.sleep", new=mocker.AsyncMock()
+        )
+        async_client, calls = make_async_client(
+            lambda request: httpx.Response(
+                429, headers={"Retry-After": "30"}, json=API_RATE_LIMIT_REACHED_ERROR
+            ),
+            retries=retries,
+        )
+        response = asyncio.run(send(async_client, "send_get", "get_projects"))
+
+        assert len(calls) == retries + 1
+        sleep_mock.assert_awaited_with(30.0)
+        check_response(
+            429,
+            API_RATE_LIMIT_REACHED_ERROR,
+            API_RATE_LIMIT_REACHED_ERROR["error"],
+            response,
+        )
+
+    @pytest.mark.api_client
+    @pytest.mark.parametrize(
+        "exception, expected_error_msg",
+        [
+            (httpx.ReadTimeout, FAULT_MAPPING["no_response_from_host"]),
+            (httpx.ConnectError, FAULT_MAPPING["connection_error"]),
+        ],
+        ids=["retry_on_timeout", "retry_on_connection_error"],
+    )
+    def test_retry_mechanism_exceptions(self, exception, expected_error_msg):
+        """The purpose of this test is to check that timeouts and connection errors are retried."""
+        retries = 2
+
+        def raising_handler(request):
+            raise exception("failure", request=request)
+
+        async_client, calls = make_async_client(raising_handler, retries=retries)
+        response = asyncio.run(send(async_client, "send_get", "get_projects"))
+
+        assert len(calls) == retries + 1
+        check_response(-1, "", expected_error_msg, response)
+
+    @pytest.mark.api_client
+    def test_send_post_compressed_body(self):
+        """The purpose of this test is to check that async client compresses large request bodies
+        the same way as synchronous client."""
+        async_client, calls = make_async_client(
+            lambda request: httpx.Response(200, json=FAKE_PROJECT_DATA)
+        )
+        async_client.api_client.compression_threshold = 1024
+        payload = {"results": [{"case_id": i, "comment": "Traceback " * 50} for i in range(10)]}
+        response = asyncio.run(send(async_client, "send_post", "add_results_for_cases/1", payload))
+
+        assert calls[0].headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(calls[0].content)) == payload
+        assert async_client.api_client.compression_stats().requests == 1
+        check_response(200, FAKE_PROJECT_DATA, "", response)
+
+    @pytest.mark.api_client
+    def test_requests_share_policies_of_api_client(self, mocker):
+        """The purpose of this test is to check that async client applies the same per-request policies
+        as synchronous client: traffic statistics, bandwidth limit and invalidation of memoized lookups."""
+        response_content = json.dumps(FAKE_PROJECT_DATA).encode()
+        async_client, calls = make_async_client(lambda request: httpx.Response(200, content=response_content))
+        api_client = async_client.api_client
+        api_client.memoize_lookups = True
+        api_client.bandwidth_limiter = RateLimiter(1024 * 1024)
+        reserve = mocker.spy(api_client.bandwidth_limiter, "reserve")
+        mocker.patch.object(
+            api_client, "_APIClient__send_request", return_value=APIClientResult(200, FAKE_PROJECT_DATA, "")
+        )
+        api_client.send_get("get_case/1")
+
+        asyncio.run(send(async_client, "send_post", "add_case/1", {"title": "case"}))
+        api_client.send_get("get_case/1")
+
+        body_size = len(calls[0].content)
+        assert reserve.call_args_list == [mocker.call(body_size)]
+        stats = api_client.traffic_stats()["POST"]
+        assert (stats.requests, stats.bytes_sent, stats.bytes_received) == (1, body_size, len(response_content))
+        assert api_client.memo_stats() == (0, 2), "Lookup of case changed by POST should be sent again."
@@ -0,0 +1,63 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+import pytest
+from serde import field, serialize
+from serde.json import from_json, to_dict
+
+from trcli.data_classes.body_serializer import to_body
+from trcli.data_classes.dataclass_testrail import TestRailSuite
+
+
+@serialize
+@dataclass
+class Item:
+    name: str
+    count: int = field(default=0, skip_if_default=True)
+    label: str = field(default=None, rename="title", skip_if_false=True)
+    hidden: str = field(default=None, metadata={"serde_skip": True})
+    tags: List[str] = field(default_factory=list)
+
+
+@pytest.fixture(scope="module")
+def parsed_suite() -> TestRailSuite:
+    json_path = Path(__file__).parent / "test_data/json/root.json"
+    return from_json(TestRailSuite, json.dumps(json.load(open(json_path))))
+
+
+class TestBodySerializer:
+    @pytest.mark.data_provider
+    def test_bodies_match_serde_without_local_fields(self, parsed_suite):
+        """The purpose of this test is to check that compiled serializers return the same bodies as serde to_dict,
+        except for local only fields (attachments of results)."""
+        objects = [parsed_suite]
+        for section in parsed_suite.testsections:
+            objects.append(section)
+            for case in section.testcases:
+                objects.extend([case, case.result])
+
+        for obj in objects:
+            expected = to_dict(obj)
+            expected.pop("attachments", None)
+            assert to_body(obj) == expected, f"Body of {type(obj).__name__} doesn't match serde to_dict."
+        assert any(case.result.attachments for section in parsed_suite.testsections for case in section.testcases)
+
+    @pytest.mark.data_provider
+    @pytest.mark.parametrize(
+        "item, expected_body",
+        [
+            (Item("first"), {"name": "first", "tags": []}),
+            (Item("second", count=2, label="", hidden="x"), {"name": "second", "count": 2, "tags": []}),
+            (Item("third", label="Third", tags=["a"]), {"name": "third", "title": "Third", "tags": ["a"]}),
+        ],
+        ids=["defaults", "skipped_fields", "renamed_field"],
+    )
+    def test_field_options_are_honored(self, item, expected_body):
+        """The purpose of this test is to check that skip, skip_if_default, skip_if_false and rename options
+        of fields are honored and lists are copied."""
+        body = to_body(item)
+
+        assert body == expected_body
+        assert body["tags"] is not item.tags
@@ -0,0 +1,52 @@
+import pytest
+
+from trcli.api.circuit_breaker import CircuitBreaker
+from trcli.constants import CircuitBreakerState
+
+
+@pytest.fixture(scope="function")
+def clock(mocker):
+    current_time = [100.0]
+    mocker.patch("trcli.api.circuit_breaker.monotonic", side_effect=lambda: current_time[0])
+    return current_time
+
+
+class TestCircuitBreaker:
+    @pytest.mark.api_client
+    def test_opens_after_consecutive_failures(self, clock, mocker):
+        """The purpose of this test is to check that circuit opens only after threshold of consecutive
+        failures is reached and then rejects requests."""
+        logging_function = mocker.Mock()
+        circuit_breaker = CircuitBreaker(failure_threshold=3, recovery_time=30, logging_function=logging_function)
+        circuit_breaker.record_failure()
+        circuit_breaker.record_failure()
+        circuit_breaker.record_success()
+        circuit_breaker.record_failure()
+        circuit_breaker.record_failure()
+
+        assert circuit_breaker.allow_request(), "Failures should be counted only if consecutive."
+        circuit_breaker.record_failure()
+        assert circuit_breaker.state == CircuitBreakerState.open
+        assert not circuit_breaker.allow_request()
+        logging_function.assert_called_once()
+
+    @pytest.mark.api_client
+    def test_half_open_probe(self, clock, mocker):
+        """The purpose of this test is to check that single probe request is let through after recovery time,
+        failed probe opens circuit again and successful one closes it."""
+        logging_function = mocker.Mock()
+        circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_time=30, logging_function=logging_function)
+        circuit_breaker.record_failure()
+        clock[0] += 30
+
+        assert circuit_breaker.allow_request(), "Probe request should be allowed after recovery time."
+        assert circuit_breaker.state == CircuitBreakerState.half_open
+        assert not circuit_breaker.allow_request(), "Only single probe request should be allowed."
+        circuit_breaker.record_failure()
+        assert circuit_breaker.state == CircuitBreakerState.open
+        clock[0] += 30
+        assert circuit_breaker.allow_request()
+        circuit_breaker.record_success()
+        assert circuit_breaker.state == CircuitBreakerState.closed
+        assert circuit_breaker.allow_request()
+        assert logging_function.call_count == 5, "Every state change should be logged."
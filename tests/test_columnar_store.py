@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import pytest
+
+from trcli.data_classes.columnar_store import CasesView, ColumnarCases
+from trcli.data_classes.validation_exception import ValidationException
+from trcli.data_providers.api_data_provider import ApiDataProvider
+from trcli.readers.junit_xml import JunitParser
+
+XML_PATHS = [
+    Path(__file__).parent / "test_data/XML/no_root.xml",
+    Path(__file__).parent / "test_data/XML/root.xml",
+    Path(__file__).parent / "test_data/XML/required_only.xml",
+]
+
+
+def parse_providers(input_xml_path: Path):
+    return (
+        ApiDataProvider(JunitParser(input_xml_path).parse_file()),
+        ApiDataProvider(JunitParser(input_xml_path, columnar=True).parse_file()),
+    )
+
+
+class TestColumnarStore:
+    @pytest.mark.parse_junit
+    @pytest.mark.parametrize("input_xml_path", XML_PATHS, ids=["no_root", "root", "required_only"])
+    def test_bodies_match_dataclasses(self, input_xml_path, freezer):
+        """The purpose of this test is to check that report parsed into column store returns the same
+        request bodies as report parsed into dataclasses."""
+        freezer.move_to("2020-05-20 01:00:00")
+        provider, columnar_provider = parse_providers(input_xml_path)
+
+        assert columnar_provider.add_sections_data() == provider.add_sections_data()
+        assert columnar_provider.add_cases() == provider.add_cases()
+        assert columnar_provider.add_run("Run") == provider.add_run("Run")
+        assert columnar_provider.add_results_for_cases(2) == provider.add_results_for_cases(2)
+        assert columnar_provider.attachments_for_cases() == provider.attachments_for_cases()
+
+    @pytest.mark.parse_junit
+    def test_update_data_sets_ids_in_store(self, freezer):
+        """The purpose of this test is to check that IDs of sections and cases matched in TestRail
+        are written to the column store and read back by results."""
+        freezer.move_to("2020-05-20 01:00:00")
+        provider, columnar_provider = parse_providers(XML_PATHS[1])
+        section_data = [
+            {"name": body["name"], "section_id": section_id}
+            for section_id, body in enumerate(provider.add_sections_data()["bodies"], start=10)
+        ]
+        case_data = [
+            {"case_id": case_id, "section_id": 10, "custom_automation_id": body["custom_automation_id"]}
+            for case_id, body in enumerate(provider.add_cases(return_all_items=True)["bodies"], start=100)
+        ]
+
+        for data_provider in (provider, columnar_provider):
+            data_provider.update_data(section_data=section_data, case_data=case_data)
+
+        assert columnar_provider.add_cases(return_all_items=True) == provider.add_cases(return_all_items=True)
+        assert columnar_provider.add_results_for_cases(10) == provider.add_results_for_cases(10)
+        assert columnar_provider.add_run("Run") == provider.add_run("Run")
+        assert columnar_provider.add_cases() == {"bodies": []}
+
+    @pytest.mark.parse_junit
+    def test_store_keeps_rows_in_columns(self):
+        """The purpose of this test is to check that store keeps missing IDs, comments and attachments
+        of rows and sections see only their own range of rows."""
+        store = ColumnarCases()
+        store.append(1, "first", status_id=1, comment="ok", elapsed="1.6")
+        store.append(2, "second", 5, "tests.second", 5, "błąd", attachments=["log.txt"])
+
+        first, second = store.view(0, 1), store.view(1)
+
+        assert isinstance(first, CasesView) and len(first) == 1 and len(second) == 1
+        assert first[0].case_id is None and first[0].result.elapsed == "2s"
+        assert first[0].result.attachments == [] and first[0].custom_automation_id is None
+        assert second[0].case_id == 5 and second[0].result.comment == "błąd"
+        assert second[0].custom_automation_id == "tests.second" and store.automation_ids[1] == "tests"
+        assert second[0].result.attachments == ["log.txt"] and second[0].result.elapsed is None
+
+    @pytest.mark.parse_junit
+    def test_find_row_by_automation_id(self):
+        """The purpose of this test is to check that rows are found by automation ID (first row wins
+        on duplicates) and that rows appended after lookup are found too."""
+        store = ColumnarCases()
+        for i in range(20):
+            store.append(1, f"test_{i % 10}", None, f"tests.class_{i // 10}.test_{i % 10}")
+        store.append(1, "test_0", None, "tests.class_0.test_0")
+        store.append(1, "no_automation_id")
+
+        assert [store.find_row(f"tests.class_1.test_{i}") for i in range(10)] == list(range(10, 20))
+        assert store.find_row("tests.class_0.test_0") == 0
+        assert store.find_row("tests.class_2.test_0") is None and store.find_row("test_0") is None
+
+        store.append(1, "test_new", None, "tests.test_new")
+
+        assert store.find_row("tests.test_new") == 22
+
+    @pytest.mark.parse_junit
+    def test_empty_title_is_rejected(self):
+        """The purpose of this test is to check that case with empty title is rejected as by TestRailCase."""
+        with pytest.raises(ValidationException):
+            ColumnarCases().append(1, "")
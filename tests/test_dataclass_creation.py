@@ -1,4 +1,5 @@
 import json
+import sys
 import pytest
 from junitparser import Element
 from tests.test_data.dataclass_creation import *
@@ -91,3 +92,23 @@ class TestDataClassCreation:
     def test_validation_error_for_section(self):
         with pytest.raises(ValidationException):
             TestRailSection(suite_id=1, name="")
+
+    @pytest.mark.dataclass
+    def test_repeated_result_values_are_shared(self):
+        """The purpose of this test is to check that comments and elapsed times repeated across results
+        parsed from JUnit elements are kept once and the elements are not retained."""
+        first = TestRailResult(1, elapsed="1.2", junit_result_unparsed=[FAILED_RESULT_INPUT])
+        second = TestRailResult(2, elapsed="0.9", junit_result_unparsed=[FAILED_RESULT_INPUT])
+
+        assert first.comment is second.comment and first.elapsed is second.elapsed
+        assert first.junit_result_unparsed is None and second.junit_result_unparsed is None
+
+    @pytest.mark.dataclass
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="slotted dataclasses require Python 3.10")
+    def test_dataclasses_are_slotted(self):
+        """The purpose of this test is to check that classes created for every test case have no __dict__."""
+        section = TestRailSection("Section", 1, properties=[TestRailProperty("name", "value")])
+        case = TestRailCase(1, "Case", result=TestRailResult(1))
+
+        for obj in (section, section.properties[0], case, case.result):
+            assert not hasattr(obj, "__dict__"), f"{type(obj).__name__} should be slotted."
@@ -0,0 +1,35 @@
+import pytest
+
+from trcli.api.hedging_policy import HedgingPolicy
+
+
+class TestHedgingPolicy:
+    @pytest.mark.api_client
+    def test_no_hedging_before_enough_samples(self):
+        """The purpose of this test is to check that hedging starts only after enough latencies were recorded."""
+        hedging_policy = HedgingPolicy(percentile=50, min_samples=3)
+        hedging_policy.record_latency(0.1)
+        hedging_policy.record_latency(0.2)
+
+        assert hedging_policy.get_delay() is None
+        hedging_policy.record_latency(0.3)
+        assert hedging_policy.get_delay() == 0.2
+
+    @pytest.mark.api_client
+    @pytest.mark.parametrize("percentile, expected_delay", [(50, 0.5), (95, 1.0), (99, 1.0), (1, 0.1)])
+    def test_delay_is_latency_percentile_of_window(self, percentile, expected_delay):
+        """The purpose of this test is to check that delay is a percentile of latest latencies only."""
+        hedging_policy = HedgingPolicy(percentile=percentile, min_samples=1, window=10)
+        for latency in [60.0] * 5 + [i / 10 for i in range(1, 11)]:
+            hedging_policy.record_latency(latency)
+
+        assert hedging_policy.get_delay() == expected_delay
+
+    @pytest.mark.api_client
+    def test_hedge_counters(self):
+        """The purpose of this test is to check that sent and won hedges are counted."""
+        hedging_policy = HedgingPolicy()
+        hedging_policy.record_hedge(won=True)
+        hedging_policy.record_hedge(won=False)
+
+        assert (hedging_policy.hedges_sent, hedging_policy.hedges_won) == (2, 1)
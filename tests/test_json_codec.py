@@ -0,0 +1,88 @@
+import pytest
+
+from trcli.api import json_codec
+from trcli.api.json_codec import JsonCodec, OrjsonCodec, get_default_codec
+
+RESULTS = [{"case_id": 1, "status_id": 5, "comment": "Zażółć gęślą jaźń\n" * 3}]
+PAYLOAD = {"results": RESULTS, 10: None}
+
+
+class TestJsonCodec:
+    @pytest.mark.api_client
+    @pytest.mark.parametrize(
+        "codec",
+        [
+            JsonCodec(),
+            pytest.param(
+                OrjsonCodec(),
+                marks=pytest.mark.skipif(not OrjsonCodec.is_available(), reason="orjson not installed"),
+            ),
+        ],
+        ids=["json", "orjson"],
+    )
+    def test_codecs_produce_same_compact_utf8_bytes(self, codec):
+        """The purpose of this test is to check that all codecs encode payload to the same compact
+        UTF-8 bytes and decode them back."""
+        body = codec.dumps(PAYLOAD)
+
+        assert body == JsonCodec.dumps(PAYLOAD)
+        assert codec.loads(body) == {"results": RESULTS, "10": None}, "Non string keys should be converted to strings."
+
+    @pytest.mark.api_client
+    def test_default_codec_prefers_orjson(self, mocker):
+        """The purpose of this test is to check that standard library codec is used as a fallback
+        when orjson is not installed."""
+        mocker.patch("trcli.api.json_codec.orjson", None)
+
+        assert get_default_codec().name == "json"
+
+    @pytest.mark.api_client
+    @pytest.mark.parametrize(
+        "streaming_threshold",
+        [
+            pytest.param(
+                0, marks=pytest.mark.skipif(json_codec.ijson is None, reason="ijson not installed")
+            ),
+            2 ** 30,
+        ],
+        ids=["streaming", "full_decode"],
+    )
+    @pytest.mark.parametrize(
+        "response",
+        [
+            {
+                "offset": 0,
+                "_links": {"next": "/api/v2/get_cases/1&offset=250", "prev": None},
+                "cases": [
+                    {"id": 1, "title": "a", "custom_steps": [{"content": "x" * 100}], "estimate": 1.5},
+                    {"id": 2, "title": "b", "custom_preconds": {"nested": [1, [2]]}},
+                ],
+            },
+            [{"id": 1, "title": "a", "custom_steps": [{"content": "x"}]}],
+            {"error": "Field :project_id is not a valid or accessible project."},
+        ],
+        ids=["paginated", "legacy", "error"],
+    )
+    def test_projected_decoding(self, mocker, streaming_threshold, response):
+        """The purpose of this test is to check that projected decoding keeps only requested fields
+        of every entity and leaves the rest of the response intact."""
+        mocker.patch.object(JsonCodec, "streaming_threshold", streaming_threshold)
+        codec = JsonCodec()
+        decoded = codec.loads_projected(codec.dumps(response), "cases", ["id", "title"])
+
+        if isinstance(response, list):
+            assert decoded == [{"id": 1, "title": "a"}]
+        elif "cases" in response:
+            assert decoded == {**response, "cases": [{"id": 1, "title": "a"}, {"id": 2, "title": "b"}]}
+        else:
+            assert decoded == response
+
+    @pytest.mark.api_client
+    @pytest.mark.skipif(json_codec.ijson is None, reason="ijson not installed")
+    def test_projected_decoding_of_invalid_json(self, mocker):
+        """The purpose of this test is to check that streaming decoder reports invalid JSON as ValueError,
+        the same way as standard library decoder."""
+        mocker.patch.object(JsonCodec, "streaming_threshold", 0)
+
+        with pytest.raises(ValueError):
+            JsonCodec().loads_projected(b"<html>Bad gateway</html>", "cases", ["id"])
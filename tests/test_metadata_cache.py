@@ -0,0 +1,183 @@
+import json
+from pathlib import Path
+
+import pytest
+from serde.json import from_json
+
+from tests.helpers.api_client_helpers import TEST_RAIL_URL, create_url
+from trcli.api.api_client import APIClient
+from trcli.api.api_request_handler import ApiRequestHandler
+from trcli.api.metadata_cache import MetadataCache
+from trcli.cli import Environment
+from trcli.constants import FAULT_MAPPING
+from trcli.data_classes.dataclass_testrail import TestRailSuite
+from trcli.settings import DEFAULT_METADATA_CACHE_TTL
+
+PROJECT_ID = 3
+SUITE_ID = 4
+
+
+@pytest.fixture(scope="function")
+def cache_path(tmp_path) -> str:
+    return str(tmp_path / "cache" / "metadata.sqlite")
+
+
+@pytest.fixture(scope="function")
+def testrail_cases(requests_mock):
+    """Serves get_cases of the suite from mutable list, honoring updated_after, offset and limit."""
+    cases = [
+        {"id": case_id, "section_id": 1, "title": f"case{case_id}", "custom_automation_id": f"case{case_id}",
+         "updated_on": 1000 + case_id}
+        for case_id in range(1, 6)
+    ]
+
+    def get_cases(request, context):
+        query = request.qs
+        returned = [case for case in cases if case["updated_on"] > int(query.get("updated_after", ["0"])[0])]
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query.get("limit", ["250"])[0])
+        return {"offset": offset, "_links": {"next": None, "prev": None}, "cases": returned[offset:offset + limit]}
+
+    requests_mock.get(create_url(f"get_cases/{PROJECT_ID}&suite_id={SUITE_ID}"), json=get_cases)
+    return cases
+
+
+def make_handler(cache_path: str) -> ApiRequestHandler:
+    environment = Environment()
+    environment.project = "Test Project"
+    environment.batch_size = 10
+    json_path = Path(__file__).parent / "test_data/json/api_request_handler.json"
+    suite = from_json(TestRailSuite, json.dumps(json.load(open(json_path))))
+    suite.suite_id = SUITE_ID
+    return ApiRequestHandler(
+        environment,
+        APIClient(host_name=TEST_RAIL_URL),
+        suite,
+        metadata_cache=MetadataCache(cache_path, TEST_RAIL_URL),
+    )
+
+
+def requested_queries(requests_mock) -> list:
+    """Returns pagination and filter parameters of sent requests."""
+    return [
+        {key: value for key, value in request.qs.items() if key in ("updated_after", "offset", "limit")}
+        for request in requests_mock.request_history
+    ]
+
+
+class TestMetadataCache:
+    @pytest.mark.api_handler
+    def test_cache_is_keyed_by_host_project_and_suite(self, cache_path):
+        """The purpose of this test is to check that entities of different hosts and suites are kept apart
+        and that updated_after follows newest updated_on of cached entities."""
+        cache = MetadataCache(cache_path, "https://first.testrail.io/")
+        cache.replace(1, 2, "cases", [{"id": 1, "updated_on": 10}, {"id": 2, "updated_on": 20}])
+        cache.update(1, 2, "cases", [{"id": 2, "updated_on": 30}, {"id": 3, "updated_on": 25}])
+
+        assert cache.get(1, 2, "cases") == (
+            [{"id": 1, "updated_on": 10}, {"id": 2, "updated_on": 30}, {"id": 3, "updated_on": 25}],
+            30,
+        )
+        assert cache.get(1, 5, "cases") == (None, None)
+        assert MetadataCache(cache_path, "https://second.testrail.io/").get(1, 2, "cases") == (None, None)
+
+    @pytest.mark.api_handler
+    def test_full_fetch_populates_cache(self, cache_path, testrail_cases, requests_mock):
+        """The purpose of this test is to check that cases are read in full when suite is not cached yet
+        and are read from cache afterwards with updated_after filter and count probe only."""
+        _, error = make_handler(cache_path).check_missing_test_cases_ids(PROJECT_ID)
+        assert error == ""
+        assert requests_mock.call_count == 1
+
+        _, error = make_handler(cache_path).check_missing_test_cases_ids(PROJECT_ID)
+        assert error == ""
+        assert requested_queries(requests_mock)[1:] == [
+            {"updated_after": ["1004"]},
+            {"offset": ["4"], "limit": ["2"]},
+        ]
+
+    @pytest.mark.api_handler
+    def test_updated_cases_are_refreshed(self, cache_path, testrail_cases, requests_mock):
+        """The purpose of this test is to check that cases changed since previous upload are updated in cache."""
+        make_handler(cache_path).check_missing_test_cases_ids(PROJECT_ID)
+        testrail_cases[0].update(title="renamed", updated_on=2000)
+        testrail_cases.append(
+            {"id": 6, "section_id": 1, "title": "case6", "custom_automation_id": "case6", "updated_on": 2001}
+        )
+
+        make_handler(cache_path).check_missing_test_cases_ids(PROJECT_ID)
+
+        cached, updated_after = MetadataCache(cache_path, TEST_RAIL_URL).get(PROJECT_ID, SUITE_ID, "cases")
+        assert cached == testrail_cases
+        assert updated_after == 2001
+        assert requests_mock.call_count == 3, "Full fetch should not be needed."
+
+    @pytest.mark.api_handler
+    def test_deleted_cases_trigger_full_fetch(self, cache_path, testrail_cases, requests_mock):
+        """The purpose of this test is to check that deleted cases are detected by count probe
+        and whole suite is read again."""
+        make_handler(cache_path).check_missing_test_cases_ids(PROJECT_ID)
+        del testrail_cases[2]
+
+        _, error = make_handler(cache_path).check_missing_test_cases_ids(PROJECT_ID)
+
+        assert error == ""
+        assert requested_queries(requests_mock)[-1] == {}, "Last request should read all cases."
+        cached, _ = MetadataCache(cache_path, TEST_RAIL_URL).get(PROJECT_ID, SUITE_ID, "cases")
+        assert cached == testrail_cases
+
+    @pytest.mark.api_handler
+    def test_sections_are_always_read_in_full(self, cache_path, requests_mock):
+        """The purpose of this test is to check that sections are not taken from metadata cache,
+        so section recreated in TestRail (same number of sections) is matched by its new ID."""
+        sections = [{"id": 7, "suite_id": SUITE_ID, "name": "Passed test"}]
+        requests_mock.get(
+            create_url(f"get_sections/{PROJECT_ID}&suite_id={SUITE_ID}"),
+            json=lambda request, context: {"offset": 0, "_links": {"next": None, "prev": None}, "sections": sections},
+        )
+        make_handler(cache_path).check_missing_section_ids(PROJECT_ID)
+        sections[0] = {"id": 8, "suite_id": SUITE_ID, "name": "Passed test"}
+
+        handler = make_handler(cache_path)
+        _, error = handler.check_missing_section_ids(PROJECT_ID)
+
+        assert error == ""
+        section_ids = {section.name: section.section_id for section in handler.suites_data_from_provider.testsections}
+        assert section_ids["Passed test"] == 8
+        assert MetadataCache(cache_path, TEST_RAIL_URL).get(PROJECT_ID, SUITE_ID, "sections") == (None, None)
+
+    @pytest.mark.api_handler
+    def test_project_index_is_read_from_all_pages_and_cached(self, cache_path, requests_mock, mocker):
+        """The purpose of this test is to check that project is found on any page of projects
+        and that projects index is read from cache until it expires."""
+        requests_mock.get(
+            create_url("get_projects"),
+            json={"_links": {"next": "/api/v2/get_projects&offset=1"},
+                  "projects": [{"id": 1, "name": "Other project", "suite_mode": 1}]},
+        )
+        requests_mock.get(
+            create_url("get_projects&offset=1"),
+            json={"_links": {"next": None}, "projects": [{"id": 2, "name": "Test Project", "suite_mode": 3}]},
+        )
+        clock = mocker.patch("trcli.api.metadata_cache.time.time", return_value=1000.0)
+
+        assert make_handler(cache_path).get_project_id("Test Project").project_id == 2
+        assert requests_mock.call_count == 2
+        assert make_handler(cache_path).get_project_id("Test Project").project_id == 2
+        assert requests_mock.call_count == 2, "Projects should be read from cache."
+
+        clock.return_value += DEFAULT_METADATA_CACHE_TTL
+        assert make_handler(cache_path).get_project_id("Test Project").project_id == 2
+        assert requests_mock.call_count == 4, "Expired projects should be read again."
+
+    @pytest.mark.api_handler
+    def test_case_fields_are_cached(self, cache_path, requests_mock):
+        """The purpose of this test is to check that case fields are read from cache on next uploads."""
+        case_fields = [
+            {"system_name": "custom_automation_id", "configs": [{"context": {"is_global": False, "project_ids": [3]}}]}
+        ]
+        requests_mock.get(create_url("get_case_fields"), json=case_fields)
+
+        assert make_handler(cache_path).check_automation_id_field(3) is None
+        assert make_handler(cache_path).check_automation_id_field(4) == FAULT_MAPPING["automation_id_unavailable"]
+        assert requests_mock.call_count == 1
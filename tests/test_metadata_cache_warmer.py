@@ -0,0 +1,88 @@
+import pytest
+
+from tests.helpers.api_client_helpers import TEST_RAIL_URL, create_url
+from trcli.api.metadata_cache import MetadataCache
+from trcli.api.metadata_cache_warmer import MetadataCacheWarmer
+from trcli.cli import Environment
+from trcli.constants import FAULT_MAPPING
+from trcli.settings import DEFAULT_METADATA_CACHE_TTL
+
+PROJECTS = {
+    "_links": {"next": None, "prev": None},
+    "projects": [{"id": 3, "name": "Project", "suite_mode": 3}],
+}
+CASES = {
+    "_links": {"next": None},
+    "cases": [
+        {"id": case_id, "section_id": 1, "title": f"case{case_id}", "custom_automation_id": f"case{case_id}",
+         "updated_on": 1000 + case_id}
+        for case_id in range(1, 4)
+    ],
+}
+
+
+@pytest.fixture(scope="function")
+def warmer_environment(tmp_path):
+    environment = Environment()
+    environment.host = TEST_RAIL_URL
+    environment.project = "Project"
+    environment.metadata_cache_path = str(tmp_path / "metadata.sqlite")
+    environment.metadata_cache_ttl = DEFAULT_METADATA_CACHE_TTL
+    return environment
+
+
+@pytest.fixture(scope="function")
+def testrail_metadata(requests_mock):
+    requests_mock.get(create_url("get_projects"), json=PROJECTS)
+    requests_mock.get(create_url("get_case_fields"), json=[])
+    requests_mock.get(create_url("get_cases/3&suite_id=2"), json=CASES)
+
+
+class TestMetadataCacheWarmer:
+    @pytest.mark.results_uploader
+    @pytest.mark.parametrize("suite_id", [2, None], ids=["suite_id_provided", "only_suite_of_project"])
+    def test_suite_metadata_is_cached(self, suite_id, warmer_environment, testrail_metadata, requests_mock, capsys):
+        """The purpose of this test is to check that cases of provided suite (or the only suite of the project)
+        are stored in metadata cache together with projects and case fields lookups."""
+        requests_mock.get(create_url("get_suites/3"), json=[{"id": 2, "name": "Suite"}])
+        warmer_environment.suite_id = suite_id
+
+        MetadataCacheWarmer(warmer_environment).warm_cache()
+
+        cache = MetadataCache(warmer_environment.metadata_cache_path, TEST_RAIL_URL)
+        assert cache.get(3, 2, "sections") == (None, None), "Sections should not be cached."
+        assert cache.get(3, 2, "cases")[0] == CASES["cases"]
+        assert cache.get_lookup("projects_by_name") is not None
+        assert cache.get_lookup("case_fields") == []
+        assert "Cached 3 cases in" in capsys.readouterr().out
+
+    @pytest.mark.results_uploader
+    def test_cached_suite_is_refreshed(self, warmer_environment, testrail_metadata, requests_mock):
+        """The purpose of this test is to check that already cached suite is refreshed incrementally."""
+        requests_mock.get(create_url("get_suites/3"), json=[{"id": 2, "name": "Suite"}])
+        warmer_environment.suite_id = 2
+        MetadataCacheWarmer(warmer_environment).warm_cache()
+        sent_requests = requests_mock.call_count
+
+        MetadataCacheWarmer(warmer_environment).warm_cache()
+
+        queries = [request.qs for request in requests_mock.request_history[sent_requests:]]
+        assert any("updated_after" in query for query in queries), "Cases should be read with updated_after filter."
+        projects_requests = [request for request in requests_mock.request_history if "get_projects" in request.url]
+        assert len(projects_requests) == 1, "Projects should be read from cache."
+
+    @pytest.mark.results_uploader
+    def test_suite_has_to_be_specified_for_multiple_suites(
+        self, warmer_environment, testrail_metadata, requests_mock, capsys
+    ):
+        """The purpose of this test is to check that command fails when suite ID is not provided
+        and project has more than one suite."""
+        requests_mock.get(
+            create_url("get_suites/3"), json=[{"id": 2, "name": "Suite"}, {"id": 5, "name": "Other suite"}]
+        )
+
+        with pytest.raises(SystemExit) as exception:
+            MetadataCacheWarmer(warmer_environment).warm_cache()
+
+        assert exception.value.code == 1
+        assert FAULT_MAPPING["missing_suite_id_to_prefetch"].format(project_name="Project") in capsys.readouterr().err
@@ -0,0 +1,127 @@
+import pytest
+
+from tests.helpers.api_client_helpers import TEST_RAIL_URL, create_url
+from trcli.api.api_client import APIClient
+from trcli.api.api_request_handler import ApiRequestHandler
+from trcli.api.metadata_cache import MetadataCache
+from trcli.api.metadata_prefetcher import MetadataPrefetcher
+from trcli.cli import Environment
+from trcli.data_classes.dataclass_testrail import TestRailCase, TestRailSection, TestRailSuite
+
+PROJECTS = {
+    "offset": 0,
+    "_links": {"next": None, "prev": None},
+    "projects": [
+        {"id": 1, "name": "Other project", "suite_mode": 1},
+        {"id": 3, "name": "Project", "suite_mode": 3},
+        {"id": 4, "name": "Project", "suite_mode": 3},
+    ],
+}
+
+
+@pytest.fixture(scope="function")
+def prefetch_environment():
+    environment = Environment()
+    environment.project = "Project"
+    environment.project_id = 4
+    environment.suite_id = 2
+    environment.auto_creation_response = True
+    return environment
+
+
+def report(*case_ids: int) -> TestRailSuite:
+    testcases = [
+        TestRailCase(section_id=None, title=f"test_{i}", case_id=case_id) for i, case_id in enumerate(case_ids)
+    ]
+    section = TestRailSection(name="Section", suite_id=2, testcases=testcases)
+    return TestRailSuite(name="Suite", suite_id=2, testsections=[section])
+
+
+def prefetch(
+    environment: Environment, requests_mock, suite: TestRailSuite = None, metadata_cache: MetadataCache = None,
+    sections_count: int = 1
+) -> APIClient:
+    sections = [{"id": i, "name": f"Section {i}"} for i in range(sections_count)]
+    requests_mock.get(create_url("get_projects"), json=PROJECTS)
+    requests_mock.get(create_url("get_case_fields"), json=[])
+    requests_mock.get(create_url("get_suites/4"), json=[{"id": 2, "name": "Suite"}])
+    requests_mock.get(create_url("get_sections/4&suite_id=2"), json={"_links": {"next": None}, "sections": sections})
+    requests_mock.get(create_url("get_cases/4&suite_id=2"), json={"_links": {"next": None}, "cases": []})
+    api_client = APIClient(TEST_RAIL_URL, verbose_logging_function=lambda _: None)
+    prefetcher = MetadataPrefetcher(api_client, environment, metadata_cache)
+    prefetcher.start()
+    if suite is not None:
+        prefetcher.prefetch_suite(suite)
+    prefetcher.wait()
+    return api_client
+
+
+def prefetched_paths(requests_mock) -> list:
+    return sorted(request.path_url.split("/api/v2/")[1] for request in requests_mock.request_history)
+
+
+class TestMetadataPrefetcher:
+    @pytest.mark.api_client
+    def test_metadata_is_prefetched(self, prefetch_environment, requests_mock):
+        """The purpose of this test is to check that project, case fields, suites, sections and cases
+        requests are prefetched for project matching name and ID and later answered without sending them again."""
+        api_client = prefetch(prefetch_environment, requests_mock, report(None, 7))
+
+        assert api_client.memo_stats() == (0, 5)
+        api_client.send_get("get_projects", entity="projects", fields=ApiRequestHandler.PROJECT_FIELDS)
+        api_client.send_get("get_case_fields")
+        api_client.send_get("get_suites/4")
+        api_client.send_get("get_sections/4&suite_id=2", entity="sections", fields=ApiRequestHandler.SECTION_FIELDS)
+        api_client.send_get("get_cases/4&suite_id=2", entity="cases", fields=ApiRequestHandler.CASE_FIELDS)
+        assert requests_mock.call_count == 5, "Prefetched requests should not be sent again."
+        assert api_client.memo_stats() == (5, 5)
+
+    @pytest.mark.api_client
+    def test_only_independent_metadata_is_prefetched(self, prefetch_environment, requests_mock):
+        """The purpose of this test is to check that suites are not prefetched for ambiguous project
+        and that sections, cases and case fields are prefetched only when they are needed."""
+        prefetch_environment.project_id = None
+        prefetch_environment.auto_creation_response = None
+        api_client = prefetch(prefetch_environment, requests_mock)
+
+        assert api_client.memo_stats() == (0, 1)
+        assert [request.path_url for request in requests_mock.request_history] == [
+            "/index.php?/api/v2/get_projects"
+        ]
+
+    @pytest.mark.api_client
+    @pytest.mark.parametrize(
+        "run_id, case_ids, sections_count, expected_paths",
+        [
+            (None, (5, 7), 1, ["get_case_fields", "get_projects", "get_suites/4"]),
+            (
+                None, (), 1,
+                ["get_case_fields", "get_cases/4&suite_id=2", "get_projects", "get_sections/4&suite_id=2", "get_suites/4"],
+            ),
+            (3, (None, 7), 1, ["get_case_fields", "get_projects"]),
+            (None, (None, 7), 20, ["get_case_fields", "get_projects", "get_sections/4&suite_id=2", "get_suites/4"]),
+        ],
+        ids=["identified_report", "empty_report", "run_id", "section_scoped_lookup"],
+    )
+    def test_suite_metadata_is_prefetched_only_if_used(
+        self, prefetch_environment, requests_mock, run_id, case_ids, sections_count, expected_paths
+    ):
+        """The purpose of this test is to check that sections and cases are not prefetched for report which
+        skips checks of them (identified by case IDs or possibly by tests of the run, then also suites are not
+        prefetched), but are for empty report, and that cases of whole suite are not prefetched if they are going
+        to be read section by section."""
+        prefetch_environment.run_id = run_id
+        prefetch(prefetch_environment, requests_mock, report(*case_ids), sections_count=sections_count)
+
+        assert prefetched_paths(requests_mock) == expected_paths
+
+    @pytest.mark.api_client
+    def test_cached_metadata_is_not_prefetched(self, prefetch_environment, requests_mock, tmp_path):
+        """The purpose of this test is to check that projects and case fields found in metadata cache and cases
+        read from metadata cache are not prefetched, while suites and sections of cached project still are."""
+        metadata_cache = MetadataCache(str(tmp_path / "cache.db"), TEST_RAIL_URL)
+        metadata_cache.set_lookup("projects_by_name", {"Project": PROJECTS["projects"][1:]})
+        metadata_cache.set_lookup("case_fields", [])
+        prefetch(prefetch_environment, requests_mock, report(None), metadata_cache)
+
+        assert prefetched_paths(requests_mock) == ["get_sections/4&suite_id=2", "get_suites/4"]
@@ -0,0 +1,48 @@
+import pytest
+
+from trcli.api.rate_limiter import RateLimiter
+
+
+@pytest.fixture(scope="function")
+def clock(mocker):
+    current_time = [100.0]
+    mocker.patch("trcli.api.rate_limiter.monotonic", side_effect=lambda: current_time[0])
+    return current_time
+
+
+class TestRateLimiter:
+    @pytest.mark.api_client
+    def test_unlimited_budget_does_not_wait(self, clock):
+        """The purpose of this test is to check that without requests per second budget
+        requests are never held back."""
+        rate_limiter = RateLimiter()
+        waits = [rate_limiter.reserve() for _ in range(100)]
+
+        assert waits == [0.0] * 100
+        assert rate_limiter.throttled_time == 0
+
+    @pytest.mark.api_client
+    def test_budget_is_shared_and_refilled(self, clock):
+        """The purpose of this test is to check that requests above the budget have to wait
+        and that tokens are refilled over time."""
+        rate_limiter = RateLimiter(requests_per_second=2)
+        waits = [rate_limiter.reserve() for _ in range(4)]
+
+        assert waits == [0.0, 0.0, 0.5, 1.0], "Requests above burst should be spread in time."
+        clock[0] += 10
+        assert rate_limiter.reserve() == 0.0, "Tokens should be refilled after idle period."
+        assert rate_limiter.throttled_time == pytest.approx(1.0)
+
+    @pytest.mark.api_client
+    def test_retry_after_pauses_all_workers(self, clock):
+        """The purpose of this test is to check that pause requested by one worker holds back
+        all other workers and that overlapping pauses are counted once in throttled time."""
+        rate_limiter = RateLimiter()
+        rate_limiter.pause(30)
+        clock[0] += 10
+        assert rate_limiter.reserve() == pytest.approx(20)
+        rate_limiter.pause(30)
+        clock[0] += 30
+
+        assert rate_limiter.reserve() == 0.0
+        assert rate_limiter.throttled_time == pytest.approx(40)
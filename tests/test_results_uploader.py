@@ -37,14 +37,26 @@ class TestResultsUploader:
         environment.case_id = None
         environment.run_id = None
         environment.file = "results.xml"
+        environment.rate_limit = None
+        environment.retry_on = None
+        environment.retry_backoff = None
+        environment.retry_max_time = None
+        environment.retry_budget = None
+        environment.compress = False
+        environment.hedge = False
+        environment.circuit_breaker_threshold = 0
+        environment.attachment_rate_limit = None
+        environment.metadata_cache = False
 
         junit_file_parser = mocker.patch.object(JunitParser, "parse_file")
         api_request_handler = mocker.patch(
             "trcli.api.results_uploader.ApiRequestHandler"
         )
+        mocker.patch("trcli.api.results_uploader.MetadataPrefetcher")
         results_uploader = ResultsUploader(
             environment=environment, result_file_parser=junit_file_parser
         )
+        results_uploader.api_request_handler.match_cases_without_suite_lookup.return_value = (False, "")
         yield environment, api_request_handler, results_uploader
 
     @pytest.mark.results_uploader
@@ -216,6 +228,40 @@ class TestResultsUploader:
 
         environment.log.assert_has_calls(expected_log_calls)
 
+    @pytest.mark.parametrize(
+        "run_id", [None, 10], ids=["No run ID provided", "Run ID provided"]
+    )
+    @pytest.mark.results_uploader
+    def test_upload_results_identified_report_skips_suite_checks(
+        self, run_id, result_uploader_data_provider, mocker
+    ):
+        """The purpose of this test is to check that when all test cases are already identified,
+        sections and cases of the suite are not checked (nor suite, if run ID is provided)."""
+        (
+            environment,
+            api_request_handler,
+            results_uploader,
+        ) = result_uploader_data_provider
+        environment.run_id = run_id
+        get_project_id_mocker(
+            results_uploader=results_uploader,
+            project_id=10,
+            error_message="",
+            failing=True,
+        )
+        upload_results_inner_functions_mocker(
+            results_uploader=results_uploader, mocker=mocker, failing_functions=[]
+        )
+        results_uploader.api_request_handler.check_automation_id_field.return_value = None
+        results_uploader.api_request_handler.match_cases_without_suite_lookup.return_value = (True, "")
+
+        results_uploader.upload_results()
+
+        results_uploader.api_request_handler.match_cases_without_suite_lookup.assert_called_once_with(run_id)
+        results_uploader.add_missing_sections.assert_not_called()
+        results_uploader.add_missing_test_cases.assert_not_called()
+        assert results_uploader.get_suite_id.called == (run_id is None)
+
     @pytest.mark.results_uploader
     def test_get_suite_id_returns_valid_id(self, result_uploader_data_provider):
         """The purpose of this test is to check that get_suite_id function will
@@ -849,3 +895,22 @@ class TestResultsUploader:
         assert (
             results_uploader.rollback_changes(1, [1, 2], [1, 2], 2) == expected_result
         ), "Revert process not completed as expected in test."
+
+    @pytest.mark.results_uploader
+    def test_log_traffic_stats_by_endpoint(self, result_uploader_data_provider):
+        """The purpose of this test is to check that only add_result* requests are reported as results traffic,
+        other POST requests (e.g. add_case, add_run) are reported separately."""
+        environment, _, results_uploader = result_uploader_data_provider
+        api_client = results_uploader.api_client
+        api_client.record_traffic("GET", "get_cases/1&suite_id=2", 0.0, 0, 100)
+        api_client.record_traffic("POST", "add_results_for_cases/3", 0.0, 1000, 10)
+        api_client.record_traffic("POST", "add_case/4", 0.0, 200, 20)
+        api_client.record_traffic("POST", "add_run/1", 0.0, 200, 20)
+        results_uploader.attachment_client.record_traffic("POST", "add_attachment_to_result/5", 0.0, 5000, 10)
+
+        results_uploader.log_traffic_stats()
+
+        logged = [call.args[0] for call in environment.vlog.call_args_list]
+        assert [message.split(":")[0] for message in logged] == ["Metadata", "Results", "Attachments", "Other changes"]
+        assert logged[1].startswith("Results: 1 requests, sent 1 KB")
+        assert logged[3].startswith("Other changes: 2 requests, sent 400 bytes")
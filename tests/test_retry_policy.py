@@ -0,0 +1,50 @@
+import pytest
+
+from trcli.api.retry_policy import RetryPolicy
+
+
+class TestRetryPolicy:
+    @pytest.mark.api_client
+    def test_backoff_grows_exponentially_up_to_limit(self):
+        """The purpose of this test is to check that delay between retries doubles with every attempt
+        and never exceeds max_backoff."""
+        retry_policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+        delays = [retry_policy.get_backoff(attempt) for attempt in range(1, 6)]
+
+        assert delays == [1, 2, 4, 5, 5]
+        assert retry_policy.retry_time_spent == 17
+
+    @pytest.mark.api_client
+    def test_jitter_keeps_delay_in_range(self, mocker):
+        """The purpose of this test is to check that full jitter picks delay between 0 and backoff."""
+        uniform_mock = mocker.patch("trcli.api.retry_policy.random.uniform", return_value=1.5)
+        retry_policy = RetryPolicy(backoff_factor=1)
+
+        assert retry_policy.get_backoff(3) == 1.5
+        uniform_mock.assert_called_with(0, 4)
+
+    @pytest.mark.api_client
+    def test_retry_time_limits(self):
+        """The purpose of this test is to check that retrying stops when per request time limit
+        or per run retry budget would be exceeded."""
+        retry_policy = RetryPolicy(
+            backoff_factor=2, jitter=False, max_request_retry_time=5, retry_budget=7
+        )
+
+        assert retry_policy.get_backoff(1, request_retry_time=0) == 2
+        assert retry_policy.get_backoff(2, request_retry_time=2) is None, "Per request limit exceeded."
+        assert retry_policy.get_backoff(1, request_retry_time=0) == 2
+        assert retry_policy.get_backoff(1, request_retry_time=0) == 2
+        assert retry_policy.get_backoff(1, request_retry_time=0) is None, "Retry budget exceeded."
+        assert retry_policy.retry_time_spent == 6
+
+    @pytest.mark.api_client
+    def test_retryable_statuses_and_timeouts(self):
+        """The purpose of this test is to check that only configured status codes are retried
+        and that timeouts are retried only for idempotent requests."""
+        retry_policy = RetryPolicy(retry_on=[503])
+
+        assert retry_policy.is_retryable_status(503)
+        assert not retry_policy.is_retryable_status(429)
+        assert retry_policy.is_retryable_timeout("GET")
+        assert not retry_policy.is_retryable_timeout("POST")
@@ -1,15 +1,31 @@
+import gzip
+import os
+from concurrent.futures import Future, wait, FIRST_COMPLETED
 from pathlib import Path
+from threading import Lock, Thread
 
 import requests
-from typing import Union, Callable
-from time import sleep
+from typing import Union, Callable, Iterable, Iterator
+from time import sleep, monotonic
 
 import urllib3
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from json import JSONDecodeError
-from requests.exceptions import RequestException, Timeout, ConnectionError
+from requests.exceptions import RequestException, Timeout, ConnectionError, ConnectTimeout
+from trcli.api.circuit_breaker import CircuitBreaker
+from trcli.api.hedging_policy import HedgingPolicy
+from trcli.api.http2_session import Http2Session
+from trcli.api.json_codec import JsonCodec, get_default_codec
+from trcli.api.rate_limiter import RateLimiter
+from trcli.api.retry_policy import RetryPolicy
 from trcli.constants import FAULT_MAPPING
-from trcli.settings import DEFAULT_API_CALL_TIMEOUT, DEFAULT_API_CALL_RETRIES
+from trcli.settings import (
+    DEFAULT_API_CALL_TIMEOUT,
+    DEFAULT_API_CALL_RETRIES,
+    DEFAULT_CONNECTION_POOL_SIZE,
+    DEFAULT_COMPRESSION_LEVEL,
+)
 from dataclasses import dataclass
 
 
@@ -25,6 +41,247 @@ class APIClientResult:
     error_message: str
 
 
+@dataclass
+class ConnectionPoolStats:
+    """
+    requests - number of requests sent through pooled connections
+    connections - number of new connections (TCP+TLS handshakes) opened by the pool"""
+
+    requests: int
+    connections: int
+
+    @property
+    def reused(self) -> int:
+        return max(self.requests - self.connections, 0)
+
+
+@dataclass
+class CompressionStats:
+    """
+    requests - number of request bodies sent compressed
+    original_bytes - size of those bodies before compression
+    compressed_bytes - size of those bodies sent over the wire"""
+
+    requests: int = 0
+    original_bytes: int = 0
+    compressed_bytes: int = 0
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.compressed_bytes
+
+
+@dataclass
+class TrafficStats:
+    """
+    requests - number of requests answered by host (including retries)
+    bytes_sent - size of request bodies and uploaded files sent over the wire
+    bytes_received - size of response bodies
+    duration - wall-clock time in seconds between start of the first and end of the last request"""
+
+    requests: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    duration: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Bytes sent and received per second."""
+        return (self.bytes_sent + self.bytes_received) / self.duration if self.duration else 0.0
+
+
+class RequestAttempts:
+    """
+    Retry loop of a single request shared by APIClient and AsyncAPIClient, which supply only the send call.
+    Body is encoded (and compressed) once. Before each attempt backoff, circuit breaker, rate limit
+    and bandwidth limit are applied, after it response or error is classified, recorded (circuit breaker,
+    traffic statistics, verbose log) and retry policy decides whether to send request again.
+    POST requests drop memoized lookups of changed resource.
+    send - called with encoded body and headers, returns response (with status_code, headers and content)
+    or raises requests exception (other transports translate their exceptions)
+    """
+
+    def __init__(
+        self,
+        api_client: "APIClient",
+        method: str,
+        uri: str,
+        payload: dict,
+        files: {str: Path} = None,
+        entity: str = None,
+        fields: Iterable[str] = None,
+    ):
+        self.api_client = api_client
+        self.method = method
+        self.uri = uri
+        self.entity = entity
+        self.fields = fields
+        self.headers = {"User-Agent": APIClient.USER_AGENT}
+        if files is None:
+            self.headers["Content-Type"] = "application/json"
+        # body is encoded once and the same bytes are sent again on retries
+        self.body = api_client.json_codec.dumps(payload) if payload and files is None else None
+        self.__request_log_message = (
+            APIClient.format_request_for_vlog(
+                method=method, url=api_client.url + uri, payload=self.body.decode("utf-8") if self.body else None
+            )
+            if api_client.verbose_logging_function is not None
+            else ""
+        )
+        if self.body is not None:
+            self.body = api_client.compress_body(self.body, self.headers)
+        self.__body_size = len(self.body) if self.body is not None else RequestAttempts.__files_size(files)
+        self.__started = monotonic()
+        self.__attempt_started = self.__started
+        self.__retry_after = False
+        self.__retry = False
+        self.__stopped = False
+        self.status_code = -1
+        self.response_text = ""
+        self.error_message = ""
+        if method == "POST":
+            api_client.invalidate_lookups(uri)
+
+    def run(self, send: Callable, sleep: Callable) -> APIClientResult:
+        """Sends request with retries, sleep is called with number of seconds to wait."""
+        for attempt in range(self.api_client.retries + 1):
+            for wait_time in self.__waits(attempt):
+                sleep(wait_time)
+            if self.__stopped:
+                break
+            try:
+                response = send(self.body, self.headers)
+            except RequestException as e:
+                self.__record_error(e)
+            else:
+                retry_time = self.__record_response(response)
+                if retry_time:
+                    sleep(retry_time)
+                self.__decode(response)
+            if not self.__retry:
+                break
+        return self.result()
+
+    async def run_async(self, send: Callable, sleep: Callable) -> APIClientResult:
+        """Coroutine counterpart of run, send and sleep are awaited."""
+        for attempt in range(self.api_client.retries + 1):
+            for wait_time in self.__waits(attempt):
+                await sleep(wait_time)
+            if self.__stopped:
+                break
+            try:
+                response = await send(self.body, self.headers)
+            except RequestException as e:
+                self.__record_error(e)
+            else:
+                retry_time = self.__record_response(response)
+                if retry_time:
+                    await sleep(retry_time)
+                self.__decode(response)
+            if not self.__retry:
+                break
+        return self.result()
+
+    def result(self) -> APIClientResult:
+        return APIClientResult(self.status_code, self.response_text, self.error_message)
+
+    def __waits(self, attempt: int) -> Iterator[float]:
+        """
+        Yields times to wait before the attempt: backoff first, then rate and bandwidth limits,
+        so budget is taken only when request is about to be sent. Sets stopped when request should
+        not be sent anymore (retry time exceeded or circuit open).
+        """
+        api_client = self.api_client
+        if attempt > 0 and not self.__retry_after:
+            delay = api_client.retry_policy.get_backoff(attempt, monotonic() - self.__started)
+            if delay is None:
+                self.__stopped = True
+                return
+            if delay > 0:
+                yield delay
+        self.error_message = ""
+        self.__retry_after = False
+        circuit_breaker = api_client.circuit_breaker
+        if circuit_breaker is not None and not circuit_breaker.allow_request():
+            self.error_message = FAULT_MAPPING["circuit_open"].format(failures=circuit_breaker.consecutive_failures)
+            self.__stopped = True
+            return
+        wait_time = api_client.rate_limiter.reserve()
+        if api_client.bandwidth_limiter is not None and self.__body_size:
+            wait_time = max(wait_time, api_client.bandwidth_limiter.reserve(self.__body_size))
+        if wait_time > 0:
+            yield wait_time
+        self.__attempt_started = monotonic()
+
+    def __record_error(self, error: RequestException):
+        circuit_breaker = self.api_client.circuit_breaker
+        if isinstance(error, Timeout):
+            self.error_message = FAULT_MAPPING["no_response_from_host"]
+            self.__retry = isinstance(error, ConnectTimeout) or self.api_client.retry_policy.is_retryable_timeout(
+                self.method
+            )
+        elif isinstance(error, ConnectionError):
+            self.error_message = FAULT_MAPPING["connection_error"]
+            self.__retry = True
+        else:
+            self.error_message = FAULT_MAPPING["unexpected_error_during_request_send"].format(request=error.request)
+            self.__retry = False
+            circuit_breaker = None
+        if circuit_breaker is not None:
+            circuit_breaker.record_failure()
+        self.__vlog(self.__request_log_message)
+
+    def __record_response(self, response) -> float:
+        """Records answered attempt, returns time to wait requested by host with Retry-After (0 if none)."""
+        api_client = self.api_client
+        self.status_code = response.status_code
+        if api_client.circuit_breaker is not None:
+            api_client.circuit_breaker.record_success()
+        api_client.record_traffic(
+            self.method, self.uri, self.__attempt_started, self.__body_size, len(response.content)
+        )
+        self.__retry = api_client.retry_policy.is_retryable_status(self.status_code)
+        if self.status_code == 429 and "Retry-After" in response.headers:
+            # server told us when to come back, no need for additional backoff
+            self.__retry_after = True
+            retry_time = float(response.headers["Retry-After"])
+            api_client.rate_limiter.pause(retry_time)
+            return retry_time
+        return 0
+
+    def __decode(self, response):
+        json_codec = self.api_client.json_codec
+        try:
+            if self.fields is None:
+                self.response_text = json_codec.loads(response.content)
+            else:
+                self.response_text = json_codec.loads_projected(response.content, self.entity, self.fields)
+            self.error_message = self.response_text.get("error", "")
+        except (JSONDecodeError, ValueError):
+            self.response_text = str(response.content)
+            self.error_message = response.content
+        except AttributeError:
+            self.error_message = ""
+        if self.__request_log_message:
+            self.__vlog(
+                self.__request_log_message + APIClient.format_response_for_vlog(response.status_code, self.response_text)
+            )
+
+    def __vlog(self, message: str):
+        if message:
+            self.api_client.verbose_logging_function(message)
+
+    @staticmethod
+    def __files_size(files: {str: Path}) -> int:
+        size = 0
+        for file in (files or {}).values():
+            try:
+                size += os.fstat(file.fileno()).st_size
+            except (AttributeError, OSError, TypeError, ValueError):
+                pass
+        return size
+
+
 class APIClient:
     """
     Class to be used for basic communication over API.
@@ -33,7 +290,6 @@ class APIClient:
     PREFIX = "index.php?"
     VERSION = "/api/v2/"
     SUFFIX_API_V2_VERSION = f"{PREFIX}{VERSION}"
-    RETRY_ON = [429, 500, 502]
     USER_AGENT = "TRCLI"
 
     def __init__(
@@ -44,13 +300,42 @@ class APIClient:
         retries: int = DEFAULT_API_CALL_RETRIES,
         timeout: int = DEFAULT_API_CALL_TIMEOUT,
         verify: bool = True,
+        pool_size: int = DEFAULT_CONNECTION_POOL_SIZE,
+        http2: bool = False,
+        rate_limiter: RateLimiter = None,
+        retry_policy: RetryPolicy = None,
+        json_codec: JsonCodec = None,
+        compression_threshold: int = None,
+        hedging_policy: HedgingPolicy = None,
+        circuit_breaker: CircuitBreaker = None,
+        bandwidth_limiter: RateLimiter = None,
+        memoize_lookups: bool = False,
     ):
         self.username = ""
         self.password = ""
         self.api_key = ""
         self.timeout = None
-        self.retries = retries
+        self.retry_policy = retry_policy or RetryPolicy(retries=retries)
+        self.retries = self.retry_policy.retries
         self.verify = verify
+        self.http2 = http2
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.json_codec = json_codec or get_default_codec()
+        self.compression_threshold = compression_threshold
+        self.hedging_policy = hedging_policy
+        self.circuit_breaker = circuit_breaker
+        self.bandwidth_limiter = bandwidth_limiter
+        self.memoize_lookups = memoize_lookups
+        self.__traffic = {}
+        self.__traffic_lock = Lock()
+        self.__compression_stats = CompressionStats()
+        self.__compression_lock = Lock()
+        # responses of GET requests (futures, so concurrent identical requests share one in-flight request)
+        self.__memo = {}
+        self.__memo_lock = Lock()
+        self.__memo_hits = 0
+        self.__memo_misses = 0
+        # None disables verbose logging, request and response logs are then not formatted at all
         self.verbose_logging_function = verbose_logging_function
         self.logging_function = logging_function
         self.__validate_and_set_timeout(timeout)
@@ -59,100 +344,267 @@ class APIClient:
         self.__url = host_name + self.SUFFIX_API_V2_VERSION
         if not verify:
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        if http2:
+            self.session = Http2Session(verify=verify, pool_size=pool_size)
+        else:
+            # One keep-alive session shared by all worker threads. Pool is sized to the
+            # number of workers, so concurrent requests do not discard connections.
+            self.__adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            self.session = requests.Session()
+            self.session.mount("https://", self.__adapter)
+            self.session.mount("http://", self.__adapter)
+
+    @property
+    def url(self) -> str:
+        """Base url of TestRail API, requests uris are appended to it."""
+        return self.__url
 
-    def send_get(self, uri: str) -> APIClientResult:
+    def send_get(
+        self, uri: str, entity: str = None, fields: Iterable[str] = None, hedge: bool = False
+    ) -> APIClientResult:
         """
         Sends GET request to host specified by host_name.
-        Handles retries taking into consideration retries parameter. Retry will occur when one of the following happens:
-            * got status code 429 in a response from host
+        Handles retries taking into consideration retry policy. Retry will occur when one of the following happens:
+            * got one of retry_on status codes (429, 500, 502, 503, 504 by default) in a response from host
             * timeout occurred
             * connection error occurred
+        When fields are given only those fields of each entity (e.g. cases) in response are decoded.
+        If the same request was prefetched, its response is used instead of sending the request again.
+        With memoize_lookups, responses of lookups (requests without entity) are kept for the lifetime
+        of the client: identical requests, also concurrent ones, share one response until POST request
+        to the same resource is sent. Paginated entity pages are never kept, prefetched page
+        is used only by the first identical request.
+        When hedge is set and client has hedging policy, duplicate request is sent if response takes longer
+        than usual and whichever response comes first is returned.
+        """
+        key = self.__memo_key(uri, entity, fields)
+        memoize = self.memoize_lookups and entity is None
+        memoized = None
+        with self.__memo_lock:
+            future = self.__memo.get(key)
+            if future is not None:
+                self.__memo_hits += 1
+                if not memoize:
+                    del self.__memo[key]
+            elif memoize:
+                self.__memo_misses += 1
+                memoized = self.__memo[key] = Future()
+        if future is not None:
+            return future.result()
+        try:
+            if hedge and self.hedging_policy is not None:
+                response = self.__send_hedged_get(uri, entity, fields)
+            else:
+                response = self.__send_request("GET", uri, None, entity=entity, fields=fields)
+        except BaseException as e:
+            if memoized is not None:
+                self.__forget(key, memoized)
+                memoized.set_exception(e)
+            raise
+        if memoized is not None:
+            if response.status_code != 200:
+                self.__forget(key, memoized)
+            memoized.set_result(response)
+        return response
+
+    def prefetch(self, uri: str, entity: str = None, fields: Iterable[str] = None) -> Future:
         """
-        return self.__send_request("GET", uri, None)
+        Starts GET request in background thread and returns future of its response.
+        Response is used by the first send_get call with the same parameters (by all of them
+        for memoized lookups), unless POST request to the same resource is sent in the meantime.
+        Failed response is given only to calls already waiting for it, later calls send the request again.
+        """
+        key = self.__memo_key(uri, entity, fields)
+        with self.__memo_lock:
+            future = self.__send_get_in_background(
+                uri, entity, fields, on_failure=lambda failed: self.__forget(key, failed)
+            )
+            self.__memo[key] = future
+            self.__memo_misses += 1
+        return future
+
+    def memo_stats(self) -> (int, int):
+        """Returns number of GET requests answered from memo (hits) and number of requests sent for memo."""
+        with self.__memo_lock:
+            return self.__memo_hits, self.__memo_misses
+
+    @staticmethod
+    def __memo_key(uri: str, entity: str, fields: Iterable[str]) -> tuple:
+        return uri, entity, tuple(fields) if fields else None
+
+    def __forget(self, key: tuple, future: Future):
+        """Removes memoized response (e.g. failed one, so next identical request is sent again)."""
+        with self.__memo_lock:
+            if self.__memo.get(key) is future:
+                del self.__memo[key]
+
+    def invalidate_lookups(self, uri: str):
+        """
+        Drops memoized responses of resource changed by POST request,
+        e.g. add_suite/1 and delete_suite/2 invalidate get_suite and get_suites requests.
+        """
+        resource = uri.split("/", 1)[0].partition("_")[2]
+        endpoints = (f"get_{resource}", f"get_{resource}s")
+        with self.__memo_lock:
+            for key in [key for key in self.__memo if APIClient.endpoint(key[0]) in endpoints]:
+                del self.__memo[key]
+
+    def __send_get_in_background(
+        self, uri: str, entity: str, fields: Iterable[str], on_failure: Callable[[Future], None] = None
+    ) -> Future:
+        """
+        Sends GET request in background thread and returns future of its response.
+        on_failure is called with the future before failed response (or exception) is set.
+        """
+        future = Future()
+        future.set_running_or_notify_cancel()
+        started = monotonic()
+
+        def fetch():
+            try:
+                response = self.__send_request("GET", uri, None, entity=entity, fields=fields)
+            except BaseException as e:
+                if on_failure is not None:
+                    on_failure(future)
+                future.set_exception(e)
+            else:
+                if response.status_code == 200:
+                    if self.hedging_policy is not None:
+                        self.hedging_policy.record_latency(monotonic() - started)
+                elif on_failure is not None:
+                    on_failure(future)
+                future.set_result(response)
+
+        Thread(target=fetch, daemon=True).start()
+        return future
+
+    def __send_hedged_get(self, uri: str, entity: str, fields: Iterable[str]) -> APIClientResult:
+        delay = self.hedging_policy.get_delay()
+        original = self.__send_get_in_background(uri, entity, fields)
+        if delay is None or wait([original], timeout=delay).done:
+            return original.result()
+        hedge = self.__send_get_in_background(uri, entity, fields)
+        done, _ = wait([original, hedge], return_when=FIRST_COMPLETED)
+        winner = original if original in done else hedge
+        self.hedging_policy.record_hedge(won=winner is hedge)
+        return winner.result()
 
     def send_post(self, uri: str, payload: dict = None, files: {str: Path} = None) -> APIClientResult:
         """
         Sends POST request to host specified by host_name.
-        Handles retries taking into consideration retries parameter. Retry will occur when one of the following happens:
-            * got status code 429 in a response from host
-            * timeout occurred
+        Handles retries taking into consideration retry policy. Retry will occur when one of the following happens:
+            * got one of retry_on status codes (429, 500, 502, 503, 504 by default) in a response from host
+            * timeout occurred while connecting (request could be already processed after sending it)
             * connection error occurred
+        Drops memoized responses of changed resource.
         """
         return self.__send_request("POST", uri, payload, files)
 
-    def __send_request(self, method: str, uri: str, payload: dict, files: {str: Path} = None) -> APIClientResult:
-        status_code = -1
-        response_text = ""
-        error_message = ""
+    def __send_request(
+        self,
+        method: str,
+        uri: str,
+        payload: dict,
+        files: {str: Path} = None,
+        entity: str = None,
+        fields: Iterable[str] = None,
+    ) -> APIClientResult:
+        auth = HTTPBasicAuth(username=self.username, password=self.get_password())
         url = self.__url + uri
-        password = self.__get_password()
-        auth = HTTPBasicAuth(username=self.username, password=password)
-        headers = {"User-Agent": self.USER_AGENT}
-        if files is None:
-            headers["Content-Type"] = "application/json"
-        verbose_log_message = ""
-        for i in range(self.retries + 1):
-            error_message = ""
-            try:
-                verbose_log_message = APIClient.format_request_for_vlog(
-                    method=method, url=url, payload=payload
-                )
-                if method == "POST":
-                    response = requests.post(
-                        url=url,
-                        auth=auth,
-                        json=payload,
-                        timeout=self.timeout,
-                        headers=headers,
-                        verify=self.verify,
-                        files=files,
-                    )
-                else:
-                    response = requests.get(
-                        url=url, auth=auth, json=payload, timeout=self.timeout, verify=self.verify,
-                    )
-            except Timeout:
-                error_message = FAULT_MAPPING["no_response_from_host"]
-                self.verbose_logging_function(verbose_log_message)
-                continue
-            except ConnectionError:
-                error_message = FAULT_MAPPING["connection_error"]
-                self.verbose_logging_function(verbose_log_message)
-                continue
-            except RequestException as e:
-                error_message = FAULT_MAPPING[
-                    "unexpected_error_during_request_send"
-                ].format(request=e.request)
-                self.verbose_logging_function(verbose_log_message)
-                break
-            else:
-                status_code = response.status_code
-                if status_code == 429:
-                    retry_time = float(response.headers["Retry-After"])
-                    sleep(retry_time)
-                try:
-                    response_text = response.json()
-                    error_message = response_text.get("error", "")
-                except (JSONDecodeError, ValueError):
-                    response_text = str(response.content)
-                    error_message = response.content
-                except AttributeError:
-                    error_message = ""
-                verbose_log_message = (
-                    verbose_log_message
-                    + APIClient.format_response_for_vlog(
-                        response.status_code, response_text
-                    )
+
+        def send(body: bytes, headers: dict):
+            if method == "POST":
+                return self.session.post(
+                    url=url,
+                    auth=auth,
+                    data=body,
+                    timeout=self.timeout,
+                    headers=headers,
+                    verify=self.verify,
+                    files=files,
                 )
-            if verbose_log_message:
-                self.verbose_logging_function(verbose_log_message)
+            return self.session.get(url=url, auth=auth, timeout=self.timeout, verify=self.verify)
 
-            if status_code not in self.RETRY_ON:
-                break
+        return RequestAttempts(self, method, uri, payload, files, entity, fields).run(send, sleep)
+
+    def connection_stats(self) -> ConnectionPoolStats:
+        """Returns number of requests sent and connections opened by the session connection pool."""
+        if self.http2:
+            requests_sent, connections = self.session.connection_stats()
+            return ConnectionPoolStats(requests=requests_sent, connections=connections)
+        pool_managers = [self.__adapter.poolmanager, *self.__adapter.proxy_manager.values()]
+        stats = ConnectionPoolStats(requests=0, connections=0)
+        for pool_manager in pool_managers:
+            for key in pool_manager.pools.keys():
+                pool = pool_manager.pools.get(key)
+                if pool is not None:
+                    stats.requests += pool.num_requests
+                    stats.connections += pool.num_connections
+        return stats
+
+    def compress_body(self, body: bytes, headers: dict) -> bytes:
+        """
+        Compresses encoded request body with gzip if compression is enabled and body is bigger than
+        compression_threshold. Sets Content-Encoding header accordingly.
+        Body is sent as is if compression would not make it smaller.
+        """
+        if self.compression_threshold is None or len(body) < self.compression_threshold:
+            return body
+        compressed = gzip.compress(body, compresslevel=DEFAULT_COMPRESSION_LEVEL)
+        if len(compressed) >= len(body):
+            return body
+        headers["Content-Encoding"] = "gzip"
+        with self.__compression_lock:
+            self.__compression_stats.requests += 1
+            self.__compression_stats.original_bytes += len(body)
+            self.__compression_stats.compressed_bytes += len(compressed)
+        return compressed
+
+    def compression_stats(self) -> CompressionStats:
+        """Returns number of request bodies sent compressed and bytes saved by compression."""
+        with self.__compression_lock:
+            return CompressionStats(**vars(self.__compression_stats))
+
+    def traffic_stats(self, classify: Callable[[str, str], str] = None) -> {str: TrafficStats}:
+        """
+        Returns traffic statistics per request method (GET, POST) or per class of requests
+        given by classify function, called with request method and endpoint (e.g. add_results_for_cases).
+        """
+        classify = classify or (lambda method, endpoint: method)
+        traffic = {}
+        with self.__traffic_lock:
+            for (method, endpoint), (stats, started, finished) in self.__traffic.items():
+                name = classify(method, endpoint)
+                total, first_started, last_finished = traffic.get(name, (TrafficStats(), started, finished))
+                total.requests += stats.requests
+                total.bytes_sent += stats.bytes_sent
+                total.bytes_received += stats.bytes_received
+                traffic[name] = (total, min(first_started, started), max(last_finished, finished))
+        for stats, first_started, last_finished in traffic.values():
+            stats.duration = last_finished - first_started
+        return {name: stats for name, (stats, _, _) in traffic.items()}
+
+    def record_traffic(self, method: str, uri: str, started: float, bytes_sent: int, bytes_received: int):
+        """Adds request answered by host (started at given monotonic time) to traffic statistics of its endpoint."""
+        finished = monotonic()
+        key = method, APIClient.endpoint(uri)
+        with self.__traffic_lock:
+            stats, first_started, last_finished = self.__traffic.get(key, (TrafficStats(), started, finished))
+            stats.requests += 1
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            self.__traffic[key] = (stats, min(first_started, started), max(last_finished, finished))
+
+    @staticmethod
+    def endpoint(uri: str) -> str:
+        """Returns API endpoint of request uri, e.g. get_cases for get_cases/1&suite_id=2."""
+        return uri.split("/", 1)[0].split("&", 1)[0]
 
-        return APIClientResult(status_code, response_text, error_message)
+    def close(self):
+        """Closes all pooled connections."""
+        self.session.close()
 
-    def __get_password(self) -> str:
+    def get_password(self) -> str:
         """Based on what is set, choose to use api_key or password as authentication method"""
         if self.api_key:
             password = self.api_key
@@ -172,7 +624,7 @@ class APIClient:
             self.timeout = DEFAULT_API_CALL_TIMEOUT
 
     @staticmethod
-    def format_request_for_vlog(method: str, url: str, payload: dict):
+    def format_request_for_vlog(method: str, url: str, payload: Union[dict, str]):
         return (
             f"\n**** API Call\n"
             f"method: {method}\n"
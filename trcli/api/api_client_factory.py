@@ -0,0 +1,102 @@
+from trcli.api.api_client import APIClient
+from trcli.api.circuit_breaker import CircuitBreaker
+from trcli.api.hedging_policy import HedgingPolicy
+from trcli.api.http2_session import Http2Session
+from trcli.api.metadata_cache import MetadataCache
+from trcli.api.rate_limiter import RateLimiter
+from trcli.api.retry_policy import RetryPolicy
+from trcli.cli import Environment
+from trcli.constants import FAULT_MAPPING
+from trcli.settings import DEFAULT_RETRY_ON, DEFAULT_CONNECTION_POOL_SIZE
+
+
+class ApiClientFactory:
+    """
+    Base class for commands talking to TestRail API.
+    Creates request policies (rate limit, retries, hedging, circuit breaker) from environment,
+    shared by all API clients instantiated by the command.
+    """
+
+    def __init__(self, environment: Environment):
+        self.environment = environment
+        self.rate_limiter = RateLimiter(self.environment.rate_limit)
+        self.retry_policy = RetryPolicy(
+            retry_on=self.environment.retry_on or DEFAULT_RETRY_ON,
+            backoff_factor=self.environment.retry_backoff or 0.0,
+            max_request_retry_time=self.environment.retry_max_time,
+            retry_budget=self.environment.retry_budget,
+        )
+        self.hedging_policy = (
+            HedgingPolicy(percentile=self.environment.hedge_percentile) if self.environment.hedge else None
+        )
+        self.circuit_breaker = (
+            CircuitBreaker(
+                failure_threshold=self.environment.circuit_breaker_threshold,
+                recovery_time=self.environment.circuit_breaker_recovery,
+                logging_function=self.environment.log,
+            )
+            if self.environment.circuit_breaker_threshold
+            else None
+        )
+
+    def instantiate_api_client(
+        self, pool_size: int = DEFAULT_CONNECTION_POOL_SIZE, bandwidth_limiter: RateLimiter = None
+    ) -> APIClient:
+        """
+        Instantiate api client with needed attributes taken from environment.
+        pool_size - number of pooled connections
+        bandwidth_limiter - optional limit of request body bytes sent per second
+        """
+        # request and response logs are formatted only in verbose mode
+        verbose_logging_function = self.environment.vlog if self.environment.verbose else None
+        logging_function = self.environment.log
+        http2 = bool(self.environment.http2)
+        compression_threshold = self.environment.compress_threshold if self.environment.compress else None
+        if http2 and not Http2Session.is_available():
+            self.environment.elog(FAULT_MAPPING["missing_http2_dependency"])
+            exit(1)
+        if self.environment.timeout:
+            api_client = APIClient(
+                self.environment.host,
+                verbose_logging_function=verbose_logging_function,
+                logging_function=logging_function,
+                timeout=self.environment.timeout,
+                verify=not self.environment.insecure,
+                http2=http2,
+                rate_limiter=self.rate_limiter,
+                retry_policy=self.retry_policy,
+                compression_threshold=compression_threshold,
+                hedging_policy=self.hedging_policy,
+                circuit_breaker=self.circuit_breaker,
+                pool_size=pool_size,
+                bandwidth_limiter=bandwidth_limiter,
+                memoize_lookups=True,
+            )
+        else:
+            api_client = APIClient(
+                self.environment.host,
+                logging_function=logging_function,
+                verbose_logging_function=verbose_logging_function,
+                verify=not self.environment.insecure,
+                http2=http2,
+                rate_limiter=self.rate_limiter,
+                retry_policy=self.retry_policy,
+                compression_threshold=compression_threshold,
+                hedging_policy=self.hedging_policy,
+                circuit_breaker=self.circuit_breaker,
+                pool_size=pool_size,
+                bandwidth_limiter=bandwidth_limiter,
+                memoize_lookups=True,
+            )
+        api_client.username = self.environment.username
+        api_client.password = self.environment.password
+        api_client.api_key = self.environment.key
+        return api_client
+
+    def instantiate_metadata_cache(self) -> MetadataCache:
+        """Instantiate metadata cache of the host with path and lookup TTL taken from environment."""
+        return MetadataCache(
+            self.environment.metadata_cache_path,
+            self.environment.host,
+            lookup_ttl=self.environment.metadata_cache_ttl,
+        )
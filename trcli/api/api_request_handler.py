@@ -1,8 +1,14 @@
+import asyncio
 import html
 import json
+from collections import deque
+from contextlib import AsyncExitStack
+from itertools import islice
 from pprint import pprint
 
 from trcli.api.api_client import APIClient, APIClientResult
+from trcli.api.async_api_client import AsyncAPIClient
+from trcli.api.metadata_cache import MetadataCache
 from trcli.cli import Environment
 from trcli.api.api_response_verify import ApiResponseVerify
 from trcli.data_classes.dataclass_testrail import TestRailSuite
@@ -11,10 +17,17 @@ from trcli.constants import (
     ProjectErrors,
     FAULT_MAPPING,
 )
-from trcli.settings import MAX_WORKERS_ADD_RESULTS, MAX_WORKERS_ADD_CASE
-from typing import List, Union
+from trcli.settings import (
+    MAX_WORKERS_ADD_RESULTS,
+    MAX_WORKERS_ADD_CASE,
+    MAX_WORKERS_ADD_ATTACHMENTS,
+    MAX_WORKERS_GET_PAGES,
+    RESULTS_BATCHES_IN_FLIGHT,
+    SCOPED_CASE_LOOKUP_RATIO,
+)
+from typing import Callable, Iterator, List, Tuple, Union
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed, wait, FIRST_COMPLETED
 
 
 @dataclass
@@ -27,15 +40,38 @@ class ProjectData:
 class ApiRequestHandler:
     """Sends requests based on DataProvider bodies"""
 
+    # fields of existing entities used when matching them with parsed report
+    CASE_FIELDS = ("id", "section_id", "title", "custom_automation_id", "updated_on")
+    SECTION_FIELDS = ("id", "suite_id", "name")
+    TEST_FIELDS = ("id", "case_id")
+    PROJECT_FIELDS = ("id", "name", "suite_mode")
+
     def __init__(
         self,
         environment: Environment,
         api_client: APIClient,
         suites_data: TestRailSuite,
         verify: bool = False,
+        async_client: AsyncAPIClient = None,
+        attachment_client: APIClient = None,
+        metadata_cache: MetadataCache = None,
+        attachment_async_client: AsyncAPIClient = None,
     ):
         self.environment = environment
         self.client = api_client
+        self.async_client = async_client
+        # attachments are sent through separate client (own connection pool and bandwidth limit),
+        # so large uploads do not slow down results and metadata requests
+        self.attachment_client = attachment_client or api_client
+        # asyncio counterpart of attachment_client, created with async transport when first needed
+        self.attachment_async_client = attachment_async_client
+        self.metadata_cache = metadata_cache
+        # asyncio tasks which acquired semaphore and are sending their request (they are not cancelled)
+        self.__sending_tasks = set()
+        # run ID and case IDs of its tests by test ID, read by match_cases_without_suite_lookup
+        self.__run_case_ids_by_test_id = None, None
+        # number of sections of the suite, known after check_missing_section_ids
+        self.suite_sections_count = None
         self.suffix = api_client.VERSION
         self.data_provider = ApiDataProvider(suites_data, environment.case_fields, environment.run_description)
         self.suites_data_from_provider = self.data_provider.suites_input
@@ -47,9 +83,8 @@ class ApiRequestHandler:
         :param project_id: the id of the project
         :return: error message
         """
-        response = self.client.send_get("get_case_fields")
-        if not response.error_message:
-            fields: list = response.response_text
+        fields, error_message = self.__get_case_fields()
+        if not error_message:
             automation_id_field = next(
                 filter(lambda x: x["system_name"] == "custom_automation_id", fields),
                 None
@@ -61,7 +96,20 @@ class ApiRequestHandler:
                 elif project_id not in context["project_ids"]:
                     return FAULT_MAPPING["automation_id_unavailable"]
         else:
-            return response.error_message
+            return error_message
+
+    def __get_case_fields(self) -> (List[dict], str):
+        """
+        Get case fields, from metadata cache if present there and not expired.
+        """
+        if self.metadata_cache is not None:
+            fields = self.metadata_cache.get_lookup("case_fields")
+            if fields is not None:
+                return fields, ""
+        response = self.client.send_get("get_case_fields")
+        if not response.error_message and self.metadata_cache is not None:
+            self.metadata_cache.set_lookup("case_fields", response.response_text)
+        return response.response_text, response.error_message
 
     def get_project_id(self, project_name: str, project_id: int = None) -> ProjectData:
         """
@@ -69,24 +117,15 @@ class ApiRequestHandler:
         :project_name: Project name
         :returns: ProjectData
         """
-        response = self.client.send_get("get_projects")
-        if not response.error_message:
-            if isinstance(response.response_text, dict):  # Endpoints with pagination
-                projects_data = response.response_text["projects"]
-            else:  # Endpoints without pagination (legacy)
-                projects_data = response.response_text
-
-            available_projects = [
-                project
-                for project in projects_data
-                if project["name"] == project_name
-            ]
+        projects_by_name, error_message = self.__get_projects_by_name(project_name)
+        if not error_message:
+            available_projects = projects_by_name.get(project_name, [])
 
             if len(available_projects) == 1:
                 return ProjectData(
                     project_id=int(available_projects[0]["id"]),
                     suite_mode=int(available_projects[0]["suite_mode"]),
-                    error_message=response.error_message,
+                    error_message=error_message,
                 )
             elif len(available_projects) > 1:
                 if project_id in [project["id"] for project in available_projects]:
@@ -98,7 +137,7 @@ class ApiRequestHandler:
                     return ProjectData(
                         project_id=int(available_projects[project_index]["id"]),
                         suite_mode=int(available_projects[project_index]["suite_mode"]),
-                        error_message=response.error_message,
+                        error_message=error_message,
                     )
                 else:
                     return ProjectData(
@@ -116,9 +155,30 @@ class ApiRequestHandler:
             return ProjectData(
                 project_id=ProjectErrors.other_error,
                 suite_mode=-1,
-                error_message=response.error_message,
+                error_message=error_message,
             )
 
+    def __get_projects_by_name(self, project_name: str) -> (dict, str):
+        """
+        Get index of projects by name. Index is read from metadata cache if present there, not expired
+        and containing project_name, otherwise it is built from all pages of projects.
+        :project_name: Project name
+        :returns: Tuple with dict of project name to list of projects with that name and error string.
+        """
+        if self.metadata_cache is not None:
+            projects_by_name = self.metadata_cache.get_lookup("projects_by_name")
+            if projects_by_name is not None and project_name in projects_by_name:
+                return projects_by_name, ""
+        projects, error_message = self.__get_all_entities("projects", "get_projects", fields=self.PROJECT_FIELDS)
+        if error_message:
+            return {}, error_message
+        projects_by_name = {}
+        for project in projects:
+            projects_by_name.setdefault(project["name"], []).append(project)
+        if self.metadata_cache is not None:
+            self.metadata_cache.set_lookup("projects_by_name", projects_by_name)
+        return projects_by_name, ""
+
     def check_suite_id(self, project_id: int) -> (bool, str):
         """
         Check if suite from DataProvider exist using get_suites endpoint
@@ -226,10 +286,17 @@ class ApiRequestHandler:
         :returns: Tuple with list missing section ID and error string.
         """
         suite_id = self.suites_data_from_provider.suite_id
-        returned_sections, error_message = self.__get_all_sections(project_id, suite_id)
+        sections_by_name = {}
+        sections_count = 0
+        error_message = ""
+        for page, error_message in self.__get_section_pages(project_id, suite_id):
+            if error_message:
+                break
+            sections_by_name.update((section["name"], section) for section in page)
+            sections_count += len(page)
         if not error_message:
+            self.suite_sections_count = sections_count
             missing_test_sections = False
-            sections_by_name = {section["name"]: section for section in returned_sections}
             section_data = []
             for section in self.suites_data_from_provider.testsections:
                 if section.name in sections_by_name.keys():
@@ -289,27 +356,20 @@ class ApiRequestHandler:
         :returns: Tuple with list test case ID missing and error string.
         """
         suite_id = self.suites_data_from_provider.suite_id
-        returned_cases, error_message = self.__get_all_cases(project_id, suite_id)
+        section_ids = self.__get_scoped_section_ids()
+        if section_ids:
+            test_case_data, missing_cases_number, error_message = self.__match_test_cases(
+                self.__get_section_scoped_case_pages(project_id, suite_id, section_ids)
+            )
+            if not error_message and missing_cases_number:
+                # cases might have been moved to other sections, so whole suite is checked before adding them
+                self.environment.vlog("Cases not found in report sections, checking all cases of the suite.")
+                section_ids = None
+        if not section_ids:
+            test_case_data, missing_cases_number, error_message = self.__match_test_cases(
+                self.__get_case_pages(project_id, suite_id)
+            )
         if not error_message:
-            test_cases_by_aut_id = {}
-            for case in returned_cases:
-                aut_case_id = case["custom_automation_id"]
-                aut_case_id = aut_case_id if not aut_case_id else html.unescape(case["custom_automation_id"])
-                test_cases_by_aut_id[aut_case_id] = case
-            test_case_data = []
-            missing_cases_number = 0
-            for section in self.suites_data_from_provider.testsections:
-                for test_case in section.testcases:
-                    if test_case.custom_automation_id in test_cases_by_aut_id.keys():
-                        case = test_cases_by_aut_id[test_case.custom_automation_id]
-                        test_case_data.append({
-                            "case_id": case["id"],
-                            "section_id": case["section_id"],
-                            "title": case["title"],
-                            "custom_automation_id": test_case.custom_automation_id
-                        })
-                    else:
-                        missing_cases_number += 1
             self.data_provider.update_data(case_data=test_case_data)
             if missing_cases_number:
                 self.environment.log(f"Found test cases not matching any TestRail case (count: {missing_cases_number})")
@@ -317,6 +377,120 @@ class ApiRequestHandler:
         else:
             return False, error_message
 
+    def cache_suite_metadata(self, project_id: int) -> (int, str):
+        """
+        Reads cases of the suite into metadata cache (only changes if suite is cached already),
+        so later upload to the suite can take them from cache. Sections are not cached, they are
+        always read in full.
+        :project_id: project_id
+        :returns: Tuple with number of cached cases and error string.
+        """
+        suite_id = self.suites_data_from_provider.suite_id
+        for _, error_message in self.__get_case_pages(project_id, suite_id):
+            if error_message:
+                return 0, error_message
+        return self.metadata_cache.count(project_id, suite_id, "cases"), ""
+
+    def match_cases_without_suite_lookup(self, run_id: int = None) -> (bool, str):
+        """
+        Fast path for reports with all test cases already identified, which makes checks of sections
+        and cases of the whole suite unnecessary. Empty report is never identified.
+        Without run ID every test case needs case ID from the report (test_id property). Those IDs are
+        not checked against TestRail here (checking them one by one could cost more than reading the suite),
+        stale or foreign case ID is reported by TestRail when run is created or results are added.
+        With run ID test cases are matched with tests of the run by case ID or automation ID
+        and matched case IDs are updated in DataProvider. Tests of the run are kept for upload of attachments.
+        :run_id: run ID provided by user
+        :returns: Tuple with True if all test cases are identified and error string.
+        """
+        test_cases = [case for section in self.suites_data_from_provider.testsections for case in section.testcases]
+        if not test_cases:
+            return False, ""
+        if not run_id:
+            return all(case.case_id is not None for case in test_cases), ""
+        tests, error_message = self.__get_all_entities(
+            'tests', f"get_tests/{run_id}", fields=self.TEST_FIELDS + ("custom_automation_id",)
+        )
+        if error_message:
+            return False, error_message
+        self.__run_case_ids_by_test_id = run_id, {test["id"]: test["case_id"] for test in tests}
+        run_case_ids = {test["case_id"] for test in tests}
+        run_cases_by_aut_id = {
+            html.unescape(test["custom_automation_id"]): test["case_id"]
+            for test in tests
+            if test.get("custom_automation_id")
+        }
+        test_case_data = []
+        for test_case in test_cases:
+            if test_case.case_id is not None:
+                if test_case.case_id not in run_case_ids:
+                    return False, ""
+            elif test_case.custom_automation_id in run_cases_by_aut_id:
+                test_case_data.append({
+                    "case_id": run_cases_by_aut_id[test_case.custom_automation_id],
+                    "section_id": test_case.section_id,
+                    "title": test_case.title,
+                    "custom_automation_id": test_case.custom_automation_id
+                })
+            else:
+                return False, ""
+        self.data_provider.update_data(case_data=test_case_data)
+        return True, ""
+
+    def __match_test_cases(self, case_pages: Iterator[Tuple[List[dict], str]]) -> (List[dict], int, str):
+        """
+        Matches report test cases with TestRail cases by automation ID.
+        :returns: Tuple with case data of matched test cases, number of missing test cases and error string.
+        """
+        test_cases_by_aut_id = {}
+        error_message = ""
+        for page, error_message in case_pages:
+            if error_message:
+                return [], 0, error_message
+            for case in page:
+                aut_case_id = case["custom_automation_id"]
+                aut_case_id = aut_case_id if not aut_case_id else html.unescape(case["custom_automation_id"])
+                test_cases_by_aut_id[aut_case_id] = case
+        test_case_data = []
+        missing_cases_number = 0
+        for section in self.suites_data_from_provider.testsections:
+            for test_case in section.testcases:
+                if test_case.custom_automation_id in test_cases_by_aut_id.keys():
+                    case = test_cases_by_aut_id[test_case.custom_automation_id]
+                    test_case_data.append({
+                        "case_id": case["id"],
+                        "section_id": case["section_id"],
+                        "title": case["title"],
+                        "custom_automation_id": test_case.custom_automation_id
+                    })
+                else:
+                    missing_cases_number += 1
+        return test_case_data, missing_cases_number, error_message
+
+    def __get_scoped_section_ids(self) -> Union[List[int], None]:
+        """
+        Returns TestRail IDs of report sections if cases should be read only from those sections:
+        all report sections exist in TestRail and they are small part of all sections of the suite
+        (SCOPED_CASE_LOOKUP_RATIO), so reading them one by one is cheaper than reading whole suite.
+        Returns None otherwise or if sections of the suite were not checked yet.
+        With metadata cache whole suite is read from the cache.
+        """
+        if self.metadata_cache is not None or not self.suite_sections_count:
+            return None
+        section_ids = {section.section_id for section in self.suites_data_from_provider.testsections}
+        if None in section_ids or not self.is_case_lookup_scoped(len(section_ids), self.suite_sections_count):
+            return None
+        return sorted(section_ids)
+
+    @staticmethod
+    def is_case_lookup_scoped(report_sections_count: int, suite_sections_count: int) -> bool:
+        """
+        Tells if cases of report sections are few enough to be read section by section instead of whole suite.
+        :report_sections_count: number of distinct sections of the report
+        :suite_sections_count: number of all sections of the suite
+        """
+        return 0 < report_sections_count <= suite_sections_count * SCOPED_CASE_LOOKUP_RATIO
+
     def add_cases(self) -> (List[dict], str):
         """
         Add cases that doesn't have ID in DataProvider.
@@ -359,6 +533,45 @@ class ApiRequestHandler:
         ) > 0 else "Update skipped"
         return returned_resources, error_message
 
+    async def add_cases_async(self) -> (List[dict], str):
+        """
+        Asyncio variant of add_cases. Requests are sent by async_client,
+        number of requests in flight is limited by semaphore instead of thread pool.
+        :returns: Tuple with list of dict created resources and error string.
+        """
+        add_case_data = self.data_provider.add_cases()
+        with self.environment.get_progress_bar(
+            results_amount=len(add_case_data["bodies"]), prefix="Adding test cases"
+        ) as progress_bar:
+            async with self.async_client:
+                semaphore = asyncio.Semaphore(self.async_client.concurrency)
+                tasks = {
+                    asyncio.ensure_future(
+                        self.__send_post_async(
+                            semaphore, f"add_case/{body.pop('section_id')}", body
+                        )
+                    ): body
+                    for body in add_case_data["bodies"]
+                }
+                responses, error_message = await self.handle_tasks(
+                    tasks=tasks, action_string="add_case", progress_bar=progress_bar
+                )
+                if error_message:
+                    responses = await ApiRequestHandler.retrieve_results_after_cancelling_tasks(tasks)
+        returned_resources = [
+            {
+                "case_id": response.response_text["id"],
+                "section_id": response.response_text["section_id"],
+                "title": response.response_text["title"],
+                "custom_automation_id": response.response_text["custom_automation_id"]
+            }
+            for response in responses
+        ]
+        self.data_provider.update_data(case_data=returned_resources) if len(
+            returned_resources
+        ) > 0 else "Update skipped"
+        return returned_resources, error_message
+
     def update_case_result(self, run_id, case_id):
         """
         Updates result for case.
@@ -390,71 +603,264 @@ class ApiRequestHandler:
         response = self.client.send_post(f"add_run/{project_id}", add_run_data)
         return response.response_text.get("id"), response.error_message
 
-    def upload_attachments(self, report_results: [dict], results: list[dict], run_id: int):
+    def upload_attachments(self, attachments_for_cases: dict, results: List[dict], run_id: int):
         """ Getting test result id and upload attachments for it. """
-        tests_in_run, error = self.__get_all_tests_in_run(run_id)
+        case_ids_by_test_id, error = self.__get_case_ids_by_test_id(run_id)
         if not error:
-            for report_result in report_results:
-                case_id = report_result["case_id"]
-                test_id = next((test["id"] for test in tests_in_run if test["case_id"] == case_id), None)
-                result_id = next((result["id"] for result in results if result["test_id"] == test_id), None)
-                for file_path in report_result.get("attachments"):
-                    try:
-                        with open(file_path, "rb") as file:
-                            self.client.send_post(f"add_attachment_to_result/{result_id}", files={"attachment": file})
-                    except Exception as ex:
-                        self.environment.elog(f"Error uploading attachment for case {case_id}: {ex}")
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS_ADD_ATTACHMENTS) as executor:
+                self.__submit_attachments(executor, attachments_for_cases, results, case_ids_by_test_id)
         else:
             self.environment.elog(f"Unable to upload attachments due to API request error: {error}")
 
+    def __submit_attachments(
+        self,
+        executor: ThreadPoolExecutor,
+        attachments_for_cases: dict,
+        results: List[dict],
+        case_ids_by_test_id: dict,
+    ):
+        """Submits upload of attachments of added results to attachments worker pool."""
+        for result in results:
+            case_id = case_ids_by_test_id.get(result["test_id"])
+            for file_path in attachments_for_cases.get(case_id, []):
+                executor.submit(self.__upload_attachment, case_id, result["id"], file_path)
+
+    def __upload_attachment(self, case_id: int, result_id: int, file_path):
+        try:
+            with open(file_path, "rb") as file:
+                self.attachment_client.send_post(f"add_attachment_to_result/{result_id}", files={"attachment": file})
+        except Exception as ex:
+            self.environment.elog(f"Error uploading attachment for case {case_id}: {ex}")
+
+    def __upload_batch_attachments_async(
+        self,
+        semaphore: asyncio.Semaphore,
+        attachments_for_cases: dict,
+        results: List[dict],
+        case_ids_by_test_id: dict,
+    ) -> List[asyncio.Task]:
+        """Asyncio counterpart of __submit_attachments, returns tasks uploading attachments of added results."""
+        tasks = []
+        for result in results:
+            case_id = case_ids_by_test_id.get(result["test_id"])
+            for file_path in attachments_for_cases.get(case_id, []):
+                tasks.append(
+                    asyncio.ensure_future(self.__upload_attachment_async(semaphore, case_id, result["id"], file_path))
+                )
+        return tasks
+
+    async def __upload_attachment_async(self, semaphore: asyncio.Semaphore, case_id: int, result_id: int, file_path):
+        try:
+            # file is opened only when upload starts, so at most concurrency files are open at once
+            async with semaphore:
+                with open(file_path, "rb") as file:
+                    await self.attachment_async_client.send_post(
+                        f"add_attachment_to_result/{result_id}", files={"attachment": file}
+                    )
+        except Exception as ex:
+            self.environment.elog(f"Error uploading attachment for case {case_id}: {ex}")
+
+    def __get_attachment_async_client(self) -> AsyncAPIClient:
+        """
+        Returns asyncio client of attachment_client (its bandwidth limit, request policies and traffic statistics)
+        with own connection pool sized to attachment workers, so uploads do not take connections of results.
+        """
+        if self.attachment_async_client is None:
+            self.attachment_async_client = AsyncAPIClient(
+                self.attachment_client, concurrency=MAX_WORKERS_ADD_ATTACHMENTS, transport=self.async_client.transport
+            )
+        return self.attachment_async_client
+
+    def __get_case_ids_by_test_id(self, run_id: int) -> (dict, str):
+        """Get case IDs of tests in run by test ID, tests already read by fast path are not read again."""
+        cached_run_id, case_ids_by_test_id = self.__run_case_ids_by_test_id
+        if cached_run_id == run_id:
+            return case_ids_by_test_id, ""
+        tests, error_message = self.__get_all_tests_in_run(run_id)
+        return {test["id"]: test["case_id"] for test in tests}, error_message
+
+    def __get_case_ids_for_attachments(self, run_id: int, attachments_for_cases: dict) -> Union[dict, None]:
+        """
+        Reads tests of the run once, before results are sent (so results workers are not blocked),
+        and only when some results have attachments. Returns None when attachments can't be uploaded.
+        """
+        if not attachments_for_cases:
+            return None
+        case_ids_by_test_id, error = self.__get_case_ids_by_test_id(run_id)
+        if error:
+            self.environment.elog(f"Unable to upload attachments due to API request error: {error}")
+            return None
+        return case_ids_by_test_id
+
     def add_results(self, run_id: int) -> (dict, str):
         """
         Adds one or more new test results.
+        Results bodies are created lazily, batch by batch, and only RESULTS_BATCHES_IN_FLIGHT of them
+        are submitted at once, so memory used by request bodies doesn't grow with report size.
+        Attachments of results are uploaded on separate worker pool as soon as their results batch is added.
         :run_id: run id
         :returns: Tuple with dict created resources and error string.
         """
+        results_amount = self.data_provider.results_for_cases_amount()
+        attachments_for_cases = self.data_provider.attachments_for_cases()
+        case_ids_by_test_id = self.__get_case_ids_for_attachments(run_id, attachments_for_cases)
+
+        with self.environment.get_progress_bar(
+            results_amount=results_amount, prefix="Adding results"
+        ) as progress_bar, ThreadPoolExecutor(max_workers=MAX_WORKERS_ADD_ATTACHMENTS) as attachments_executor:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS_ADD_RESULTS) as executor:
+                responses, error_message = self.__send_results_batches(
+                    executor,
+                    run_id,
+                    self.data_provider.iter_results_for_cases(self.environment.batch_size),
+                    progress_bar,
+                    on_done=(
+                        lambda done: self.__submit_batch_attachments(
+                            attachments_executor, done, attachments_for_cases, case_ids_by_test_id
+                        )
+                    )
+                    if case_ids_by_test_id is not None
+                    else None,
+                )
+        responses = [response.response_text for response in responses]
+        return responses, error_message, progress_bar.n
+
+    def __send_results_batches(
+        self,
+        executor: ThreadPoolExecutor,
+        run_id: int,
+        bodies: Iterator[dict],
+        progress_bar,
+        on_done: Callable = None,
+    ) -> (List[APIClientResult], str):
+        """
+        Sends results bodies taken from bodies iterator, keeping up to RESULTS_BATCHES_IN_FLIGHT requests
+        submitted (so workers never wait for next body). On error or interruption requests which were not
+        started yet are cancelled and responses of already added batches are returned with error message.
+        """
         responses = []
         error_message = ""
-        add_results_data_chunks = self.data_provider.add_results_for_cases(
-            self.environment.batch_size
-        )
-        results_amount = sum(
-            [len(results["results"]) for results in add_results_data_chunks]
-        )
+        in_flight = {}
+        try:
+            while True:
+                for body in islice(bodies, RESULTS_BATCHES_IN_FLIGHT - len(in_flight)):
+                    future = executor.submit(self.client.send_post, f"add_results_for_cases/{run_id}", body)
+                    if on_done is not None:
+                        future.add_done_callback(on_done)
+                    in_flight[future] = len(body["results"])
+                if not in_flight:
+                    progress_bar.set_postfix_str(s="Done.")
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results_count = in_flight.pop(future)
+                    response = future.result()
+                    if response.error_message:
+                        error_message = response.error_message
+                        break
+                    responses.append(response)
+                    progress_bar.update(results_count)
+                if error_message:
+                    self.environment.log("\nError during add_results. Trying to cancel scheduled tasks.")
+                    self.__cancel_running_futures(in_flight, "add_results")
+                    responses.extend(ApiRequestHandler.retrieve_results_after_cancelling(in_flight))
+                    break
+        except KeyboardInterrupt:
+            self.__cancel_running_futures(in_flight, "add_results")
+            raise KeyboardInterrupt
+        return responses, error_message
 
+    def __submit_batch_attachments(
+        self, executor: ThreadPoolExecutor, future: Future, attachments_for_cases: dict, case_ids_by_test_id: dict
+    ):
+        """Submits attachments of successfully added results batch to attachments worker pool."""
+        if future.cancelled() or future.exception() is not None or future.result().error_message:
+            return
+        self.__submit_attachments(executor, attachments_for_cases, future.result().response_text, case_ids_by_test_id)
+
+    async def add_results_async(self, run_id: int) -> (dict, str):
+        """
+        Asyncio variant of add_results. Requests are sent by async_client,
+        number of requests in flight is limited by semaphore instead of thread pool
+        and bodies are created lazily, at most twice the concurrency at once.
+        Attachments of results are uploaded through asyncio client of attachment_client as soon as
+        their results batch is added, with number of uploads in flight limited by separate semaphore.
+        :run_id: run id
+        :returns: Tuple with dict created resources and error string.
+        """
+        results_amount = self.data_provider.results_for_cases_amount()
+        attachments_for_cases = self.data_provider.attachments_for_cases()
+        case_ids_by_test_id = self.__get_case_ids_for_attachments(run_id, attachments_for_cases)
+        uploads = []
         with self.environment.get_progress_bar(
             results_amount=results_amount, prefix="Adding results"
         ) as progress_bar:
-            with ThreadPoolExecutor(max_workers=MAX_WORKERS_ADD_RESULTS) as executor:
-                futures = {
-                    executor.submit(
-                        self.client.send_post, f"add_results_for_cases/{run_id}", body
-                    ): body
-                    for body in add_results_data_chunks
-                }
-                responses, error_message = self.handle_futures(
-                    futures=futures,
-                    action_string="add_results",
-                    progress_bar=progress_bar,
+            async with AsyncExitStack() as clients:
+                await clients.enter_async_context(self.async_client)
+                on_done = None
+                if case_ids_by_test_id is not None:
+                    attachment_client = await clients.enter_async_context(self.__get_attachment_async_client())
+                    semaphore = asyncio.Semaphore(attachment_client.concurrency)
+
+                    def on_done(response: APIClientResult):
+                        uploads.extend(
+                            self.__upload_batch_attachments_async(
+                                semaphore, attachments_for_cases, response.response_text, case_ids_by_test_id
+                            )
+                        )
+
+                responses, error_message = await self.__send_results_batches_async(
+                    run_id,
+                    self.data_provider.iter_results_for_cases(self.environment.batch_size),
+                    progress_bar,
+                    on_done=on_done,
                 )
-            if error_message:
-                # When error_message is present we cannot be sure that responses contains all added items.
-                # Iterate through futures to get all responses from done tasks (not cancelled)
-                responses = ApiRequestHandler.retrieve_results_after_cancelling(futures)
+                await asyncio.gather(*uploads)
         responses = [response.response_text for response in responses]
-        results = [
-            result
-            for results_list in responses
-            for result in results_list
-        ]
-        report_results_w_attachments = []
-        for results_data_chunk in add_results_data_chunks:
-            for test_result in results_data_chunk["results"]:
-                if test_result["attachments"]:
-                    report_results_w_attachments.append(test_result)
-        self.upload_attachments(report_results_w_attachments, results, run_id)
         return responses, error_message, progress_bar.n
 
+    async def __send_results_batches_async(
+        self, run_id: int, bodies: Iterator[dict], progress_bar, on_done: Callable = None
+    ) -> (List[APIClientResult], str):
+        """
+        Asyncio counterpart of __send_results_batches, up to twice the concurrency of tasks is created at once.
+        on_done is called with response of every added results batch.
+        """
+        semaphore = asyncio.Semaphore(self.async_client.concurrency)
+        responses = []
+        error_message = ""
+        in_flight = {}
+        while True:
+            for body in islice(bodies, 2 * self.async_client.concurrency - len(in_flight)):
+                task = asyncio.ensure_future(
+                    self.__send_post_async(semaphore, f"add_results_for_cases/{run_id}", body)
+                )
+                in_flight[task] = len(body["results"])
+            if not in_flight:
+                progress_bar.set_postfix_str(s="Done.")
+                break
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                results_count = in_flight.pop(task)
+                response = task.result()
+                if response.error_message:
+                    error_message = response.error_message
+                    break
+                responses.append(response)
+                if on_done is not None:
+                    on_done(response)
+                progress_bar.update(results_count)
+            if error_message:
+                self.environment.log("\nError during add_results. Trying to cancel scheduled tasks.")
+                self.__cancel_waiting_tasks(in_flight, "add_results")
+                added = await ApiRequestHandler.retrieve_results_after_cancelling_tasks(in_flight)
+                if on_done is not None:
+                    for response in added:
+                        on_done(response)
+                responses.extend(added)
+                break
+        return responses, error_message
+
     def handle_futures(self, futures, action_string, progress_bar):
         responses = []
         error_message = ""
@@ -489,6 +895,40 @@ class ApiRequestHandler:
             raise KeyboardInterrupt
         return responses, error_message
 
+    async def handle_tasks(self, tasks: dict, action_string, progress_bar):
+        """Asyncio counterpart of handle_futures."""
+        responses = []
+        error_message = ""
+        pending = set(tasks)
+        while pending and not error_message:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                arguments = tasks[task]
+                response = task.result()
+                if not response.error_message:
+                    responses.append(response)
+                    if action_string == "add_results":
+                        progress_bar.update(len(arguments["results"]))
+                    else:
+                        if not self.response_verifier.verify_returned_data(
+                            arguments, response.response_text
+                        ):
+                            responses.append(response)
+                            error_message = FAULT_MAPPING["data_verification_error"]
+                            self.__cancel_waiting_tasks(tasks, action_string)
+                            break
+                        progress_bar.update(1)
+                else:
+                    error_message = response.error_message
+                    self.environment.log(
+                        f"\nError during {action_string}. Trying to cancel scheduled tasks."
+                    )
+                    self.__cancel_waiting_tasks(tasks, action_string)
+                    break
+        if not error_message:
+            progress_bar.set_postfix_str(s="Done.")
+        return responses, error_message
+
     def close_run(self, run_id: int) -> (dict, str):
         """
         Closes an existing test run and archives its tests & results.
@@ -556,6 +996,26 @@ class ApiRequestHandler:
                     responses.append(response)
         return responses
 
+    @staticmethod
+    async def retrieve_results_after_cancelling_tasks(tasks):
+        await asyncio.gather(*tasks, return_exceptions=True)
+        responses = []
+        for task in tasks:
+            if not task.cancelled() and task.exception() is None:
+                response = task.result()
+                if not response.error_message:
+                    responses.append(response)
+        return responses
+
+    async def __send_post_async(self, semaphore: asyncio.Semaphore, uri: str, payload: dict = None):
+        async with semaphore:
+            task = asyncio.current_task()
+            self.__sending_tasks.add(task)
+            try:
+                return await self.async_client.send_post(uri, payload)
+            finally:
+                self.__sending_tasks.discard(task)
+
     def __cancel_running_futures(self, futures, action_string):
         self.environment.log(
             f"\nAborting: {action_string}. Trying to cancel scheduled tasks."
@@ -563,43 +1023,196 @@ class ApiRequestHandler:
         for future in futures:
             future.cancel()
 
-    def __get_all_cases(self, project_id=None, suite_id=None) -> (List[dict], str):
+    def __cancel_waiting_tasks(self, tasks, action_string):
         """
-        Get all cases from all pages
+        Asyncio counterpart of __cancel_running_futures. Like Future.cancel() in thread pool, only tasks
+        still waiting for semaphore are cancelled. Requests being sent are let finish, so resources
+        they add are returned and can be rolled back.
         """
-        url = f"get_cases/{project_id}&suite_id={suite_id}"
-        return self.__get_all_entities('cases', f"get_cases/{project_id}&suite_id={suite_id}")
+        self.environment.log(
+            f"\nAborting: {action_string}. Trying to cancel scheduled tasks."
+        )
+        for task in tasks:
+            if task not in self.__sending_tasks:
+                task.cancel()
 
-    def __get_all_sections(self, project_id=None, suite_id=None) -> (List[dict], str):
+    def __get_case_pages(self, project_id=None, suite_id=None) -> Iterator[Tuple[List[dict], str]]:
         """
-        Get all sections from all pages
+        Get cases page by page
         """
-        return self.__get_all_entities('sections', f"get_sections/{project_id}&suite_id={suite_id}")
+        link = f"get_cases/{project_id}&suite_id={suite_id}"
+        if self.metadata_cache is not None:
+            return self.__get_cached_pages('cases', link, self.CASE_FIELDS, project_id, suite_id)
+        return self.__get_entity_pages('cases', link, fields=self.CASE_FIELDS)
+
+    def __get_section_scoped_case_pages(
+        self, project_id: int, suite_id: int, section_ids: List[int]
+    ) -> Iterator[Tuple[List[dict], str]]:
+        """
+        Get cases of given sections, sections are read in parallel (up to MAX_WORKERS_GET_PAGES at once)
+        and yielded in order, one section at a time. Pages of each section are read one by one, so no more
+        than MAX_WORKERS_GET_PAGES requests are in flight and all of them fit in the connection pool.
+        """
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS_GET_PAGES) as executor:
+            futures = [
+                executor.submit(
+                    self.__get_all_entities,
+                    'cases',
+                    f"get_cases/{project_id}&suite_id={suite_id}&section_id={section_id}",
+                    self.CASE_FIELDS,
+                    parallel=False,
+                )
+                for section_id in section_ids
+            ]
+            try:
+                for future in futures:
+                    cases, error_message = future.result()
+                    yield cases, error_message
+                    if error_message:
+                        return
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def __get_section_pages(self, project_id=None, suite_id=None) -> Iterator[Tuple[List[dict], str]]:
+        """
+        Get sections page by page.
+        Sections are read in full also with metadata cache: they have no updated_on, so renamed
+        or recreated sections could be detected only by reading all of them anyway.
+        """
+        link = f"get_sections/{project_id}&suite_id={suite_id}"
+        return self.__get_entity_pages('sections', link, fields=self.SECTION_FIELDS)
+
+    def __get_cached_pages(
+        self, entity: str, link: str, fields, project_id: int, suite_id: int
+    ) -> Iterator[Tuple[List[dict], str]]:
+        """
+        Yields entities (cases) from metadata cache refreshed incrementally. Entities updated since previous
+        upload are read with updated_after filter and number of entities is compared with TestRail by reading
+        at most two entities at the end of expected list, which detects deleted (or moved) entities.
+        Falls back to full fetch, which refreshes the cache, if suite was not cached yet or cache is outdated.
+        """
+        cached, updated_after = self.metadata_cache.get(project_id, suite_id, entity)
+        if cached is not None:
+            if updated_after is not None:
+                updated, error_message = self.__get_all_entities(
+                    entity, f"{link}&updated_after={updated_after - 1}", fields
+                )
+                if error_message:
+                    yield [], error_message
+                    return
+                self.metadata_cache.update(project_id, suite_id, entity, updated)
+            expected_total = self.metadata_cache.count(project_id, suite_id, entity)
+            if self.__entities_count_matches(entity, link, expected_total):
+                self.environment.vlog(f"Using {expected_total} cached {entity}.")
+                yield self.metadata_cache.get(project_id, suite_id, entity)[0], ""
+                return
+            self.environment.vlog(f"Cached {entity} are outdated, reading all {entity}.")
+        entities = []
+        for page, error_message in self.__get_entity_pages(entity, link, fields):
+            if error_message:
+                yield [], error_message
+                return
+            entities.extend(page)
+            yield page, ""
+        self.metadata_cache.replace(project_id, suite_id, entity, entities)
+
+    def __entities_count_matches(self, entity: str, link: str, expected_total: int) -> bool:
+        """Checks if TestRail has exactly expected_total entities, reading at most two of them."""
+        response = self.client.send_get(
+            f"{link}&offset={max(expected_total - 1, 0)}&limit=2", entity=entity, fields=("id",)
+        )
+        # Endpoints without pagination (legacy) return all entities, so count can't be checked cheaply
+        if response.error_message or not isinstance(response.response_text, dict):
+            return False
+        return len(response.response_text[entity]) == min(expected_total, 1)
 
     def __get_all_tests_in_run(self, run_id=None) -> (List[dict], str):
         """
         Get all tests from all pages
         """
-        return self.__get_all_entities('tests', f"get_tests/{run_id}")
+        return self.__get_all_entities('tests', f"get_tests/{run_id}", fields=self.TEST_FIELDS)
 
-    def __get_all_entities(self, entity: str, link=None, entities=[]) -> (List[dict], str):
+    def __get_all_entities(self, entity: str, link=None, fields=None, parallel: bool = True) -> (List[dict], str):
         """
         Get all entities from all pages if number of entities is too big to return in single response.
-        Function using next page field in API response.
         Entity examples: cases, sections
         """
-        if link.startswith(self.suffix):
-            link = link.replace(self.suffix, "")
-        response = self.client.send_get(link)
-        if not response.error_message:
+        entities = []
+        for page, error_message in self.__get_entity_pages(entity, link, fields, parallel):
+            if error_message:
+                return [], error_message
+            entities.extend(page)
+        return entities, ""
+
+    def __get_entity_pages(
+        self, entity: str, link=None, fields=None, parallel: bool = True
+    ) -> Iterator[Tuple[List[dict], str]]:
+        """
+        Yields entities page by page as they arrive, so callers can process pages without keeping
+        whole response list in memory. Yields ([], error_message) and stops on first failed request.
+        When first page reports its page size (limit), remaining pages are fetched in parallel,
+        otherwise (or when parallel is not set, e.g. for callers already running in worker pool)
+        next page field in API response is followed.
+        Entity examples: cases, sections
+        :fields: when given only those fields of each entity are decoded, which lowers memory usage
+        for suites with many cases and large custom fields
+        """
+        first_link = link
+        while link is not None:
+            if link.startswith(self.suffix):
+                link = link.replace(self.suffix, "")
+            response = self.client.send_get(link, entity=entity, fields=fields, hedge=True)
+            if response.error_message:
+                yield [], response.error_message
+                return
             # Endpoints without pagination (legacy)
             if isinstance(response.response_text, list):
-                return response.response_text, response.error_message
+                yield response.response_text, ""
+                return
             # Endpoints with pagination
-            entities = entities + response.response_text[entity]
-            if response.response_text["_links"]["next"] is not None:
-                return self.__get_all_entities(entity, link=response.response_text["_links"]["next"], entities=entities)
-            else:
-                return entities, response.error_message
-        else:
-            return [], response.error_message
+            page = response.response_text
+            yield page[entity], ""
+            link = page.get("_links", {}).get("next")
+            limit = page.get("limit")
+            if link is not None and limit and parallel:
+                yield from self.__get_pages_in_parallel(
+                    entity, first_link, fields, page.get("offset", 0) + limit, limit
+                )
+                return
+
+    def __get_pages_in_parallel(
+        self, entity: str, link: str, fields, offset: int, limit: int
+    ) -> Iterator[Tuple[List[dict], str]]:
+        """
+        Fetches pages starting at offset using explicit offset and limit, keeping up to
+        MAX_WORKERS_GET_PAGES requests in flight and yielding pages in order.
+        Total number of entities is not known, so next pages are requested speculatively
+        until a page shorter than limit (or without next page link) is received.
+        """
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS_GET_PAGES) as executor:
+            try:
+                while True:
+                    while len(pending) < MAX_WORKERS_GET_PAGES:
+                        pending.append(
+                            executor.submit(
+                                self.client.send_get,
+                                f"{link}&limit={limit}&offset={offset}",
+                                entity=entity,
+                                fields=fields,
+                                hedge=True,
+                            )
+                        )
+                        offset += limit
+                    response = pending.popleft().result()
+                    if response.error_message:
+                        yield [], response.error_message
+                        return
+                    entities = response.response_text[entity]
+                    yield entities, ""
+                    if len(entities) < limit or response.response_text["_links"]["next"] is None:
+                        return
+            finally:
+                for future in pending:
+                    future.cancel()
@@ -0,0 +1,82 @@
+import asyncio
+from pathlib import Path
+
+try:
+    import httpx
+except ImportError:  # optional dependency, installed with: pip install trcli[async]
+    httpx = None
+
+from trcli.api.api_client import APIClient, APIClientResult, RequestAttempts
+from trcli.api.http2_session import to_requests_exception
+from trcli.settings import DEFAULT_ASYNC_CONCURRENCY
+
+
+class AsyncAPIClient:
+    """
+    Asyncio counterpart of APIClient. Lets a single thread keep many requests in flight.
+    Host, credentials, request policies, traffic statistics and logging are taken from the wrapped APIClient,
+    requests are sent with the same retry loop (RequestAttempts).
+    Connections are kept alive only inside of `async with` block.
+    """
+
+    def __init__(
+        self,
+        api_client: APIClient,
+        concurrency: int = DEFAULT_ASYNC_CONCURRENCY,
+        transport=None,
+    ):
+        self.api_client = api_client
+        self.concurrency = concurrency
+        self.transport = transport
+        self.__session = None
+
+    @staticmethod
+    def is_available() -> bool:
+        """Checks if optional httpx dependency is installed."""
+        return httpx is not None
+
+    async def __aenter__(self):
+        self.__session = httpx.AsyncClient(
+            verify=self.api_client.verify,
+            timeout=self.api_client.timeout,
+            http2=self.api_client.http2,
+            headers={"User-Agent": APIClient.USER_AGENT},
+            transport=self.transport,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.__session.aclose()
+        self.__session = None
+
+    async def send_get(self, uri: str) -> APIClientResult:
+        """
+        Sends GET request to host specified by host_name.
+        Retries are handled the same way as in APIClient.send_get.
+        """
+        return await self.__send_request("GET", uri, None)
+
+    async def send_post(self, uri: str, payload: dict = None, files: {str: Path} = None) -> APIClientResult:
+        """
+        Sends POST request to host specified by host_name.
+        Retries are handled the same way as in APIClient.send_post.
+        """
+        return await self.__send_request("POST", uri, payload, files)
+
+    async def __send_request(self, method: str, uri: str, payload: dict, files: {str: Path} = None) -> APIClientResult:
+        url = self.api_client.url + uri
+        auth = (self.api_client.username, self.api_client.get_password())
+
+        async def send(body: bytes, headers: dict):
+            try:
+                if method == "POST":
+                    return await self.__session.post(url, auth=auth, content=body, headers=headers, files=files)
+                return await self.__session.get(url, auth=auth)
+            except httpx.RequestError as e:
+                raise to_requests_exception(e) from e
+
+        return await RequestAttempts(self.api_client, method, uri, payload, files).run_async(send, asyncio.sleep)
@@ -0,0 +1,71 @@
+from threading import Lock
+from time import monotonic
+from typing import Callable
+
+from trcli.constants import CircuitBreakerState
+from trcli.settings import DEFAULT_CIRCUIT_BREAKER_THRESHOLD, DEFAULT_CIRCUIT_BREAKER_RECOVERY_TIME
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests when TestRail instance stops responding, shared by all workers.
+    failure_threshold - number of consecutive connection errors or timeouts after which circuit opens
+    recovery_time - time in seconds after which single probe request is let through open circuit
+    While circuit is open requests fail immediately instead of waiting for timeouts.
+    Successful probe closes the circuit, failed one opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+        recovery_time: float = DEFAULT_CIRCUIT_BREAKER_RECOVERY_TIME,
+        logging_function: Callable = print,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.logging_function = logging_function
+        self.state = CircuitBreakerState.closed
+        self.consecutive_failures = 0
+        self.__opened_at = 0.0
+        self.__lock = Lock()
+
+    def allow_request(self) -> bool:
+        """Checks if request can be sent. Lets single probe request through after recovery_time."""
+        with self.__lock:
+            if self.state == CircuitBreakerState.closed:
+                return True
+            if monotonic() - self.__opened_at < self.recovery_time:
+                return False
+            # probe request, others are rejected until it finishes or recovery_time passes again
+            self.__opened_at = monotonic()
+            self.__change_state(CircuitBreakerState.half_open)
+            return True
+
+    def record_success(self):
+        with self.__lock:
+            self.consecutive_failures = 0
+            self.__change_state(CircuitBreakerState.closed)
+
+    def record_failure(self):
+        with self.__lock:
+            self.consecutive_failures += 1
+            if self.state == CircuitBreakerState.half_open or (
+                self.state == CircuitBreakerState.closed
+                and self.consecutive_failures >= self.failure_threshold
+            ):
+                self.__opened_at = monotonic()
+                self.__change_state(CircuitBreakerState.open)
+
+    def __change_state(self, state: CircuitBreakerState):
+        if state == self.state:
+            return
+        self.state = state
+        if state == CircuitBreakerState.open:
+            self.logging_function(
+                f"\nCircuit breaker opened after {self.consecutive_failures} consecutive network errors or timeouts. "
+                f"Requests will fail immediately, next attempt in {self.recovery_time} secs."
+            )
+        elif state == CircuitBreakerState.half_open:
+            self.logging_function("\nCircuit breaker half-open, sending probe request.")
+        else:
+            self.logging_function("\nCircuit breaker closed, TestRail instance is responding again.")
@@ -0,0 +1,53 @@
+import math
+from collections import deque
+from threading import Lock
+from typing import Union
+
+from trcli.settings import (
+    DEFAULT_HEDGE_PERCENTILE,
+    DEFAULT_HEDGE_MIN_SAMPLES,
+    DEFAULT_HEDGE_WINDOW,
+)
+
+
+class HedgingPolicy:
+    """
+    Decides when duplicate (hedged) GET request should be sent if the first one is not answered yet.
+    percentile - hedge is sent after latency percentile of earlier requests (95 means 5% slowest requests are hedged)
+    min_samples - number of latencies needed before hedging starts
+    window - number of latest latencies taken into account
+    hedges_sent - number of duplicate requests sent
+    hedges_won - number of duplicate requests answered before the original one
+    """
+
+    def __init__(
+        self,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        min_samples: int = DEFAULT_HEDGE_MIN_SAMPLES,
+        window: int = DEFAULT_HEDGE_WINDOW,
+    ):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.__latencies = deque(maxlen=window)
+        self.__lock = Lock()
+
+    def record_latency(self, seconds: float):
+        with self.__lock:
+            self.__latencies.append(seconds)
+
+    def get_delay(self) -> Union[float, None]:
+        """Returns time in seconds after which hedge should be sent or None if there are not enough samples yet."""
+        with self.__lock:
+            if len(self.__latencies) < self.min_samples:
+                return None
+            latencies = sorted(self.__latencies)
+        index = min(len(latencies) - 1, math.ceil(len(latencies) * self.percentile / 100) - 1)
+        return latencies[max(index, 0)]
+
+    def record_hedge(self, won: bool):
+        with self.__lock:
+            self.hedges_sent += 1
+            if won:
+                self.hedges_won += 1
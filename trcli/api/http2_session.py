@@ -0,0 +1,97 @@
+import asyncio
+from threading import Lock, Thread
+
+from requests.exceptions import RequestException, Timeout, ConnectionError, ConnectTimeout
+
+try:
+    import httpx
+    import h2  # noqa: F401 required by httpx for HTTP/2 support
+except ImportError:  # optional dependency, installed with: pip install trcli[http2]
+    httpx = None
+
+
+def to_requests_exception(error: "httpx.RequestError") -> RequestException:
+    """Translates httpx exception to requests one, so APIClient error handling applies to httpx transports."""
+    if isinstance(error, httpx.ConnectTimeout):
+        return ConnectTimeout(error)
+    if isinstance(error, httpx.TimeoutException):
+        return Timeout(error)
+    if isinstance(error, httpx.NetworkError):
+        return ConnectionError(error)
+    return RequestException(error, request=error.request)
+
+
+class Http2Session:
+    """
+    Drop-in replacement for requests.Session used by APIClient to send requests over HTTP/2.
+    Concurrent requests from all worker threads are multiplexed as streams over one connection.
+    Sync httpx client is not safe to share between threads sending concurrent streams (streams
+    are opened out of order and rejected by server), so requests of all workers are sent
+    by single httpx.AsyncClient running on event loop in its own thread.
+    HTTP/2 is negotiated using ALPN for https hosts, falling back to HTTP/1.1 if server does not support it.
+    Plain http hosts are sent requests over HTTP/1.1, as HTTP/2 without TLS needs prior knowledge
+    of server support and fails against HTTP/1.1 servers.
+    httpx exceptions are translated to requests exceptions, so APIClient error handling stays the same.
+    """
+
+    def __init__(self, verify: bool = True, pool_size: int = 1):
+        self.__requests = 0
+        self.__connections = 0
+        self.__lock = Lock()
+        self.__loop = asyncio.new_event_loop()
+        self.__thread = Thread(target=self.__loop.run_forever, name="trcli-http2", daemon=True)
+        self.__thread.start()
+        self.__client = httpx.AsyncClient(http2=True, verify=verify, limits=httpx.Limits(max_connections=pool_size))
+
+    @staticmethod
+    def is_available() -> bool:
+        """Checks if optional httpx and h2 dependencies are installed."""
+        return httpx is not None
+
+    def get(self, url: str, auth=None, json=None, timeout=None, headers=None, **kwargs):
+        return self.__send("GET", url, auth=auth, json=json, timeout=timeout, headers=headers)
+
+    def post(self, url: str, auth=None, data=None, json=None, timeout=None, headers=None, files=None, **kwargs):
+        return self.__send(
+            "POST", url, auth=auth, content=data, json=json, timeout=timeout, headers=headers, files=files
+        )
+
+    def connection_stats(self) -> (int, int):
+        """Returns number of requests sent and connections opened."""
+        return self.__requests, self.__connections
+
+    def close(self):
+        if self.__loop.is_closed():
+            return
+        self.__run(self.__client.aclose())
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join()
+        self.__loop.close()
+
+    def __run(self, coroutine):
+        """Runs coroutine on event loop of the session and waits for its result in calling thread."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.__loop).result()
+
+    def __send(self, method: str, url: str, auth, timeout, **kwargs):
+        if auth is not None:
+            auth = (auth.username, auth.password)
+        with self.__lock:
+            self.__requests += 1
+        try:
+            return self.__run(
+                self.__client.request(
+                    method,
+                    url,
+                    auth=auth,
+                    timeout=timeout,
+                    extensions={"trace": self.__trace},
+                    **kwargs,
+                )
+            )
+        except httpx.RequestError as e:
+            raise to_requests_exception(e) from e
+
+    async def __trace(self, event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            with self.__lock:
+                self.__connections += 1
@@ -0,0 +1,167 @@
+import json
+from typing import Any, Iterable, Iterator, Tuple, Union
+
+from trcli.settings import DEFAULT_STREAMING_DECODE_THRESHOLD
+
+try:
+    import orjson
+except ImportError:  # optional dependency, installed with: pip install trcli[fast-json]
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional dependency, installed with: pip install trcli[streaming]
+    ijson = None
+
+
+class JsonCodec:
+    """
+    Encodes request bodies to bytes and decodes response bodies, using standard library json module.
+    Bodies are encoded once per request, so retries send the same bytes again.
+    """
+
+    name = "json"
+    streaming_threshold = DEFAULT_STREAMING_DECODE_THRESHOLD
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def loads(data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def loads_projected(self, data: Union[bytes, str], entity: str, fields: Iterable[str]) -> Any:
+        """
+        Decodes (paginated) response keeping only given fields of each entity,
+        e.g. only id and title of every case in get_cases response.
+        Other keys of paginated response (_links, offset, etc.) are decoded as usual.
+        Responses bigger than streaming_threshold (e.g. all cases returned at once by TestRail versions
+        without pagination) are decoded incrementally with optional ijson package and skipped fields
+        (e.g. large custom text fields) are discarded as they are parsed, so the whole response
+        is never held in memory as Python objects.
+        Smaller responses (single pages) are decoded in full and projected afterwards, which is faster.
+        """
+        fields = frozenset(fields)
+        if ijson is None or len(data) < self.streaming_threshold:
+            return project(self.loads(data), entity, fields)
+        try:
+            return _ProjectedDecoder(entity, fields).decode(data)
+        except ijson.JSONError as e:
+            raise ValueError(e) from e
+
+
+class OrjsonCodec(JsonCodec):
+    """JsonCodec backed by optional orjson package, several times faster on large result batches."""
+
+    name = "orjson"
+
+    @staticmethod
+    def is_available() -> bool:
+        """Checks if optional orjson dependency is installed."""
+        return orjson is not None
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    @staticmethod
+    def loads(data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+def project(response: Any, entity: str, fields: frozenset) -> Any:
+    """Keeps only given fields of each entity in already decoded (paginated) response."""
+    if isinstance(response, list):
+        return [_project_item(item, fields) for item in response]
+    if isinstance(response, dict) and isinstance(response.get(entity), list):
+        return {**response, entity: [_project_item(item, fields) for item in response[entity]]}
+    return response
+
+
+def _project_item(item: Any, fields: frozenset) -> Any:
+    if isinstance(item, dict):
+        return {key: value for key, value in item.items() if key in fields}
+    return item
+
+
+class _ProjectedDecoder:
+    """Builds projected response from ijson basic_parse events."""
+
+    def __init__(self, entity: str, fields: frozenset):
+        self.entity = entity
+        self.fields = fields
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        events = ijson.basic_parse(data, use_float=True)
+        event, value = next(events)
+        if event == "start_array":
+            return self.__build_items(events)
+        if event != "start_map":
+            return value
+        response = {}
+        for event, key in events:
+            if event == "end_map":
+                break
+            event, value = next(events)
+            if key == self.entity and event == "start_array":
+                response[key] = self.__build_items(events)
+            else:
+                response[key] = self.__build(events, event, value)
+        return response
+
+    def __build_items(self, events: Iterator[Tuple[str, Any]]) -> list:
+        items = []
+        for event, value in events:
+            if event == "end_array":
+                break
+            if event != "start_map":
+                items.append(self.__build(events, event, value))
+                continue
+            item = {}
+            for event, key in events:
+                if event == "end_map":
+                    break
+                event, value = next(events)
+                if key in self.fields:
+                    item[key] = self.__build(events, event, value)
+                else:
+                    self.__skip(events, event)
+            items.append(item)
+        return items
+
+    def __build(self, events: Iterator[Tuple[str, Any]], event: str, value: Any) -> Any:
+        if event == "start_map":
+            obj = {}
+            for event, key in events:
+                if event == "end_map":
+                    break
+                event, value = next(events)
+                obj[key] = self.__build(events, event, value)
+            return obj
+        if event == "start_array":
+            array = []
+            for event, value in events:
+                if event == "end_array":
+                    break
+                array.append(self.__build(events, event, value))
+            return array
+        return value
+
+    @staticmethod
+    def __skip(events: Iterator[Tuple[str, Any]], event: str):
+        if event not in ("start_map", "start_array"):
+            return
+        depth = 1
+        for event, _ in events:
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+                if depth == 0:
+                    return
+
+
+def get_default_codec() -> JsonCodec:
+    """Returns the fastest available codec."""
+    return OrjsonCodec() if OrjsonCodec.is_available() else JsonCodec()
@@ -0,0 +1,125 @@
+import json
+import os
+import sqlite3
+import time
+from typing import Any, List, Tuple, Union
+
+from trcli.settings import DEFAULT_METADATA_CACHE_TTL
+
+
+class MetadataCache:
+    """
+    Local SQLite cache of suite metadata (cases) keyed by host, project and suite,
+    so consecutive uploads to the same suite only read entities changed since the previous upload.
+    Only fields requested from API (ApiRequestHandler.CASE_FIELDS) are stored.
+    updated_after - newest updated_on value of cached entities (TestRail server time),
+    used as updated_after filter of the next incremental refresh
+    Results of lookups which can't be refreshed incrementally (e.g. project index, case fields)
+    are kept for lookup_ttl seconds.
+    """
+
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS entities (
+            host TEXT NOT NULL,
+            project_id INTEGER NOT NULL,
+            suite_id INTEGER NOT NULL,
+            entity TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (host, project_id, suite_id, entity, id)
+        )""",
+        """CREATE TABLE IF NOT EXISTS synced (
+            host TEXT NOT NULL,
+            project_id INTEGER NOT NULL,
+            suite_id INTEGER NOT NULL,
+            entity TEXT NOT NULL,
+            updated_after INTEGER,
+            PRIMARY KEY (host, project_id, suite_id, entity)
+        )""",
+        """CREATE TABLE IF NOT EXISTS lookups (
+            host TEXT NOT NULL,
+            name TEXT NOT NULL,
+            data TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (host, name)
+        )""",
+    )
+
+    def __init__(self, path: str, host: str, lookup_ttl: float = DEFAULT_METADATA_CACHE_TTL):
+        path = os.path.expanduser(path)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.host = host
+        self.lookup_ttl = lookup_ttl
+        self.__connection = sqlite3.connect(path)
+        with self.__connection:
+            for statement in self.SCHEMA:
+                self.__connection.execute(statement)
+
+    def get(self, project_id: int, suite_id: int, entity: str) -> Tuple[Union[List[dict], None], Union[int, None]]:
+        """
+        Returns cached entities and updated_after value.
+        Returns (None, None) if entities of the suite were never cached.
+        """
+        key = (self.host, project_id, suite_id or 0, entity)
+        synced = self.__connection.execute(
+            "SELECT updated_after FROM synced WHERE host=? AND project_id=? AND suite_id=? AND entity=?", key
+        ).fetchone()
+        if synced is None:
+            return None, None
+        rows = self.__connection.execute(
+            "SELECT data FROM entities WHERE host=? AND project_id=? AND suite_id=? AND entity=? ORDER BY id", key
+        )
+        return [json.loads(data) for (data,) in rows], synced[0]
+
+    def count(self, project_id: int, suite_id: int, entity: str) -> int:
+        return self.__connection.execute(
+            "SELECT COUNT(*) FROM entities WHERE host=? AND project_id=? AND suite_id=? AND entity=?",
+            (self.host, project_id, suite_id or 0, entity),
+        ).fetchone()[0]
+
+    def replace(self, project_id: int, suite_id: int, entity: str, entities: List[dict]):
+        """Replaces all cached entities of the suite, e.g. after full fetch."""
+        key = (self.host, project_id, suite_id or 0, entity)
+        with self.__connection:
+            self.__connection.execute(
+                "DELETE FROM entities WHERE host=? AND project_id=? AND suite_id=? AND entity=?", key
+            )
+            self.__connection.execute(
+                "DELETE FROM synced WHERE host=? AND project_id=? AND suite_id=? AND entity=?", key
+            )
+            self.__store(key, entities, None)
+
+    def update(self, project_id: int, suite_id: int, entity: str, entities: List[dict]):
+        """Adds or updates given entities, e.g. after incremental refresh."""
+        key = (self.host, project_id, suite_id or 0, entity)
+        _, updated_after = self.get(project_id, suite_id, entity)
+        with self.__connection:
+            self.__store(key, entities, updated_after)
+
+    def get_lookup(self, name: str) -> Any:
+        """Returns cached lookup result or None if it is missing or expired."""
+        row = self.__connection.execute(
+            "SELECT data FROM lookups WHERE host=? AND name=? AND expires_at>?", (self.host, name, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set_lookup(self, name: str, value: Any):
+        with self.__connection:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO lookups VALUES (?, ?, ?, ?)",
+                (self.host, name, json.dumps(value), time.time() + self.lookup_ttl),
+            )
+
+    def close(self):
+        self.__connection.close()
+
+    def __store(self, key: tuple, entities: List[dict], updated_after: Union[int, None]):
+        self.__connection.executemany(
+            "INSERT OR REPLACE INTO entities VALUES (?, ?, ?, ?, ?, ?)",
+            [(*key, entity["id"], json.dumps(entity)) for entity in entities],
+        )
+        updated_on = [entity["updated_on"] for entity in entities if entity.get("updated_on") is not None]
+        if updated_on:
+            updated_after = max(max(updated_on), updated_after or 0)
+        self.__connection.execute("INSERT OR REPLACE INTO synced VALUES (?, ?, ?, ?, ?)", (*key, updated_after))
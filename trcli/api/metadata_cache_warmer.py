@@ -0,0 +1,93 @@
+import time
+
+from trcli.api.api_client_factory import ApiClientFactory
+from trcli.api.api_request_handler import ApiRequestHandler
+from trcli.cli import Environment
+from trcli.constants import FAULT_MAPPING, ProjectErrors, SuiteModes
+from trcli.data_classes.dataclass_testrail import TestRailSuite
+
+
+class MetadataCacheWarmer(ApiClientFactory):
+    """
+    Class to be used to read project lookups, case fields and cases of the suite into local metadata cache
+    (e.g. while tests are still running), so following upload with metadata cache enabled
+    only has to read changed cases. Sections are not cached: they can't be filtered by update time,
+    so checking cached sections would cost as much as reading them, and the upload always reads them live.
+    Initialized with environment object.
+    """
+
+    def __init__(self, environment: Environment):
+        super().__init__(environment)
+        self.api_client = self.instantiate_api_client()
+        self.metadata_cache = self.instantiate_metadata_cache()
+        self.api_request_handler = ApiRequestHandler(
+            api_client=self.api_client,
+            environment=self.environment,
+            suites_data=TestRailSuite(name="", suite_id=self.environment.suite_id),
+            verify=self.environment.verify,
+            metadata_cache=self.metadata_cache,
+        )
+
+    def warm_cache(self):
+        """
+        Resolves project and suite and reads their metadata into cache.
+        Exits with result code 1 printing proper message to the user in case of a failure
+        or with result code 0 if succeeds.
+        """
+        start = time.time()
+        self.environment.log("Checking project. ", new_line=False)
+        project_data = self.api_request_handler.get_project_id(
+            self.environment.project, self.environment.project_id
+        )
+        if project_data.project_id == ProjectErrors.not_existing_project:
+            self.environment.elog("\n" + project_data.error_message)
+            exit(1)
+        elif project_data.project_id in (ProjectErrors.other_error, ProjectErrors.multiple_project_same_name):
+            self.environment.elog(
+                "\n" + FAULT_MAPPING["error_checking_project"].format(error_message=project_data.error_message)
+            )
+            exit(1)
+        # result is not needed here, check only stores case fields in cache for the upload
+        self.api_request_handler.check_automation_id_field(project_data.project_id)
+        self.environment.log("Done.")
+        self.environment.log("Checking suite. ", new_line=False)
+        error_message = self.resolve_suite_id(project_data.project_id, project_data.suite_mode)
+        if error_message:
+            self.environment.elog("\n" + error_message)
+            exit(1)
+        self.environment.log("Done.")
+        suite_id = self.api_request_handler.suites_data_from_provider.suite_id
+        self.environment.log(f"Reading cases of suite {suite_id}. ", new_line=False)
+        cached_cases, error_message = self.api_request_handler.cache_suite_metadata(project_data.project_id)
+        if error_message:
+            self.environment.elog(
+                "\n" + FAULT_MAPPING["error_checking_missing_item"].format(
+                    missing_item="suite cases", error_message=error_message
+                )
+            )
+            exit(1)
+        self.environment.log("Done.")
+        stop = time.time()
+        self.environment.log(
+            f"Cached {cached_cases} cases in {stop - start:.1f} secs."
+        )
+        self.metadata_cache.close()
+
+    def resolve_suite_id(self, project_id: int, suite_mode: int) -> str:
+        """
+        Checks suite ID from environment or, if not provided, takes the only suite of the project.
+        Returns error message on failure.
+        """
+        if self.api_request_handler.suites_data_from_provider.suite_id:
+            _, error_message = self.api_request_handler.check_suite_id(project_id)
+            return error_message
+        suite_ids, error_message = self.api_request_handler.get_suite_ids(project_id)
+        if error_message:
+            return error_message
+        if len(suite_ids) != 1:
+            if suite_mode == SuiteModes.single_suite_baselines and suite_ids:
+                return FAULT_MAPPING["not_unique_suite_id_single_suite_baselines"].format(
+                    project_name=self.environment.project
+                )
+            return FAULT_MAPPING["missing_suite_id_to_prefetch"].format(project_name=self.environment.project)
+        return ""
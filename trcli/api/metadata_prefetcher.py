@@ -0,0 +1,129 @@
+from concurrent.futures import Future
+from threading import Thread
+from typing import Union, List
+
+from trcli.api.api_client import APIClient
+from trcli.api.api_request_handler import ApiRequestHandler
+from trcli.api.metadata_cache import MetadataCache
+from trcli.cli import Environment
+from trcli.data_classes.dataclass_testrail import TestRailSuite
+
+
+class MetadataPrefetcher:
+    """
+    Starts metadata requests in background, so they run while report file is parsed (project, case fields
+    and suites) or while project and suite are checked (sections and cases, which depend on parsed report).
+    ApiRequestHandler receives prefetched responses through APIClient.send_get.
+    Only requests which ResultsUploader is going to send are prefetched, e.g. nothing found in metadata
+    cache, no sections and cases for report identified by case IDs and no cases for section-scoped lookup.
+    Requests are sent in parallel, which also opens first pooled connections (TCP and TLS handshakes)
+    before upload starts.
+    """
+
+    def __init__(self, api_client: APIClient, environment: Environment, metadata_cache: MetadataCache = None):
+        self.api_client = api_client
+        self.environment = environment
+        self.metadata_cache = metadata_cache
+        self.__project_id = None
+        self.__thread = None
+        self.__suite_thread = None
+
+    def start(self):
+        """Prefetches metadata which does not depend on parsed report."""
+        projects = self.__cached_projects()
+        if projects is None:
+            projects = self.api_client.prefetch(
+                "get_projects", entity="projects", fields=ApiRequestHandler.PROJECT_FIELDS
+            )
+        if self.environment.auto_creation_response and not self.__is_cached("case_fields"):
+            self.api_client.prefetch("get_case_fields")
+        self.__thread = Thread(target=self.__prefetch_project_metadata, args=(projects,), daemon=True)
+        self.__thread.start()
+
+    def prefetch_suite(self, suite: TestRailSuite):
+        """Prefetches sections and cases of the suite if they are going to be checked for parsed report."""
+        # with run ID report may be identified by tests of the run, then sections and cases are not checked
+        if not suite.suite_id or self.environment.run_id or self.__is_identified(suite):
+            return
+        self.__suite_thread = Thread(target=self.__prefetch_suite_metadata, args=(suite,), daemon=True)
+        self.__suite_thread.start()
+
+    def wait(self, timeout: float = None):
+        """Waits until all prefetch requests were started."""
+        for thread in (self.__thread, self.__suite_thread):
+            if thread is not None:
+                thread.join(timeout)
+
+    def __prefetch_project_metadata(self, projects: Union[Future, List[dict]]):
+        if isinstance(projects, Future):
+            response = projects.result()
+            if response.error_message:
+                return
+            projects = response.response_text
+            if isinstance(projects, dict):
+                projects = projects["projects"]
+            projects = [project for project in projects if project["name"] == self.environment.project]
+        self.__project_id = self.__find_project_id(projects)
+        # with run ID suite is not checked if report is identified by tests of the run
+        if self.__project_id is not None and not self.environment.run_id:
+            self.api_client.prefetch(f"get_suites/{self.__project_id}")
+
+    def __prefetch_suite_metadata(self, suite: TestRailSuite):
+        self.__thread.join()
+        if self.__project_id is None:
+            return
+        sections = self.api_client.prefetch(
+            f"get_sections/{self.__project_id}&suite_id={suite.suite_id}",
+            entity="sections",
+            fields=ApiRequestHandler.SECTION_FIELDS,
+        )
+        # with metadata cache only changes of cases are read, full list would be downloaded needlessly
+        if self.metadata_cache is None and self.__is_suite_lookup(suite, sections.result()):
+            self.api_client.prefetch(
+                f"get_cases/{self.__project_id}&suite_id={suite.suite_id}",
+                entity="cases",
+                fields=ApiRequestHandler.CASE_FIELDS,
+            )
+
+    def __cached_projects(self) -> Union[List[dict], None]:
+        """Returns projects matching project name from metadata cache or None if they have to be read."""
+        if self.metadata_cache is None:
+            return None
+        projects_by_name = self.metadata_cache.get_lookup("projects_by_name")
+        if projects_by_name is None or self.environment.project not in projects_by_name:
+            return None
+        return projects_by_name[self.environment.project]
+
+    def __is_cached(self, lookup: str) -> bool:
+        return self.metadata_cache is not None and self.metadata_cache.get_lookup(lookup) is not None
+
+    def __find_project_id(self, matching: List[dict]) -> Union[int, None]:
+        """
+        Finds project among projects matching project name the same way as ApiRequestHandler.get_project_id.
+        Returns None if project is missing or ambiguous, errors are reported later by ApiRequestHandler.
+        """
+        if len(matching) > 1:
+            matching = [project for project in matching if project["id"] == self.environment.project_id]
+        return int(matching[0]["id"]) if len(matching) == 1 else None
+
+    @staticmethod
+    def __is_identified(suite: TestRailSuite) -> bool:
+        """Tells if report takes fast path of ApiRequestHandler.match_cases_without_suite_lookup without run ID."""
+        test_cases = [case for section in suite.testsections for case in section.testcases]
+        return bool(test_cases) and all(case.case_id is not None for case in test_cases)
+
+    @staticmethod
+    def __is_suite_lookup(suite: TestRailSuite, sections_response) -> bool:
+        """
+        Tells if cases of whole suite are going to be read, i.e. section-scoped lookup does not apply.
+        It is known only if all sections of the suite fit in first page, otherwise cases are not prefetched.
+        """
+        if sections_response.error_message:
+            return False
+        sections = sections_response.response_text
+        if isinstance(sections, dict):
+            if sections["_links"]["next"]:
+                return False
+            sections = sections["sections"]
+        report_sections_count = len({section.name for section in suite.testsections})
+        return not ApiRequestHandler.is_case_lookup_scoped(report_sections_count, len(sections))
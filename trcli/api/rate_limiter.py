@@ -0,0 +1,56 @@
+from threading import Lock
+from time import monotonic
+
+
+class RateLimiter:
+    """
+    Token bucket shared by all workers sending requests through one APIClient.
+    requests_per_second - budget of requests (or other units, e.g. bytes), None means unlimited
+    (only Retry-After pauses are applied)
+    burst - maximum number of requests that can be sent at once after idle period (defaults to one second of budget)
+    throttled_time - total wall-clock time (in seconds) during which traffic was held back
+    """
+
+    def __init__(self, requests_per_second: float = None, burst: int = None):
+        self.requests_per_second = requests_per_second
+        self.capacity = burst or max(1.0, requests_per_second or 1.0)
+        self.throttled_time = 0.0
+        self.__tokens = self.capacity
+        self.__updated = monotonic()
+        self.__paused_until = 0.0
+        self.__throttled_until = 0.0
+        self.__lock = Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Takes tokens (one per request by default) from the bucket.
+        Returns number of seconds caller has to wait before sending the request.
+        """
+        with self.__lock:
+            now = monotonic()
+            wait = max(self.__paused_until - now, 0.0)
+            if self.requests_per_second:
+                self.__tokens = min(
+                    self.capacity,
+                    self.__tokens + (now - self.__updated) * self.requests_per_second,
+                )
+                self.__updated = now
+                self.__tokens -= tokens
+                if self.__tokens < 0:
+                    wait = max(wait, -self.__tokens / self.requests_per_second)
+            self.__account(now, now + wait)
+            return wait
+
+    def pause(self, seconds: float):
+        """Holds back requests of all workers for given time, e.g. after response with Retry-After header."""
+        with self.__lock:
+            now = monotonic()
+            self.__paused_until = max(self.__paused_until, now + seconds)
+            self.__account(now, self.__paused_until)
+
+    def __account(self, start: float, end: float):
+        """Adds part of [start, end] period not yet counted to throttled_time."""
+        start = max(start, self.__throttled_until)
+        if end > start:
+            self.throttled_time += end - start
+            self.__throttled_until = end
@@ -1,33 +1,59 @@
+import asyncio
 import sys
 from typing import Tuple, Callable, List
 
 from trcli.api.api_client import APIClient
+from trcli.api.api_client_factory import ApiClientFactory
+from trcli.api.async_api_client import AsyncAPIClient
+from trcli.api.metadata_prefetcher import MetadataPrefetcher
+from trcli.api.rate_limiter import RateLimiter
 from trcli.cli import Environment
 from trcli.api.api_request_handler import ApiRequestHandler
 from trcli.constants import PROMPT_MESSAGES, FAULT_MAPPING, SuiteModes
 from trcli.data_classes.dataclass_testrail import TestRailSuite
 from trcli.readers.file_parser import FileParser
 from trcli.constants import ProjectErrors, RevertMessages
+from trcli.settings import MAX_WORKERS_ADD_ATTACHMENTS
 import time
+from humanfriendly import format_size
 
 
-class ResultsUploader:
+class ResultsUploader(ApiClientFactory):
     """
     Class to be used to upload the results to TestRail.
     Initialized with environment object and result file parser object (any parser derived from FileParser).
     """
 
     def __init__(self, environment: Environment, result_file_parser: FileParser):
-        self.environment = environment
+        super().__init__(environment)
         self.result_file_parser = result_file_parser
+        self.api_client = self.instantiate_api_client()
+        # attachments are sent through separate connection pool, so large files do not hold back results
+        self.attachment_client = self.instantiate_api_client(
+            pool_size=MAX_WORKERS_ADD_ATTACHMENTS,
+            bandwidth_limiter=(
+                RateLimiter(self.environment.attachment_rate_limit)
+                if self.environment.attachment_rate_limit
+                else None
+            ),
+        )
+        metadata_cache = self.instantiate_metadata_cache() if self.environment.metadata_cache else None
+        # metadata requests run in background while report is being parsed
+        prefetcher = MetadataPrefetcher(self.api_client, self.environment, metadata_cache)
+        prefetcher.start()
         self.parsed_data: TestRailSuite = self.result_file_parser.parse_file()
         if self.environment.suite_id:
             self.parsed_data.suite_id = self.environment.suite_id
+        prefetcher.prefetch_suite(self.parsed_data)
+        self.async_transport = self.environment.transport == "async"
         self.api_request_handler = ApiRequestHandler(
-            api_client=self.instantiate_api_client(),
+            api_client=self.api_client,
             environment=self.environment,
             suites_data=self.parsed_data,
             verify=self.environment.verify,
+            attachment_client=self.attachment_client,
+            metadata_cache=metadata_cache,
+            async_client=self.instantiate_async_api_client(self.api_client) if self.async_transport else None,
         )
         if self.environment.suite_id:
             self.api_request_handler.data_provider.update_data(
@@ -73,33 +99,38 @@ class ResultsUploader:
                     self.environment.elog(automation_id_error)
                     exit(1)
             self.environment.log("Done.")
-            added_suite_id, result_code = self.get_suite_id(
-                project_id=project_data.project_id, suite_mode=project_data.suite_mode
-            )
-            if result_code == -1:
-                exit(1)
+            report_identified = self.check_report_identified()
+            added_suite_id = 0
+            if not (report_identified and self.environment.run_id):
+                added_suite_id, result_code = self.get_suite_id(
+                    project_id=project_data.project_id, suite_mode=project_data.suite_mode
+                )
+                if result_code == -1:
+                    exit(1)
 
-            added_sections, result_code = self.add_missing_sections(
-                project_data.project_id
-            )
-            if result_code == -1:
-                revert_logs = self.rollback_changes(
-                    added_suite_id=added_suite_id, added_sections=added_sections
+            added_sections, added_test_cases = [], []
+            if not report_identified:
+                added_sections, result_code = self.add_missing_sections(
+                    project_data.project_id
                 )
-                self.environment.log("\n".join(revert_logs))
-                exit(1)
+                if result_code == -1:
+                    revert_logs = self.rollback_changes(
+                        added_suite_id=added_suite_id, added_sections=added_sections
+                    )
+                    self.environment.log("\n".join(revert_logs))
+                    exit(1)
 
-            added_test_cases, result_code = self.add_missing_test_cases(
-                project_data.project_id
-            )
-            if result_code == -1:
-                revert_logs = self.rollback_changes(
-                    added_suite_id=added_suite_id,
-                    added_sections=added_sections,
-                    added_test_cases=added_test_cases,
+                added_test_cases, result_code = self.add_missing_test_cases(
+                    project_data.project_id
                 )
-                self.environment.log("\n".join(revert_logs))
-                exit(1)
+                if result_code == -1:
+                    revert_logs = self.rollback_changes(
+                        added_suite_id=added_suite_id,
+                        added_sections=added_sections,
+                        added_test_cases=added_test_cases,
+                    )
+                    self.environment.log("\n".join(revert_logs))
+                    exit(1)
             if not self.environment.run_id:
                 self.environment.log(f"Creating test run. ", new_line=False)
                 added_run, error_message = self.api_request_handler.add_run(
@@ -118,11 +149,18 @@ class ResultsUploader:
                 run_id = added_run
             else:
                 run_id = self.environment.run_id
-            (
-                added_results,
-                error_message,
-                results_amount,
-            ) = self.api_request_handler.add_results(run_id)
+            if self.async_transport:
+                (
+                    added_results,
+                    error_message,
+                    results_amount,
+                ) = asyncio.run(self.api_request_handler.add_results_async(run_id))
+            else:
+                (
+                    added_results,
+                    error_message,
+                    results_amount,
+                ) = self.api_request_handler.add_results(run_id)
             if error_message:
                 self.environment.elog(error_message)
                 revert_logs = self.rollback_changes(
@@ -145,6 +183,34 @@ class ResultsUploader:
             self.environment.log(
                 f"Submitted {results_amount} test results in {stop - start:.1f} secs."
             )
+        if self.rate_limiter.throttled_time:
+            self.environment.log(
+                f"Requests were throttled for {self.rate_limiter.throttled_time:.1f} secs."
+            )
+        if self.retry_policy.retry_time_spent:
+            self.environment.vlog(
+                f"Waited {self.retry_policy.retry_time_spent:.1f} secs between retries."
+            )
+        compression_stats = self.api_client.compression_stats()
+        if compression_stats.requests:
+            self.environment.log(
+                f"Compressed {compression_stats.requests} request bodies, saved "
+                f"{format_size(compression_stats.saved_bytes)} "
+                f"({compression_stats.saved_bytes / compression_stats.original_bytes:.0%})."
+            )
+        if self.hedging_policy is not None and self.hedging_policy.hedges_sent:
+            self.environment.log(
+                f"Hedged requests sent: {self.hedging_policy.hedges_sent}, "
+                f"answered first: {self.hedging_policy.hedges_won}."
+            )
+        self.log_traffic_stats()
+        memo_hits, memo_misses = self.api_client.memo_stats()
+        self.environment.vlog(f"Repeated metadata requests answered from memo: {memo_hits}, sent: {memo_misses}.")
+        connection_stats = self.api_request_handler.client.connection_stats()
+        self.environment.vlog(
+            f"Connections opened: {connection_stats.connections}, "
+            f"reused: {connection_stats.reused}."
+        )
 
     def get_suite_id(self, project_id: int, suite_mode: int) -> Tuple[int, int]:
         """
@@ -232,6 +298,21 @@ class ResultsUploader:
             self.environment.elog(error_message)
         return result_code
 
+    def check_report_identified(self) -> bool:
+        """
+        Checks if all test cases from the report are already identified in TestRail (by case ID
+        or, if run ID is provided, by tests of the run), so sections and cases of the whole suite
+        don't have to be checked. Returns False on API error, so regular checks are done instead.
+        """
+        identified, error_message = self.api_request_handler.match_cases_without_suite_lookup(
+            self.environment.run_id
+        )
+        if error_message:
+            self.environment.vlog(f"Unable to match test cases with run tests: {error_message}")
+        if identified:
+            self.environment.log("All test cases identified, skipping checks of sections and cases.")
+        return identified
+
     def add_missing_sections(self, project_id: int) -> Tuple[list, int]:
         """
         Checks for missing sections in specified project. Add missing sections if user agrees to
@@ -301,7 +382,11 @@ class ResultsUploader:
                 prompt_message=prompt_message,
                 adding_message=adding_message,
                 fault_message=fault_message,
-                add_function=self.api_request_handler.add_cases,
+                add_function=(
+                    (lambda: asyncio.run(self.api_request_handler.add_cases_async()))
+                    if self.async_transport
+                    else self.api_request_handler.add_cases
+                ),
             )
         else:
             if error_message:
@@ -338,31 +423,42 @@ class ResultsUploader:
             self.environment.elog(fault_message)
         return added_items, result_code
 
-    def instantiate_api_client(self) -> APIClient:
+    def log_traffic_stats(self):
+        """Logs (verbose) amount of data and throughput of metadata, results, attachments and other traffic."""
+        traffic_classes = {
+            **self.api_client.traffic_stats(ResultsUploader.traffic_class),
+            **self.attachment_client.traffic_stats(ResultsUploader.traffic_class),
+        }
+        for name in ("Metadata", "Results", "Attachments", "Other changes"):
+            stats = traffic_classes.get(name)
+            if stats is None or not stats.requests:
+                continue
+            self.environment.vlog(
+                f"{name}: {stats.requests} requests, sent {format_size(stats.bytes_sent)}, "
+                f"received {format_size(stats.bytes_received)}, "
+                f"throughput {format_size(stats.throughput)}/s."
+            )
+
+    @staticmethod
+    def traffic_class(method: str, endpoint: str) -> str:
+        """Class of request in traffic statistics: metadata lookups, results, attachments or other changes."""
+        if method == "GET":
+            return "Metadata"
+        if endpoint.startswith("add_attachment"):
+            return "Attachments"
+        if endpoint.startswith("add_result"):
+            return "Results"
+        return "Other changes"
+
+    def instantiate_async_api_client(self, api_client: APIClient) -> AsyncAPIClient:
         """
-        Instantiate api client with needed attributes taken from environment.
+        Instantiate asyncio api client sharing host, credentials and settings with api_client.
+        Exits with result code 1 if optional dependency is not installed.
         """
-        verbose_logging_function = self.environment.vlog
-        logging_function = self.environment.log
-        if self.environment.timeout:
-            api_client = APIClient(
-                self.environment.host,
-                verbose_logging_function=verbose_logging_function,
-                logging_function=logging_function,
-                timeout=self.environment.timeout,
-                verify=not self.environment.insecure,
-            )
-        else:
-            api_client = APIClient(
-                self.environment.host,
-                logging_function=logging_function,
-                verbose_logging_function=verbose_logging_function,
-                verify=not self.environment.insecure,
-            )
-        api_client.username = self.environment.username
-        api_client.password = self.environment.password
-        api_client.api_key = self.environment.key
-        return api_client
+        if not AsyncAPIClient.is_available():
+            self.environment.elog(FAULT_MAPPING["missing_async_dependency"])
+            exit(1)
+        return AsyncAPIClient(api_client, concurrency=self.environment.async_concurrency)
 
     def rollback_changes(
         self, added_suite_id=0, added_sections=None, added_test_cases=None, run_id=0
@@ -0,0 +1,76 @@
+import random
+from threading import Lock
+from typing import List, Union
+
+from trcli.settings import (
+    DEFAULT_API_CALL_RETRIES,
+    DEFAULT_RETRY_ON,
+    DEFAULT_RETRY_MAX_BACKOFF,
+)
+
+
+class RetryPolicy:
+    """
+    Decides if and when failed request should be retried.
+    retries - maximum number of retries of a single request
+    retry_on - status codes which should be retried
+    backoff_factor - base of exponential backoff in seconds, 0 means retrying immediately
+    max_backoff - maximum delay between two attempts in seconds
+    jitter - randomize delay (full jitter), so workers failing together do not retry together
+    max_request_retry_time - maximum time in seconds spent on retrying a single request
+    retry_budget - maximum total time in seconds spent waiting between retries during the whole run
+
+    Timeouts are retried only for idempotent requests, as non-idempotent one (e.g. add_results_for_cases POST)
+    could be already processed by the server. Connection failures and retry_on status codes are retried for all.
+    """
+
+    IDEMPOTENT_METHODS = ("GET",)
+
+    def __init__(
+        self,
+        retries: int = DEFAULT_API_CALL_RETRIES,
+        retry_on: List[int] = DEFAULT_RETRY_ON,
+        backoff_factor: float = 0.0,
+        max_backoff: float = DEFAULT_RETRY_MAX_BACKOFF,
+        jitter: bool = True,
+        max_request_retry_time: float = None,
+        retry_budget: float = None,
+    ):
+        self.retries = retries
+        self.retry_on = list(retry_on)
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.max_request_retry_time = max_request_retry_time
+        self.retry_budget = retry_budget
+        self.retry_time_spent = 0.0
+        self.__lock = Lock()
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        return status_code in self.retry_on
+
+    def is_retryable_timeout(self, method: str) -> bool:
+        return method in self.IDEMPOTENT_METHODS
+
+    def get_backoff(self, attempt: int, request_retry_time: float = 0.0) -> Union[float, None]:
+        """
+        Returns delay in seconds before given retry attempt (starting from 1)
+        or None if the retry would exceed per request or per run time limits.
+        :request_retry_time: time already spent on retrying the request
+        """
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if (
+            self.max_request_retry_time is not None
+            and request_retry_time + delay > self.max_request_retry_time
+        ):
+            return None
+        with self.__lock:
+            if (
+                self.retry_budget is not None
+                and self.retry_time_spent + delay > self.retry_budget
+            ):
+                return None
+            self.retry_time_spent += delay
+        return delay
@@ -1,7 +1,7 @@
 import json
 import os
 import sys
-from typing import List, Union
+from typing import List, Tuple, Union
 
 import click
 import yaml
@@ -16,7 +16,19 @@ from trcli.constants import (
     TOOL_VERSION_AND_USAGE,
     MISSING_COMMAND_SLOGAN,
 )
-from trcli.settings import DEFAULT_API_CALL_TIMEOUT, DEFAULT_BATCH_SIZE
+from trcli.settings import (
+    DEFAULT_API_CALL_TIMEOUT,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_ASYNC_CONCURRENCY,
+    DEFAULT_RETRY_ON,
+    DEFAULT_RETRY_BACKOFF,
+    DEFAULT_COMPRESSION_THRESHOLD,
+    DEFAULT_HEDGE_PERCENTILE,
+    DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+    DEFAULT_CIRCUIT_BREAKER_RECOVERY_TIME,
+    DEFAULT_METADATA_CACHE_PATH,
+    DEFAULT_METADATA_CACHE_TTL,
+)
 
 CONTEXT_SETTINGS = dict(auto_envvar_prefix="TR_CLI")
 
@@ -49,6 +61,25 @@ class Environment:
         self.close_run = None
         self.insecure = None
         self.run_description = None
+        self.transport = None
+        self.http2 = None
+        self.rate_limit = None
+        self.async_concurrency = None
+        self.retry_on = None
+        self.retry_backoff = None
+        self.retry_max_time = None
+        self.retry_budget = None
+        self.compress = None
+        self.compress_threshold = None
+        self.hedge = None
+        self.hedge_percentile = None
+        self.circuit_breaker_threshold = None
+        self.circuit_breaker_recovery = None
+        self.attachment_rate_limit = None
+        self.metadata_cache = None
+        self.metadata_cache_path = None
+        self.metadata_cache_ttl = None
+        self.columnar_results = None
         self._case_fields = None
 
     @property
@@ -121,11 +152,11 @@ class Environment:
             else:
                 setattr(self, param, value)
 
-    def check_for_required_parameters(self):
+    def check_for_required_parameters(self, not_required: Tuple[str, ...] = ()):
         """Checks that all required parameters were set. If not error message would be printed and
-        program will exit with exit code 1"""
+        program will exit with exit code 1. Parameters not used by command can be listed in not_required."""
         for param, value in vars(self).items():
-            if "missing_" + param in FAULT_MAPPING and not value:
+            if "missing_" + param in FAULT_MAPPING and not value and param not in not_required:
                 self.elog(FAULT_MAPPING["missing_" + param])
                 exit(1)
         # special case for password and key (both needs to be missing for the error message to show up)
@@ -262,6 +293,134 @@ class TRCLI(click.MultiCommand):
     metavar="",
     help="Batch timeout duration.",
 )
+@click.option(
+    "--rate-limit",
+    type=click.FloatRange(min=0, min_open=True),
+    metavar="",
+    help="Maximum number of API requests per second sent by all workers together.",
+)
+@click.option(
+    "--transport",
+    type=click.Choice(["threads", "async"], case_sensitive=False),
+    default="threads",
+    show_default=True,
+    help="Concurrency model used to add test cases, results and attachments.",
+)
+@click.option(
+    "--http2",
+    is_flag=True,
+    help="Multiplex concurrent requests over a single HTTP/2 connection.",
+)
+@click.option(
+    "--async-concurrency",
+    type=click.IntRange(min=1),
+    default=DEFAULT_ASYNC_CONCURRENCY,
+    show_default=str(DEFAULT_ASYNC_CONCURRENCY),
+    metavar="",
+    help="Maximum number of requests in flight when using async transport.",
+)
+@click.option(
+    "--retry-on",
+    type=click.IntRange(min=100, max=599),
+    multiple=True,
+    default=DEFAULT_RETRY_ON,
+    show_default=", ".join(str(code) for code in DEFAULT_RETRY_ON),
+    metavar="",
+    help="HTTP status code for which request should be retried (can be used multiple times).",
+)
+@click.option(
+    "--retry-backoff",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_RETRY_BACKOFF,
+    show_default=str(DEFAULT_RETRY_BACKOFF),
+    metavar="",
+    help="Base of exponential backoff (with jitter) between retries in seconds.",
+)
+@click.option(
+    "--retry-max-time",
+    type=click.FloatRange(min=0),
+    metavar="",
+    help="Maximum time in seconds spent on retrying a single request.",
+)
+@click.option(
+    "--retry-budget",
+    type=click.FloatRange(min=0),
+    metavar="",
+    help="Maximum total time in seconds spent waiting between retries during the whole run.",
+)
+@click.option(
+    "--compress",
+    is_flag=True,
+    help="Send large request bodies gzip compressed.",
+)
+@click.option(
+    "--compress-threshold",
+    type=click.IntRange(min=0),
+    default=DEFAULT_COMPRESSION_THRESHOLD,
+    show_default=str(DEFAULT_COMPRESSION_THRESHOLD),
+    metavar="",
+    help="Minimum size of request body in bytes to be compressed.",
+)
+@click.option(
+    "--hedge",
+    is_flag=True,
+    help="Send duplicate request for slow pages of existing cases, sections and tests.",
+)
+@click.option(
+    "--hedge-percentile",
+    type=click.FloatRange(min=0, max=100, min_open=True),
+    default=DEFAULT_HEDGE_PERCENTILE,
+    show_default=str(DEFAULT_HEDGE_PERCENTILE),
+    metavar="",
+    help="Latency percentile of earlier requests after which duplicate request is sent.",
+)
+@click.option(
+    "--circuit-breaker-threshold",
+    type=click.IntRange(min=0),
+    default=DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+    show_default=str(DEFAULT_CIRCUIT_BREAKER_THRESHOLD),
+    metavar="",
+    help="Number of consecutive network errors or timeouts after which requests fail immediately (0 to disable).",
+)
+@click.option(
+    "--circuit-breaker-recovery",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_CIRCUIT_BREAKER_RECOVERY_TIME,
+    show_default=str(DEFAULT_CIRCUIT_BREAKER_RECOVERY_TIME),
+    metavar="",
+    help="Time in seconds after which probe request is sent to check if TestRail responds again.",
+)
+@click.option(
+    "--attachment-rate-limit",
+    type=click.IntRange(min=1),
+    metavar="",
+    help="Maximum number of attachment bytes per second uploaded by all workers together.",
+)
+@click.option(
+    "--metadata-cache",
+    is_flag=True,
+    help="Keep cases of the suite in local cache and read only changes on next uploads.",
+)
+@click.option(
+    "--metadata-cache-path",
+    default=DEFAULT_METADATA_CACHE_PATH,
+    show_default=True,
+    metavar="",
+    help="Path to metadata cache file.",
+)
+@click.option(
+    "--metadata-cache-ttl",
+    type=click.IntRange(min=0),
+    default=DEFAULT_METADATA_CACHE_TTL,
+    show_default=str(DEFAULT_METADATA_CACHE_TTL),
+    metavar="",
+    help="Time in seconds for which projects and case fields are kept in metadata cache.",
+)
+@click.option(
+    "--columnar-results",
+    is_flag=True,
+    help="Keep parsed test cases and results in compact column store (for very large reports).",
+)
 @click.option(
     "-y",
     "--yes",
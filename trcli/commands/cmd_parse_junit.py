@@ -41,7 +41,7 @@ def cli(environment: Environment, context: click.Context, *args, **kwargs):
     environment.check_for_required_parameters()
     try:
         result_uploader = ResultsUploader(
-            environment=environment, result_file_parser=JunitParser(environment.file)
+            environment=environment, result_file_parser=JunitParser(environment.file, columnar=bool(environment.columnar_results))
         )
         result_uploader.upload_results()
     except FileNotFoundError:
@@ -0,0 +1,19 @@
+import click
+from trcli.cli import pass_environment, Environment, CONTEXT_SETTINGS
+from trcli.api.metadata_cache_warmer import MetadataCacheWarmer
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.option(
+    "--suite-id",
+    type=click.IntRange(min=1),
+    metavar="",
+    help="Suite ID to prefetch (can be omitted if project has only one suite).",
+)
+@click.pass_context
+@pass_environment
+def cli(environment: Environment, context: click.Context, *args, **kwargs):
+    """Read suite cases into local cache ahead of upload"""
+    environment.set_parameters(context)
+    environment.check_for_required_parameters(not_required=("file", "title"))
+    MetadataCacheWarmer(environment).warm_cache()
@@ -42,6 +42,14 @@ FAULT_MAPPING = dict(
     "(if present) under `testcase` tag in result xml file\nand\n"
     "only one result is present in result xml file.",
     unexpected_error_during_request_send="Unexpected error occurred during sending request: {request}",
+    missing_async_dependency="Async transport requires the optional 'httpx' package. "
+    "Please install it using: pip install trcli[async]",
+    missing_http2_dependency="HTTP/2 transport requires the optional 'httpx' and 'h2' packages. "
+    "Please install them using: pip install trcli[http2]",
+    missing_suite_id_to_prefetch="Unable to choose suite of project '{project_name}' to prefetch. "
+    "Please specify the suite using the --suite-id argument.",
+    circuit_open="Request was not sent because TestRail instance stopped responding "
+    "({failures} consecutive network errors or timeouts). Please check your TestRail instance and try again.",
     automation_id_unavailable=f"The automation_id field currently exists, but is not available in the project."
     f"Please manually add your project id through Administration under Customizations > Case Fields.\n"
     f"The field should have the following mandatory details:\n"
@@ -82,6 +90,12 @@ class SuiteModes(enum.IntEnum):
     multiple_suites = 3
 
 
+class CircuitBreakerState(enum.Enum):
+    closed = "closed"
+    open = "open"
+    half_open = "half-open"
+
+
 class RevertMessages:
     suite_deleted = "Deleted created suite"
     suite_not_deleted = "Unable to delete created suite: {error}"
@@ -0,0 +1,80 @@
+import dataclasses
+from typing import Any, Callable, Dict
+
+# field metadata flag of values used only by trcli itself (e.g. local attachment paths), never sent to TestRail
+LOCAL_ONLY = "local_only"
+
+PRIMITIVE_TYPES = (int, str, float, bool)
+
+_serializers: Dict[type, Callable[[Any], dict]] = {}
+
+
+def to_body(obj) -> dict:
+    """
+    Returns request body of dataclass object (equivalent of serde to_dict) without local only fields.
+    Serializer of the class is compiled on first use.
+    """
+    serializer = _serializers.get(type(obj))
+    if serializer is None:
+        serializer = _serializers[type(obj)] = compile_serializer(type(obj))
+    return serializer(obj)
+
+
+def register_serializer(cls: type, serializer: Callable[[Any], dict]):
+    """Registers body serializer of class which is not a dataclass (e.g. view over column store)."""
+    _serializers[cls] = serializer
+
+
+def compile_serializer(cls: type) -> Callable[[Any], dict]:
+    """
+    Generates body serializer of dataclass from its fields metadata, so the metadata is not inspected
+    again for every object. Supported serde field options: skip, skip_if_default, skip_if_false,
+    skip_if and rename. Nested dataclasses and lists are converted on each call.
+    """
+    lines = ["def serialize(obj):", "    body = {}"]
+    namespace = {"convert": _convert}
+    for index, field in enumerate(dataclasses.fields(cls)):
+        if field.metadata.get("serde_skip") or field.metadata.get(LOCAL_ONLY):
+            continue
+        value = "value" if field.type in PRIMITIVE_TYPES else "convert(value)"
+        conditions = []
+        if field.metadata.get("serde_skip_if_default"):
+            default = _default(field)
+            if default is None:
+                conditions.append("value is not None")
+            else:
+                namespace[f"default_{index}"] = default
+                conditions.append(f"value != default_{index}")
+        if field.metadata.get("serde_skip_if_false"):
+            conditions.append("value")
+        if field.metadata.get("serde_skip_if"):
+            namespace[f"skip_if_{index}"] = field.metadata["serde_skip_if"]
+            conditions.append(f"not skip_if_{index}(value)")
+        assignment = f"body[{field.metadata.get('serde_rename', field.name)!r}] = {value}"
+        lines.append(f"    value = obj.{field.name}")
+        if conditions:
+            lines.append(f"    if {' and '.join(conditions)}:")
+            lines.append(f"        {assignment}")
+        else:
+            lines.append(f"    {assignment}")
+    lines.append("    return body")
+    exec("\n".join(lines), namespace)
+    return namespace["serialize"]
+
+
+def _default(field: dataclasses.Field) -> Any:
+    if field.default is not dataclasses.MISSING:
+        return field.default
+    if field.default_factory is not dataclasses.MISSING:
+        return field.default_factory()
+    return None
+
+
+def _convert(value: Any) -> Any:
+    if dataclasses.is_dataclass(value):
+        return to_body(value)
+    if isinstance(value, (list, tuple, set)):
+        return [_convert(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _convert(item) for key, item in value.items()}
+    return value
@@ -0,0 +1,288 @@
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Iterator, List, Optional, Union
+
+from trcli.data_classes.body_serializer import register_serializer
+from trcli.data_classes.dataclass_testrail import TestRailCase, TestRailResult
+from trcli.data_classes.validation_exception import ValidationException
+
+# stored in place of None in integer ID columns
+NO_ID = -(2 ** 63)
+
+
+class ColumnarCases:
+    """
+    Compact column store of test cases and their results, alternative to list of TestRailCase
+    and TestRailResult objects for very large reports.
+    IDs, status IDs and elapsed seconds are kept in typed arrays, titles and automation IDs in lists
+    of interned strings (automation IDs made of class name and title keep only the class name)
+    and comments in one shared UTF-8 buffer with offsets. Attachments are kept only
+    for cases having some. Fields which are not filled by report parsers (e.g. estimate, refs, defects)
+    are not stored and always read as None.
+    Cases are read and updated through CaseView and ResultView objects created on access,
+    sections get their cases as CasesView over a range of rows.
+    """
+
+    def __init__(self):
+        self.titles: List[str] = []
+        self.automation_ids: List[Optional[str]] = []
+        # 1 if only prefix of automation ID followed by "." and title is kept in automation_ids
+        self.automation_id_prefixed = array("b")
+        self.case_ids = array("q")
+        self.section_ids = array("q")
+        self.status_ids = array("b")
+        # rounded seconds, 0 if elapsed time was not reported (or was shorter than half a second)
+        self.elapsed = array("l")
+        self.comment_offsets = array("Q", [0])
+        self.comments = bytearray()
+        self.attachments = {}
+        # open addressing hash table of row numbers (+1, 0 marks empty slot) by automation ID, built on first lookup
+        self.__rows_by_automation_id = None
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def append(
+        self,
+        section_id: Optional[int],
+        title: str,
+        case_id: Optional[int] = None,
+        custom_automation_id: Optional[str] = None,
+        status_id: Optional[int] = None,
+        comment: str = "",
+        elapsed: Optional[str] = None,
+        attachments: Optional[List[str]] = None,
+    ) -> int:
+        """
+        Adds test case with its result, values are validated and formatted the same way as by TestRailCase
+        and TestRailResult. Returns index of the case.
+        """
+        if not title:
+            raise ValidationException(
+                field_name="title",
+                class_name=TestRailCase.__name__,
+                reason="Title is empty.",
+            )
+        index = len(self.titles)
+        self.titles.append(sys.intern(title))
+        automation_id = custom_automation_id.strip() if custom_automation_id else None
+        prefix, dot, suffix = automation_id.rpartition(".") if automation_id else ("", "", "")
+        if dot and suffix == title:
+            self.automation_ids.append(sys.intern(prefix))
+            self.automation_id_prefixed.append(1)
+        else:
+            self.automation_ids.append(automation_id)
+            self.automation_id_prefixed.append(0)
+        self.case_ids.append(_to_column(case_id))
+        self.section_ids.append(_to_column(section_id))
+        self.status_ids.append(status_id or 0)
+        self.elapsed.append(TestRailResult.elapsed_seconds(elapsed) or 0)
+        self.comments += (comment or "").encode()
+        self.comment_offsets.append(len(self.comments))
+        if attachments:
+            self.attachments[index] = attachments
+        self.__rows_by_automation_id = None
+        return index
+
+    def view(self, start: int = 0, stop: int = None) -> "CasesView":
+        """Returns view over cases from start (inclusive) to stop (exclusive, end of store by default)."""
+        return CasesView(self, start, len(self) if stop is None else stop)
+
+    def automation_id(self, index: int) -> Optional[str]:
+        if self.automation_id_prefixed[index]:
+            return f"{self.automation_ids[index]}.{self.titles[index]}"
+        return self.automation_ids[index]
+
+    def find_row(self, automation_id: str) -> Optional[int]:
+        """
+        Returns index of first case with given automation ID or None if there is no such case.
+        Row numbers are indexed in typed array (automation IDs are compared on lookup), so the index
+        doesn't keep key strings or objects per case.
+        """
+        if self.__rows_by_automation_id is None:
+            self.__rows_by_automation_id = self.__index_automation_ids()
+        rows = self.__rows_by_automation_id
+        mask = len(rows) - 1
+        slot = hash(automation_id) & mask
+        while rows[slot]:
+            row = rows[slot] - 1
+            if self.automation_id(row) == automation_id:
+                return row
+            slot = (slot + 1) & mask
+        return None
+
+    def __index_automation_ids(self) -> array:
+        size = 8
+        while size < 2 * len(self):
+            size *= 2
+        rows = array("q", bytes(8 * size))
+        mask = size - 1
+        for row in range(len(self)):
+            automation_id = self.automation_id(row)
+            if automation_id is None:
+                continue
+            slot = hash(automation_id) & mask
+            while rows[slot] and self.automation_id(rows[slot] - 1) != automation_id:
+                slot = (slot + 1) & mask
+            if not rows[slot]:
+                rows[slot] = row + 1
+        return rows
+
+    def comment(self, index: int) -> str:
+        return self.comments[self.comment_offsets[index]:self.comment_offsets[index + 1]].decode()
+
+
+class CasesView(Sequence):
+    """Read-only sequence of CaseView objects over range of ColumnarCases rows."""
+
+    __slots__ = ("store", "start", "stop")
+
+    def __init__(self, store: ColumnarCases, start: int, stop: int):
+        self.store = store
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, item: Union[int, slice]):
+        if isinstance(item, slice):
+            return [CaseView(self.store, index) for index in range(self.start, self.stop)[item]]
+        return CaseView(self.store, range(self.start, self.stop)[item])
+
+    def __iter__(self) -> Iterator["CaseView"]:
+        store = self.store
+        for index in range(self.start, self.stop):
+            yield CaseView(store, index)
+
+
+class CaseView:
+    """Test case stored in ColumnarCases, with the same attributes as TestRailCase."""
+
+    __slots__ = ("store", "index")
+
+    estimate = None
+    template_id = None
+    type_id = None
+    milestone_id = None
+    refs = None
+
+    def __init__(self, store: ColumnarCases, index: int):
+        self.store = store
+        self.index = index
+
+    @property
+    def section_id(self) -> Optional[int]:
+        return _from_column(self.store.section_ids[self.index])
+
+    @section_id.setter
+    def section_id(self, section_id: Optional[int]):
+        self.store.section_ids[self.index] = _to_column(section_id)
+
+    @property
+    def case_id(self) -> Optional[int]:
+        return _from_column(self.store.case_ids[self.index])
+
+    @case_id.setter
+    def case_id(self, case_id: Optional[int]):
+        self.store.case_ids[self.index] = _to_column(case_id)
+
+    @property
+    def title(self) -> str:
+        return self.store.titles[self.index]
+
+    @property
+    def custom_automation_id(self) -> Optional[str]:
+        return self.store.automation_id(self.index)
+
+    @property
+    def result(self) -> "ResultView":
+        return ResultView(self.store, self.index)
+
+    def __int__(self):
+        case_id = self.case_id
+        return int(case_id) if case_id is not None else -1
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+    def __eq__(self, other):
+        return isinstance(other, CaseView) and other.store is self.store and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.store), self.index))
+
+    def to_body(self) -> dict:
+        body = {"section_id": self.section_id, "title": self.title}
+        case_id = self.case_id
+        if case_id is not None:
+            body["case_id"] = case_id
+        automation_id = self.custom_automation_id
+        if automation_id is not None:
+            body["custom_automation_id"] = automation_id
+        return body
+
+
+class ResultView:
+    """Result of test case stored in ColumnarCases, with the same attributes as TestRailResult.
+    Case ID of result is shared with its case."""
+
+    __slots__ = ("store", "index")
+
+    version = None
+    defects = None
+    assignedto_id = None
+    junit_result_unparsed = None
+
+    def __init__(self, store: ColumnarCases, index: int):
+        self.store = store
+        self.index = index
+
+    @property
+    def case_id(self) -> Optional[int]:
+        return _from_column(self.store.case_ids[self.index])
+
+    @case_id.setter
+    def case_id(self, case_id: Optional[int]):
+        self.store.case_ids[self.index] = _to_column(case_id)
+
+    @property
+    def status_id(self) -> Optional[int]:
+        return self.store.status_ids[self.index] or None
+
+    @property
+    def comment(self) -> str:
+        return self.store.comment(self.index)
+
+    @property
+    def elapsed(self) -> Optional[str]:
+        seconds = self.store.elapsed[self.index]
+        return f"{seconds}s" if seconds > 0 else None
+
+    @property
+    def attachments(self) -> List[str]:
+        return self.store.attachments.get(self.index, [])
+
+    def to_body(self) -> dict:
+        body = {"case_id": self.case_id}
+        status_id = self.status_id
+        if status_id is not None:
+            body["status_id"] = status_id
+        body["comment"] = self.comment
+        elapsed = self.elapsed
+        if elapsed is not None:
+            body["elapsed"] = elapsed
+        return body
+
+
+def _to_column(value: Optional[int]) -> int:
+    return NO_ID if value is None else value
+
+
+def _from_column(value: int) -> Optional[int]:
+    return None if value == NO_ID else value
+
+
+register_serializer(CaseView, CaseView.to_body)
+register_serializer(ResultView, ResultView.to_body)
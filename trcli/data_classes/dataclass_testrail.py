@@ -1,13 +1,18 @@
+import sys
 from dataclasses import dataclass
 from typing import List, Optional
 from serde import field, serialize, deserialize
 from time import gmtime, strftime
+from trcli.data_classes.body_serializer import LOCAL_ONLY
 from trcli.data_classes.validation_exception import ValidationException
 
+# classes created for every test case (and section) are slotted, so they don't need per-instance __dict__
+SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 @serialize
 @deserialize
-@dataclass
+@dataclass(**SLOTS)
 class TestRailResult:
     """Class for creating Test Rail result for cases"""
 
@@ -18,7 +23,9 @@ class TestRailResult:
     elapsed: str = field(default=None, skip_if_default=True)
     defects: str = field(default=None, skip_if_default=True)
     assignedto_id: int = field(default=None, skip_if_default=True)
-    attachments: Optional[List[str]] = field(default_factory=list, skip_if_default=True)
+    attachments: Optional[List[str]] = field(
+        default_factory=list, skip_if_default=True, metadata={LOCAL_ONLY: True}
+    )
     junit_result_unparsed: list = field(default=None, metadata={"serde_skip": True})
 
     def __post_init__(self):
@@ -26,9 +33,12 @@ class TestRailResult:
             self.status_id = self.calculate_status_id_from_junit_element(
                 self.junit_result_unparsed
             )
-            self.comment = self.get_comment_from_junit_element(
-                self.junit_result_unparsed
+            # the same failures and skips repeat across many test cases of the report
+            self.comment = sys.intern(
+                self.get_comment_from_junit_element(self.junit_result_unparsed)
             )
+            # JUnit elements are not needed anymore, dropping them releases XML tree of the report
+            self.junit_result_unparsed = None
         if self.elapsed is not None:
             self.elapsed = self.proper_format_for_elapsed(self.elapsed)
 
@@ -68,17 +78,25 @@ class TestRailResult:
 
     @staticmethod
     def proper_format_for_elapsed(elapsed):
+        rounded_secs = TestRailResult.elapsed_seconds(elapsed)
+        return sys.intern(f"{rounded_secs}s") if rounded_secs is not None else None
+
+    @staticmethod
+    def elapsed_seconds(elapsed) -> Optional[int]:
+        """Returns elapsed time rounded to seconds or None if it is missing, not positive or can't be parsed."""
+        if elapsed is None:
+            return None
         try:
             rounded_secs = round(float(elapsed))
-            return f"{rounded_secs}s" if rounded_secs > 0 else None
         except ValueError:
             # unable to parse time format
             return None
+        return rounded_secs if rounded_secs > 0 else None
 
 
 @serialize
 @deserialize
-@dataclass
+@dataclass(**SLOTS)
 class TestRailCase:
     """Class for creating Test Rail test case"""
 
@@ -112,7 +130,7 @@ class TestRailCase:
 
 @serialize
 @deserialize
-@dataclass
+@dataclass(**SLOTS)
 class TestRailProperty:
     """Class for creating Test Rail property - run description"""
 
@@ -129,7 +147,7 @@ class TestRailProperty:
 
 @serialize
 @deserialize
-@dataclass
+@dataclass(**SLOTS)
 class TestRailSection:
     """Class for creating Test Rail test section"""
 
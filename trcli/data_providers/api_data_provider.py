@@ -1,6 +1,8 @@
-from typing import List
-from trcli.data_classes.dataclass_testrail import TestRailSuite
-from serde.json import to_dict
+from itertools import islice
+from typing import Iterator, List, Union
+from trcli.data_classes.columnar_store import CasesView, CaseView
+from trcli.data_classes.dataclass_testrail import TestRailCase, TestRailSuite
+from trcli.data_classes.body_serializer import to_body
 
 
 class ApiDataProvider:
@@ -12,11 +14,50 @@ class ApiDataProvider:
         self.suites_input = suites_input
         self.case_fields = case_fields
         self.run_description = run_description
+        self.__build_indexes()
+
+    def __build_indexes(self):
+        """
+        Indexes sections by name, so service responses are matched in constant time per section
+        instead of scanning all sections. First section wins on duplicated names.
+        Test cases are indexed by automation ID only when their IDs are updated (see __find_case).
+        Cases are matched by automation ID only, so there is no index of titles: duplicated titles
+        are found with a single pass (check_for_case_names_duplicates).
+        """
+        self.__sections_by_name = {}
+        for section in self.suites_input.testsections:
+            self.__sections_by_name.setdefault(section.name, section)
+        self.__cases_by_automation_id = None
+
+    def __find_case(self, automation_id: str) -> Union[TestRailCase, CaseView, None]:
+        """
+        Returns first test case with given automation ID. Index of cases is built on first use, its keys
+        don't change when IDs are assigned and indexed cases are updated in place, so it stays current.
+        Cases kept in column store are found by index of the store, so no object is kept per case.
+        """
+        if self.__cases_by_automation_id is None:
+            self.__cases_by_automation_id = {}
+            self.__columnar_stores = []
+            for section in self.suites_input.testsections:
+                cases = section.testcases
+                if isinstance(cases, CasesView):
+                    if all(store is not cases.store for store in self.__columnar_stores):
+                        self.__columnar_stores.append(cases.store)
+                else:
+                    for case in cases:
+                        self.__cases_by_automation_id.setdefault(case.custom_automation_id, case)
+        case = self.__cases_by_automation_id.get(automation_id)
+        if case is None:
+            for store in self.__columnar_stores:
+                row = store.find_row(automation_id)
+                if row is not None:
+                    return CaseView(store, row)
+        return case
 
     def add_suites_data(self):
         """Return list of bodies for adding suites"""
         return {
-            "bodies": [to_dict(self.suites_input)],
+            "bodies": [to_body(self.suites_input)],
         }
 
     def add_sections_data(self, return_all_items=False):
@@ -25,7 +66,7 @@ class ApiDataProvider:
         """
         return {
             "bodies": [
-                to_dict(section)
+                to_body(section)
                 for section in self.suites_input.testsections
                 if section.section_id is None or return_all_items
             ],
@@ -38,7 +79,7 @@ class ApiDataProvider:
         for sublist in testcases:
             for case in sublist:
                 if case.case_id is None or return_all_items:
-                    body = to_dict(case)
+                    body = to_body(case)
                     if self.case_fields:
                         for field, val in self.case_fields.items():
                             body[field] = val
@@ -79,7 +120,7 @@ class ApiDataProvider:
 
         if len(cases) == 1:
             case_id_from_file = cases[0].case_id
-            result = to_dict(cases[0].result)
+            result = to_body(cases[0].result)
             if case_id_from_file is None or case_id_from_file == case_id:
                 result["case_id"] = case_id
                 results = [result]
@@ -91,18 +132,40 @@ class ApiDataProvider:
 
     def add_results_for_cases(self, bulk_size):
         """Return bodies for adding results for cases. Returns bodies for results that already have case ID."""
-        testcases = [sections.testcases for sections in self.suites_input.testsections]
+        return list(self.iter_results_for_cases(bulk_size))
 
-        result_bulks = ApiDataProvider.divide_list_into_bulks(
-            [
-                to_dict(case.result)
-                for sublist in testcases
-                for case in sublist
-                if case.case_id is not None
-            ],
-            bulk_size=bulk_size,
+    def iter_results_for_cases(self, bulk_size) -> Iterator[dict]:
+        """Lazy variant of add_results_for_cases, bodies are created one bulk at a time when requested,
+        so only bulks being sent have to be kept in memory."""
+        cases = (
+            case
+            for section in self.suites_input.testsections
+            for case in section.testcases
+            if case.case_id is not None
         )
-        return [{"results": result_bulk} for result_bulk in result_bulks]
+        while True:
+            result_bulk = [to_body(case.result) for case in islice(cases, bulk_size)]
+            if not result_bulk:
+                return
+            yield {"results": result_bulk}
+
+    def results_for_cases_amount(self) -> int:
+        """Return number of results with case ID, bodies of which are returned by iter_results_for_cases."""
+        return sum(
+            1
+            for section in self.suites_input.testsections
+            for case in section.testcases
+            if case.case_id is not None
+        )
+
+    def attachments_for_cases(self) -> dict:
+        """Return attachments of results with case ID by case ID."""
+        return {
+            case.case_id: case.result.attachments
+            for section in self.suites_input.testsections
+            for case in section.testcases
+            if case.case_id is not None and case.result.attachments
+        }
 
     def update_data(
         self,
@@ -136,25 +199,24 @@ class ApiDataProvider:
         """
         Check if section names in result xml file are duplicated.
         """
-        sections_names = [sections.name for sections in self.suites_input.testsections]
-
-        if len(sections_names) == len(set(sections_names)):
-            return False
-        else:
-            return True
+        return len(self.__sections_by_name) != len(self.suites_input.testsections)
 
     def check_for_case_names_duplicates(self):
         """
         Check if cases names in result xml file are duplicated.
+        Titles are collected in a set in one pass, stopping at the first duplicate.
         """
-        testcases = [sections.testcases for sections in self.suites_input.testsections]
-        cases = [case for sublist in testcases for case in sublist]
-        cases_names = [case.title for case in cases]
-
-        if len(cases) == len(set(cases_names)):
-            return False
-        else:
-            return True
+        titles = set()
+        for section in self.suites_input.testsections:
+            cases = section.testcases
+            for title in (
+                cases.store.titles[cases.start:cases.stop] if isinstance(cases, CasesView)
+                else (case.title for case in cases)
+            ):
+                if title in titles:
+                    return True
+                titles.add(title)
+        return False
 
     def __update_section_data(self, section_data: List[dict]):
         """section_data comes from add_section API response
@@ -166,14 +228,7 @@ class ApiDataProvider:
 
         """
         for section_updater in section_data:
-            matched_section = next(
-                (
-                    section
-                    for section in self.suites_input.testsections
-                    if section["name"] == section_updater["name"]
-                ),
-                None,
-            )
+            matched_section = self.__sections_by_name.get(section_updater["name"])
             if matched_section is not None:
                 matched_section.section_id = section_updater["section_id"]
                 for case in matched_section.testcases:
@@ -190,24 +245,9 @@ class ApiDataProvider:
             }
 
         """
-        testcases = [sections.testcases for sections in self.suites_input.testsections]
         for case_updater in case_data:
-            matched_case = next(
-                (
-                    case
-                    for sublist in testcases
-                    for case in sublist
-                    if case.custom_automation_id == case_updater["custom_automation_id"]
-                ),
-                None,
-            )
+            matched_case = self.__find_case(case_updater["custom_automation_id"])
             if matched_case is not None:
                 matched_case.case_id = case_updater["case_id"]
                 matched_case.result.case_id = case_updater["case_id"]
                 matched_case.section_id = case_updater["section_id"]
-
-    @staticmethod
-    def divide_list_into_bulks(input_list: List, bulk_size: int) -> List:
-        return [
-            input_list[i : i + bulk_size] for i in range(0, len(input_list), bulk_size)
-        ]
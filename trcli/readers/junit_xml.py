@@ -1,9 +1,11 @@
 import ast
+import sys
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 from junitparser import TestCase, TestSuite, JUnitXml, IntAttr, JUnitXmlError, Element, Attr
 from xml.etree import ElementTree as etree
 from trcli.readers.file_parser import FileParser
+from trcli.data_classes.columnar_store import ColumnarCases
 from trcli.data_classes.dataclass_testrail import (
     TestRailCase,
     TestRailSuite,
@@ -55,19 +57,32 @@ class JunitParser(FileParser):
         else:
             raise JUnitXmlError("Invalid format.")
 
+    def __init__(self, filepath: Union[str, Path], columnar: bool = False):
+        """
+        columnar - keep test cases and results in compact ColumnarCases store instead of
+        TestRailCase and TestRailResult objects (for very large reports)
+        """
+        super().__init__(filepath)
+        self.columnar = columnar
+
     def parse_file(self) -> TestRailSuite:
         suite = JUnitXml.fromfile(
             self.filepath, parse_func=self._add_root_element_to_tree
         )
 
         test_sections = []
+        store = ColumnarCases() if self.columnar else None
+        # missing id attribute is looked up by junitparser by recounting all test cases, so it's read only once
+        suite_id = suite.id
         for section in suite:
             if not len(section):
                 continue
             test_cases = []
+            first_case = len(store) if self.columnar else 0
+            section_id = section.id
             properties = []
             for prop in section.properties():
-                properties.append(TestRailProperty(prop.name, prop.value))
+                properties.append(TestRailProperty(_intern(prop.name), _intern(prop.value)))
             for case in section:
                 case_id = None
                 case_result = case.result
@@ -82,38 +97,55 @@ class JunitParser(FileParser):
                     case_result = [autoPass]
                 for autoFail in case.iterchildren(AutomationFailed):
                     case_result = [autoFail]
-                test_cases.append(
-                    TestRailCase(
-                        section.id,
+                if self.columnar:
+                    store.append(
+                        section_id,
                         case.name,
                         case_id,
-                        result=(
-                            TestRailResult(
-                                case_id,
-                                elapsed=case.time,
-                                junit_result_unparsed=case_result,
-                                attachments=attachments,
-                            )
-                        ),
-                        custom_automation_id=f"{case.classname}.{case.name}"
+                        custom_automation_id=f"{case.classname}.{case.name}",
+                        status_id=TestRailResult.calculate_status_id_from_junit_element(case_result),
+                        comment=TestRailResult.get_comment_from_junit_element(case_result),
+                        elapsed=case.time,
+                        attachments=attachments,
+                    )
+                else:
+                    test_cases.append(
+                        TestRailCase(
+                            section_id,
+                            case.name,
+                            case_id,
+                            result=(
+                                TestRailResult(
+                                    case_id,
+                                    elapsed=case.time,
+                                    junit_result_unparsed=case_result,
+                                    attachments=attachments,
+                                )
+                            ),
+                            custom_automation_id=f"{case.classname}.{case.name}"
+                        )
                     )
-                )
             test_sections.append(
                 TestRailSection(
-                    section.name,
-                    suite.id,
+                    _intern(section.name),
+                    suite_id,
                     time=section.time,
-                    section_id=section.id,
-                    testcases=test_cases,
+                    section_id=section_id,
+                    testcases=store.view(first_case) if self.columnar else test_cases,
                     properties=properties,
                 )
             )
 
         suite = TestRailSuite(
             suite.name,
-            suite_id=suite.id,
+            suite_id=suite_id,
             time=suite.time,
             testsections=test_sections,
             source=self.filename,
         )
         return suite
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Interns strings repeated across sections of the report (e.g. section names and properties)."""
+    return sys.intern(value) if value else value
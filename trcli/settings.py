@@ -1,5 +1,25 @@
 MAX_WORKERS_ADD_CASE = 10
 MAX_WORKERS_ADD_RESULTS = 10
+MAX_WORKERS_ADD_ATTACHMENTS = 5
+MAX_WORKERS_GET_PAGES = 5
+# results batches submitted at once, one waiting batch per worker so workers never wait for next body
+RESULTS_BATCHES_IN_FLIGHT = 2 * MAX_WORKERS_ADD_RESULTS
+SCOPED_CASE_LOOKUP_RATIO = 0.1
 DEFAULT_API_CALL_RETRIES = 3
 DEFAULT_API_CALL_TIMEOUT = 30
 DEFAULT_BATCH_SIZE = 50
+DEFAULT_CONNECTION_POOL_SIZE = max(MAX_WORKERS_ADD_CASE, MAX_WORKERS_ADD_RESULTS, MAX_WORKERS_GET_PAGES)
+DEFAULT_ASYNC_CONCURRENCY = 100
+DEFAULT_RETRY_ON = [429, 500, 502, 503, 504]
+DEFAULT_RETRY_BACKOFF = 1.0
+DEFAULT_RETRY_MAX_BACKOFF = 60
+DEFAULT_STREAMING_DECODE_THRESHOLD = 16 * 1024 * 1024
+DEFAULT_COMPRESSION_THRESHOLD = 8 * 1024
+DEFAULT_COMPRESSION_LEVEL = 6
+DEFAULT_HEDGE_PERCENTILE = 95
+DEFAULT_HEDGE_MIN_SAMPLES = 20
+DEFAULT_HEDGE_WINDOW = 200
+DEFAULT_CIRCUIT_BREAKER_THRESHOLD = 5
+DEFAULT_CIRCUIT_BREAKER_RECOVERY_TIME = 30
+DEFAULT_METADATA_CACHE_PATH = "~/.trcli/metadata_cache.sqlite"
+DEFAULT_METADATA_CACHE_TTL = 3600